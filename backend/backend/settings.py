@@ -115,6 +115,49 @@ if database_url:
     )
 
 
+# Ready questions kept per difficulty, refilled in the background once a difficulty is down to the low-water mark
+
+QUESTION_POOL_SIZE = int(os.getenv("QUESTION_POOL_SIZE", "20"))
+QUESTION_POOL_LOW_WATER = int(os.getenv("QUESTION_POOL_LOW_WATER", "5"))
+
+# Worker processes that solve functions for /solve-bulk and the async views. Past SOLVER_PROCESSES running and
+# SOLVER_QUEUE_DEPTH waiting tasks, async views answer 503. Tasks running over SOLVER_TIMEOUT seconds answer 504.
+
+SOLVER_PROCESSES = int(os.getenv("SOLVER_PROCESSES", str(min(4, os.cpu_count() or 1))))
+SOLVER_QUEUE_DEPTH = int(os.getenv("SOLVER_QUEUE_DEPTH", "16"))
+SOLVER_TIMEOUT = float(os.getenv("SOLVER_TIMEOUT", "10"))
+
+# Limit on the exact search for a minimal expression of a function sent by a client (/tutorial-solve, /check-batch,
+# /solve-bulk), in search steps and seconds. Past it, the solver falls back to a greedy cover marked "exact": false.
+
+SOLVER_BUDGET_STEPS = int(os.getenv("SOLVER_BUDGET_STEPS", "100000"))
+SOLVER_BUDGET_SECONDS = float(os.getenv("SOLVER_BUDGET_SECONDS", "2"))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/ref/settings/#caches
+# Question sessions hold the solution of every question served, so answers are checked without solving it again.
+# They are kept in a table of the database, so every worker process sees them, or in files when QUESTION_SESSION_DIR
+# points at a directory shared by every worker.
+
+QUESTION_SESSION_TTL = int(os.getenv("QUESTION_SESSION_TTL", "86400")) # Seconds
+question_session_dir = os.getenv("QUESTION_SESSION_DIR")
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'question_sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache' if question_session_dir else 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': question_session_dir or 'kmap_question_sessions', # Table created by migration kmap 0010
+        'TIMEOUT': QUESTION_SESSION_TTL,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv("QUESTION_SESSION_MAX_ENTRIES", "100000")),
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,221 @@
+# Async variants of the game, time attack and tutorial views, for ASGI servers (see backend/asgi.py).
+# Solver work runs in the bounded SOLVER_EXECUTOR process pool and database work in sync_to_async, so slow solves
+# do not hold up the event loop or the cheap views served by the same worker.
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from . import kmap_solver, question_pool, question_sessions
+from .models import Question
+from .solver_executor import SolverBusy, SolverTimeout
+from .views import (
+    DAILY_CHALLENGE_CACHE, MAX_ANSWERS, QUESTION_POOL, SOLVER_BUDGET_STATS, SOLVER_EXECUTOR, TIME_LIMIT, daily_question, function_session,
+    get_daily_challenge, next_difficulty, parse_allow_dont_cares, parse_difficulty, question_data, question_id_function, record_daily_result,
+    solved_daily_challenge, solver_budget, store_daily_challenge, tutorial_arguments, user_data, validate_username,
+)
+
+
+async def apop_question(difficulty, allow_dont_cares=True):
+    """`pop_question()` that generates the question in the solver pool if neither the bank nor the question pool has one"""
+    question = await sync_to_async(Question.objects.sample)(difficulty, allow_dont_cares)
+    if question is None:
+        question = QUESTION_POOL.takeQuestion(difficulty, allow_dont_cares)
+    if question is None:
+        question = await SOLVER_EXECUTOR.run(question_pool.generateQuestion, difficulty, allow_dont_cares, MAX_ANSWERS)
+    session_id = await question_sessions.astart_session(question.num_var, question.form, question.terms, question.dont_cares, question.answers, question.min_terms)
+    return question.num_var, question.form, question.terms, question.dont_cares, question.groupings, question.question_id, session_id
+
+
+async def aget_or_create_daily_challenge():
+    """`get_or_create_daily_challenge()` that generates a missing challenge in the solver pool"""
+    daily_challenge = await sync_to_async(get_daily_challenge)()
+    if daily_challenge is None:
+        today = timezone.now().date()
+        question = await SOLVER_EXECUTOR.run(question_pool.generateDailyQuestion, today, settings.SECRET_KEY, MAX_ANSWERS)
+        daily_challenge = await sync_to_async(DAILY_CHALLENGE_CACHE.get)(today, lambda: store_daily_challenge(today, question))
+    return daily_challenge
+
+
+async def aanswered_question(data):
+    """`answered_question()` that solves a question regenerated from its ID in the solver pool"""
+    session = await question_sessions.aget_session(data.get('q_session'))
+    if session is not None:
+        return session, None
+
+    if data.get('q_id'):
+        function, error = question_id_function(data.get('q_id'))
+        if function is None:
+            return None, error
+        solution = await SOLVER_EXECUTOR.run(question_pool.solveQuestion, *function, MAX_ANSWERS, False, solver_budget())
+        SOLVER_BUDGET_STATS.record(solution['exact'])
+        return function_session(function, solution), None
+
+    if data.get('difficulty') == 4:
+        daily_challenge = await sync_to_async(solved_daily_challenge)(data.get('q_num_var'), data.get('q_form'), data.get('q_terms'), data.get('q_dont_cares'))
+        if daily_challenge is not None:
+            return question_sessions.make_session(daily_challenge.num_var, daily_challenge.form, daily_challenge.terms, daily_challenge.dont_cares,
+                                                  daily_challenge.answers, daily_challenge.min_terms,
+                                                  int(daily_challenge.on_mask or '0', 16), int(daily_challenge.dc_mask or '0', 16)), None
+
+    return None, 'Question session expired'
+
+
+class AsyncSolverView(View):
+    """
+    Async view taking a JSON body as `self.data`, like the DRF views it stands in for. A full solver pool answers 503
+    and a solve over SOLVER_TIMEOUT answers 504, so clients can retry.
+    """
+    http_method_names = ['post']
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            self.data = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        if not isinstance(self.data, dict):
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except SolverBusy:
+            return JsonResponse({'error': 'Solver is busy, try again'}, status=503)
+        except SolverTimeout:
+            return JsonResponse({'error': 'Solver timed out'}, status=504)
+
+
+class AsyncCheckUser(AsyncSolverView):
+    async def post(self, request):
+        username = self.data.get('username')
+        username_error = validate_username(username)
+        if username_error:
+            return JsonResponse({'error': username_error}, status=400)
+
+        difficulty = parse_difficulty(self.data.get('difficulty'))
+        score = 0
+        time_started = None
+        allow_dont_cares = parse_allow_dont_cares(self.data.get('allow_dont_cares', True))
+
+        if difficulty == 4:
+            question = daily_question(await aget_or_create_daily_challenge())
+            time_started = timezone.now()
+        else:
+            question = await apop_question(next_difficulty(difficulty, score), allow_dont_cares)
+
+        return JsonResponse(user_data(username, score, difficulty, question, time_started))
+
+
+class AsyncCheckAnswer(AsyncSolverView):
+    async def post(self, request):
+        user = self.data.get('user') or {}
+        username = user.get('username')
+        score = user.get('score')
+        difficulty = user.get('difficulty')
+
+        if self.data.get('type') == 0:
+            session, error = await aanswered_question(user)
+            if session is None:
+                return JsonResponse({'error': error}, status=400)
+            result, answers = question_sessions.check_session_answer(session, user.get('answer'))
+
+            # For timed mode, record the completion time if answer is correct
+            if difficulty == 4 and result == 1:
+                await sync_to_async(record_daily_result)(username, user.get('time_started'))
+
+            return JsonResponse({'result': result, 'answers': answers})
+
+        result = user.get('result')
+        time_started = user.get('time_started')
+        allow_dont_cares = parse_allow_dont_cares(user.get('allow_dont_cares', True))
+
+        score = score + 1 if result == 1 else 0
+        if difficulty == 4:
+            # Timed mode: stay on the daily challenge, don't change questions
+            question = daily_question(await aget_or_create_daily_challenge())
+        else:
+            question = await apop_question(next_difficulty(difficulty, score), allow_dont_cares)
+
+        return JsonResponse({'result': result, 'user': user_data(username, score, difficulty, question, time_started)})
+
+
+class AsyncStartTimeAttack(AsyncSolverView):
+    async def post(self, request):
+        username = self.data.get('username')
+        difficulty = self.data.get('difficulty')
+        allow_dont_cares = True
+
+        username_error = validate_username(username)
+        if username_error:
+            return JsonResponse({'error': username_error}, status=400)
+
+        if not username or difficulty not in [1, 2, 3]:
+            return JsonResponse({'error': 'Invalid username or difficulty'}, status=400)
+
+        question = await apop_question(difficulty, allow_dont_cares)
+
+        return JsonResponse({
+            'username': username,
+            'difficulty': difficulty,
+            'questions_solved': 0,
+            'time_remaining': TIME_LIMIT,
+            **question_data(question),
+            'allow_dont_cares': allow_dont_cares
+        })
+
+
+class AsyncCheckTimeAttackAnswer(AsyncSolverView):
+    async def post(self, request):
+        difficulty = self.data.get('difficulty')
+        questions_solved = self.data.get('questions_solved', 0)
+        time_remaining = self.data.get('time_remaining', 0)
+        allow_dont_cares = True
+
+        session, error = await aanswered_question(self.data)
+        if session is None:
+            return JsonResponse({'error': error}, status=400)
+        result, answers = question_sessions.check_session_answer(session, self.data.get('answer'))
+
+        if result != 1:
+            # Wrong answer - game over, don't save to leaderboard
+            return JsonResponse({
+                'result': 0,
+                'answers': answers,
+                'game_over': True,
+                'reason': 'Wrong answer - run is invalid'
+            })
+
+        question = await apop_question(difficulty, allow_dont_cares)
+
+        return JsonResponse({
+            'result': 1,
+            'answers': answers,
+            'questions_solved': questions_solved + 1,
+            'time_remaining': time_remaining,
+            **question_data(question)
+        })
+
+
+class AsyncTutorialSolve(AsyncSolverView):
+    async def post(self, request):
+        arguments, error = tutorial_arguments(self.data)
+        if arguments is None:
+            return JsonResponse({'error': error}, status=400)
+
+        try:
+            result = await SOLVER_EXECUTOR.run(kmap_solver.tutorial_solve, *arguments, settings.SOLVER_BUDGET_STEPS, settings.SOLVER_BUDGET_SECONDS)
+        except (SolverBusy, SolverTimeout):
+            raise
+        except Exception:
+            return JsonResponse({'error': 'Failed to solve tutorial map'}, status=400)
+        SOLVER_BUDGET_STATS.record(result['exact'])
+
+        return JsonResponse(result)
@@ -0,0 +1,191 @@
+"""
+Benchmarks for the K-Map solver.
+
+These are run through management commands, e.g. `python manage.py benchmark_solver`.
+"""
+
+import contextlib, io, math, random, time, tracemalloc
+
+import numpy.random as npr
+
+from . import group_generator, kmap_solver
+
+
+def _random_functions(num_var: int, count: int, rng: random.Random) -> list[tuple[list[int], list[int]]]:
+    """
+    Random functions of `num_var` variables with up to 10 don't cares.
+    """
+    cases = []
+    for _ in range(count):
+        cells = list(range(2**num_var))
+        rng.shuffle(cells)
+        num_terms = rng.randint(1, 2**num_var - 1)
+        num_dc = rng.randint(0, min(10, 2**num_var - num_terms))
+        cases.append((sorted(cells[:num_terms]), sorted(cells[num_terms:num_terms + num_dc])))
+    return cases
+
+
+def _grouped_functions(num_var: int, count: int, rng: random.Random, max_groups: int = 8) -> list[tuple[list[int], list[int]]]:
+    """
+    Functions of `num_var` variables made like K-Map questions: the union of up to `max_groups` groups
+    of up to half the map, with up to 8 don't cares.
+    """
+    groups = group_generator.generateGroups(num_var)
+    cases = []
+    for _ in range(count):
+        terms = set()
+        for _ in range(rng.randint(1, max_groups)):
+            terms |= rng.choice(groups[rng.randint(0, num_var - 2)])
+        rest = [cell for cell in range(2**num_var) if cell not in terms]
+        dont_cares = rng.sample(rest, min(len(rest), rng.randint(0, 8)))
+        cases.append((sorted(terms), sorted(dont_cares)))
+    return cases
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def _measure(calls: list) -> dict:
+    """
+    Runs the first call once untimed to warm up caches, every call once to time it, then once more under
+    `tracemalloc` for its peak memory.
+
+    :rtype: dict
+    :returns: p50, p95 and max time in milliseconds, and the largest peak memory of a single call in KiB.
+    """
+    if calls:
+        calls[0]()
+    timings = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for call in calls:
+            tracemalloc.reset_peak()
+            call()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "calls": len(calls),
+        "p50_ms": _percentile(timings, 0.5),
+        "p95_ms": _percentile(timings, 0.95),
+        "max_ms": timings[-1],
+        "peak_kib": peak / 1024,
+    }
+
+
+def _tutorial_solve_uncached(num_var, terms, dont_cares, form_terms, max_steps=None, max_seconds=None):
+    """
+    `tutorial_solve()` with its memo cleared first, so that every call solves the map.
+    """
+    kmap_solver._clear_tutorial_memo()
+    return kmap_solver.tutorial_solve(num_var, terms, dont_cares, form_terms, max_steps, max_seconds)
+
+
+def run_solver_suite(samples: int = 50, question_samples: int = 5, seed: int = 0) -> dict:
+    """
+    Times every stage of the solver with fixed seeds: `generateGroups` for 2 to 8 variables, `randomizeQuestion` at each
+    difficulty, `getPrimeImplicants`, `minimizePrimeImplicants`, `checkAnswerCover` and `tutorial_solve`
+    on `samples` random 2 to 6 variable functions with don't cares, and `tutorial_solve` on `samples` question-like
+    7 and 8 variable functions from `_grouped_functions()`, solved and then looked up again from its memo
+    (`"tutorial_solve_cached"`). `randomizeQuestion` is called
+    `question_samples` times per difficulty, since hard questions take seconds each.
+
+    Anything the solver prints is discarded.
+
+    :rtype: dict
+    :returns: The seed, numbers of samples, and for every stage (keyed as `"stage/num_var"` or
+    `"randomizeQuestion/difficulty"`) the stats from `_measure()`. This is the format saved as a baseline.
+    """
+    rng = random.Random(seed)
+    stages = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for num_var in (2, 3, 4, 5, 6, 7, 8):
+            stages[f"generateGroups/{num_var}"] = _measure([lambda: group_generator.generateGroups(num_var)] * samples)
+
+        for difficulty in (1, 2, 3):
+            random.seed(seed)
+            npr.seed(seed)
+            stages[f"randomizeQuestion/{difficulty}"] = _measure([lambda: kmap_solver.randomizeQuestion(difficulty)] * question_samples)
+
+        for num_var in (2, 3, 4, 5, 6):
+            cases = []
+            for terms, dont_cares in _random_functions(num_var, samples, rng):
+                if len(terms) + len(dont_cares) == 2**num_var: # Constant functions have no expression to submit
+                    continue
+                form = rng.choice(["min", "max"])
+                prime_implicants = kmap_solver.getPrimeImplicants(num_var, terms, dont_cares, form)
+                minimal_expressions = kmap_solver.minimizePrimeImplicants(num_var, terms, prime_implicants, form)
+                answer = kmap_solver.stringifyExpression(minimal_expressions[0], form)
+                cases.append((terms, dont_cares, form, prime_implicants, answer))
+
+            stages[f"getPrimeImplicants/{num_var}"] = _measure([
+                lambda c=c: kmap_solver.getPrimeImplicants(num_var, c[0], c[1], c[2]) for c in cases
+            ])
+            stages[f"minimizePrimeImplicants/{num_var}"] = _measure([
+                lambda c=c: kmap_solver.minimizePrimeImplicants(num_var, c[0], c[3], c[2]) for c in cases
+            ])
+            stages[f"checkAnswerCover/{num_var}"] = _measure([
+                lambda c=c: kmap_solver.checkAnswerCover(num_var, c[0], c[1], c[4], c[2]) for c in cases
+            ])
+            stages[f"tutorial_solve/{num_var}"] = _measure([
+                lambda c=c: _tutorial_solve_uncached(num_var, c[0], c[1], c[2]) for c in cases
+            ])
+
+        # Random truth tables of 7 and 8 variables have cyclic cores far too large to cover exactly, so larger maps
+        # are timed on question-like functions
+        for num_var in (7, 8):
+            cases = [(terms, dont_cares, rng.choice(["min", "max"])) for terms, dont_cares in _grouped_functions(num_var, samples, rng)]
+            stages[f"tutorial_solve/{num_var}"] = _measure([
+                lambda c=c: _tutorial_solve_uncached(num_var, c[0], c[1], c[2]) for c in cases
+            ])
+
+            # Repeated maps, such as the same exercise across a class, are answered from the memo
+            for c in cases:
+                kmap_solver.tutorial_solve(num_var, c[0], c[1], c[2])
+            stages[f"tutorial_solve_cached/{num_var}"] = _measure([
+                lambda c=c: kmap_solver.tutorial_solve(num_var, c[0], c[1], c[2]) for c in cases
+            ])
+
+    return {"seed": seed, "samples": samples, "question_samples": question_samples, "stages": stages}
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float = 0.25, min_ms: float = 0.05) -> list[dict]:
+    """
+    Compares a `run_solver_suite()` result against a saved baseline.
+
+    A stage regresses when its p50 time or peak memory is more than `threshold` (as a fraction) above the
+    baseline. Timings where both sides are under `min_ms` are too small to compare and are ignored.
+    Stages missing from either side are skipped.
+
+    :rtype: list[ dict ]
+    :returns: One row per regression with the stage, metric, baseline and current values, and the change as a fraction.
+    """
+    regressions = []
+    for stage, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "peak_kib"):
+            if metric == "p50_ms" and max(current[metric], previous[metric]) < min_ms:
+                continue
+            if previous[metric] > 0 and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append({
+                    "stage": stage,
+                    "metric": metric,
+                    "baseline": previous[metric],
+                    "current": current[metric],
+                    "change": current[metric] / previous[metric] - 1,
+                })
+    return regressions
@@ -0,0 +1,72 @@
+import datetime, threading
+from typing import Callable, TypeVar
+
+
+T = TypeVar('T')
+
+
+class DailyCache:
+    """
+    Process-local cache of one value per day, such as today's DailyChallenge, which does not change
+    once it is created. The value is kept with its date, so it expires when the date changes at midnight.
+    Safe to share between the threads of a WSGI server.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loading = {} # Lock of every date being loaded, so that each is loaded by one thread at a time
+        self._date = None
+        self._value = None
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, date: datetime.date, load: Callable[[], T | None]) -> T | None:
+        """
+        Value of `date`, loaded with `load()` if it is not cached. A value of None is not cached, so it is loaded
+        again on the next call. Values are loaded outside the cache lock. Other threads getting the same date wait
+        for the load, so it is loaded once per day, while those getting another date do not.
+
+        :param date: Date of the value, usually today in UTC.
+        :type date: datetime.date
+        :param load: Loads the value of `date`, or returns None if it does not exist.
+        :type load: Callable[[], T | None]
+
+        :rtype: T | None
+        """
+        with self._lock:
+            if self._date == date:
+                self._hits += 1
+                return self._value
+            loading = self._loading.setdefault(date, threading.Lock())
+
+        with loading:
+            with self._lock:
+                if self._date == date: # Loaded by another thread while this one waited
+                    self._hits += 1
+                    return self._value
+                self._misses += 1
+
+            value = None
+            try:
+                value = load()
+            finally:
+                with self._lock:
+                    self._loading.pop(date, None)
+                    if value is not None:
+                        self._date, self._value = date, value
+            return value
+
+    def clear(self):
+        """Drops the cached value, so the next call to `get()` loads it again."""
+        with self._lock:
+            self._date = None
+            self._value = None
+
+    def stats(self) -> dict:
+        """Hits and misses since the process started, and the date of the cached value."""
+        with self._lock:
+            return {
+                'date': self._date.isoformat() if self._date else None,
+                'hits': self._hits,
+                'misses': self._misses,
+            }
@@ -1,79 +1,145 @@
-import numpy as np
+import functools
 import itertools
 import math
 
+import numpy as np
+
+
+def _axis_bits(num_bits):
+    """
+    Splits `num_bits` variables into the number of bits of a row axis and a column axis,
+    with the extra bit going to the columns. Axes with no bits are left out.
+    """
+    return [bits for bits in (num_bits // 2, num_bits - num_bits // 2) if bits > 0]
+
+
+def generateLayout(num_var):
+    """
+    Number of bits of every axis of a K-Map, in the order of the axes of `generateTerms()`.
+
+    Up to 4 variables, a K-Map is a single map of rows and columns. Past that, it is a grid of
+    4x4 maps (one per layer) whose layer rows and layer columns hold the remaining variables.
+    The first axis holds the most significant bits of a term.
+    """
+    if num_var <= 4:
+        return _axis_bits(num_var)
+    return _axis_bits(num_var - 4) + [2, 2]
+
+
+def _gray(index):
+    return index ^ (index >> 1)
+
+
+def _inverse_gray(code):
+    index = code
+    code >>= 1
+    while code:
+        index ^= code
+        code >>= 1
+    return index
+
 
 def generateTerms(num_var):
     """
     Generates all possible terms in a K-Map given the number of variables.
+
+    Every axis is indexed in Gray code, so neighbouring cells (including the wrap at the ends) differ in one variable.
     """
+    axes = generateLayout(num_var)
+    shape = tuple(2**bits for bits in axes)
+    terms = np.zeros(shape, dtype=np.int64)
+
+    offset = num_var
+    for a, bits in enumerate(axes):
+        offset -= bits
+        index = np.arange(2**bits)
+        codes = _gray(index) << offset
+        terms += codes.reshape([-1 if i == a else 1 for i in range(len(axes))])
 
-    match num_var:
-        case 2: 
-            shape = (2, 2)
-            terms = np.reshape(np.arange(2**num_var), shape)
-        case 3: 
-            shape = (2, 4)
-            terms = np.reshape(np.arange(2**num_var), shape)
-            terms[:, [2, 3]] = terms[:, [3, 2]]
-        case 4:
-            shape = (4, 4)
-            terms = np.reshape(np.arange(2**num_var), shape)
-            print(terms)
-            terms[[2, 3], :] = terms[[3, 2], :]
-            terms[:, [2, 3]] = terms[:, [3, 2]]
-            print(terms.T)
-        case 5: 
-            shape = (2, 4, 4)
-            terms = np.reshape(np.arange(2**num_var), shape)
-            terms[:, [2, 3], :] = terms[:, [3, 2], :]
-            terms[:, :, [2, 3]] = terms[:, :, [3, 2]]
-        case 6:
-            shape = (2, 2, 4, 4)
-            terms = np.reshape(np.arange(2**num_var), shape)
-            terms[:, :, [2, 3], :] = terms[:, :, [3, 2], :]
-            terms[:, :, :, [2, 3]] = terms[:, :, :, [3, 2]]
-            
     return shape, terms
 
-def generateGroups(num_var):
+
+def termCoordinates(num_var, term):
     """
-    Generates all possible groups in a K-Map given the number of variables.
-    Updated version.
+    Position of a term in the K-Map as `(layer, row, col)`. Layers are numbered row by row across
+    the grid of maps, and are always 0 for 4 or fewer variables.
     """
+    axes = generateLayout(num_var)
+    row_bits, col_bits = (axes[-2], axes[-1]) if len(axes) >= 2 else (0, axes[-1])
+
+    col = _inverse_gray(term & (2**col_bits - 1))
+    row = _inverse_gray((term >> col_bits) & (2**row_bits - 1))
 
+    layer = 0
+    if num_var > 4:
+        layer_axes = _axis_bits(num_var - 4)
+        layer_cols = layer_axes[-1]
+        layer_rows = layer_axes[0] if len(layer_axes) == 2 else 0
+        layer_terms = term >> 4
+        layer_col = _inverse_gray(layer_terms & (2**layer_cols - 1))
+        layer_row = _inverse_gray((layer_terms >> layer_cols) & (2**layer_rows - 1))
+        layer = layer_row * 2**layer_cols + layer_col
+
+    return layer, row, col
+
+
+@functools.lru_cache(maxsize=None)
+def groupTable(num_var):
+    """
+    All possible groups in a K-Map given the number of variables, computed once per number of variables.
+    Every group is a window of the K-Map (wrapping at the ends) whose extent along every axis is a power of two.
+
+    Groups are listed by the log2 of their size, then by their extent along each axis, then by their smallest term,
+    in the same order as the original sliding window generator. The group of every term is left out.
+
+    :rtype: tuple[ tuple[ frozenset[ int ], ... ], ... ]
+    :returns: Immutable table of groups, indexed by the log2 of their size. Shared between callers, use
+    `generateGroups()` for a copy that can be changed.
+    """
     shape, terms = generateTerms(num_var)
-    groups = [[] for _ in range(num_var)]
-    
 
-    # Duplicate the last row when size of dimension is 4 (for groups that wrap at the ends)
-    for a in range(len(terms.shape)):
-        axis = terms.shape[a]
-        if axis == 4:
+    # Duplicate the first row after the last when size of dimension is 4 (for groups that wrap at the ends)
+    for a, size in enumerate(shape):
+        if size == 4:
             terms = np.insert(terms, 4, np.take(terms, 0, axis=a), axis=a)
 
-    # Generate a list of all possible groups with the given shape
-    ranges = [range(1, dim + 1) for dim in shape]
-    group_shapes = [s for s in itertools.product(*ranges) if (math.log2(np.prod(s)) == round(math.log2(np.prod(s))) and np.prod(s) < np.prod(shape))]
+    groups = [[] for _ in range(num_var)]
+    for extent in itertools.product(*[[2**bits for bits in range(axis_bits + 1)] for axis_bits in generateLayout(num_var)]):
+        size = math.prod(extent)
+        if size == 2**num_var:
+            continue
+        windows = np.lib.stride_tricks.sliding_window_view(terms, extent).reshape(-1, size).tolist()
+        # Windows that wrap repeat groups. Deduplicating them with a set and then sorting by smallest term keeps
+        # the order of groups with the same smallest term as the original
+        groups[size.bit_length() - 1].extend(sorted({frozenset(window) for window in windows}, key=min))
 
-    for s in group_shapes:
-        # Get all possible groups with given size
-        curr_groups = np.reshape(np.lib.stride_tricks.sliding_window_view(terms, s), (-1, np.prod(s))).tolist()
-        # Remove repeating elements
-        curr_groups = [set(item) for item in set(frozenset(item) for item in curr_groups)]
-        curr_groups = sorted(curr_groups, key=min)
-        # Insert groups
-        groups[int(math.log2(np.prod(s)))].extend(curr_groups)
-    
-    return groups
+    return tuple(tuple(size_groups) for size_groups in groups)
+
+
+@functools.lru_cache(maxsize=None)
+def groupMaskTable(num_var):
+    """
+    `groupTable()` with every group as an integer bitmask of its terms (bit `t` set for term `t`).
+
+    :rtype: tuple[ tuple[ int, ... ], ... ]
+    """
+    return tuple(tuple(sum(1 << term for term in group) for group in groups) for groups in groupTable(num_var))
+
+
+def generateGroups(num_var):
+    """
+    Generates all possible groups in a K-Map given the number of variables.
+    Returns a new list of lists of sets from `groupTable()`, which the caller is free to change.
+    """
+    return [[set(group) for group in groups] for groups in groupTable(num_var)]
 
 
 if __name__ == "__main__":
-    
+
     # Test code
     num_var = 5
     print(generateTerms(4))
     # possible_groups = generateGroups(num_var)
     # for i in range(len(possible_groups)):
     #     print(f"Group size {i}")
-    #     print(sorted(possible_groups[i], key=lambda x: sorted(list(x))), "\n")
\ No newline at end of file
+    #     print(sorted(possible_groups[i], key=lambda x: sorted(list(x))), "\n")
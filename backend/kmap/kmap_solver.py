@@ -9,7 +9,7 @@
 #  - check randomizer if its all 1's or 0's 
 #  - [DONE?] add checks for inputs in checkAnswer
 
-import copy, random, numpy as np, numpy.random as npr, re
+import collections, functools, random, threading, time, numpy as np, numpy.random as npr
 
 if __name__ == "__main__":
     import group_generator as gg
@@ -17,7 +17,7 @@ else:
     import kmap.group_generator as gg
     
 
-def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tuple[int, str, list[int], list[int]]:
+def randomizeQuestion(difficulty: int, num_dc_override: int | None = None, seed: int | None = None) -> tuple[int, str, list[int], list[int]]:
     
     """
     Generates a random question by giving a list of minterms/maxterms and don't cares.
@@ -37,6 +37,9 @@ def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tu
     :type difficulty: int
     :param num_dc_override: Override for number of don't cares. Use 0 to disable don't cares.
     :type num_dc_override: int | None
+    :param seed: Seed of the question. The same difficulty, `num_dc_override` and seed always give the same question
+    (with the same version of this module). Uses the global state of `random` and `numpy.random` if None.
+    :type seed: int | None
 
     :rtype: tuple[ num_var, form, terms, dont_cares ]
     :returns: `randomizeQuestion()` returns a tuple of the following arguments needed for `getPrimeImplicants()` and `minimizePrimeImplicants()`.
@@ -47,6 +50,10 @@ def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tu
     :returns dont_cares: `list[int]`, list of don't cares. Defaults to an empty list.
     
     """
+    # Both have the randint/choice methods of the modules they replace
+    rng = random if seed is None else random.Random(seed)
+    nrng = npr if seed is None else npr.RandomState(seed % 2**32)
+
     terms = []
     dont_cares = []
 
@@ -59,9 +66,9 @@ def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tu
         # - No don't cares
 
         # Set number of variables, groups, and form
-        num_var = npr.choice([2, 3], p = [0.5, 0.5])
-        num_groups = random.randint(1, 2 if num_var == 2 else 3)
-        form = npr.choice(["min", "max"], p = [0.7, 0.3])
+        num_var = nrng.choice([2, 3], p = [0.5, 0.5])
+        num_groups = rng.randint(1, 2 if num_var == 2 else 3)
+        form = nrng.choice(["min", "max"], p = [0.7, 0.3])
         # set dont cares
         num_dc = 0
         if num_dc_override is not None:
@@ -78,11 +85,11 @@ def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tu
         # - Up to 2 don't cares
 
         # Set number of variables, groups, and form
-        num_var = npr.choice([3, 4], p = [0.3, 0.7])
-        num_groups = random.randint(2, 2**(num_var-1))
-        form = npr.choice(["min", "max"], p = [0.5, 0.5])
+        num_var = nrng.choice([3, 4], p = [0.3, 0.7])
+        num_groups = rng.randint(2, 2**(num_var-1))
+        form = nrng.choice(["min", "max"], p = [0.5, 0.5])
         # set dont cares
-        num_dc = random.randint(0, 6)
+        num_dc = rng.randint(0, 6)
         if num_dc_override is not None:
             num_dc = max(0, min(int(num_dc_override), (2**num_var) - 1))
         dc_in = num_dc
@@ -97,34 +104,37 @@ def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tu
         # - Up to 6 don't cares
         
         # Set number of variables, groups, and formsss
-        num_var = npr.choice([5, 6], p = [0.5, 0.5])
-        num_groups = random.randint(3, 2**(num_var-1))
-        form = npr.choice(["min", "max"], p = [0.6, 0.4])
+        num_var = nrng.choice([5, 6], p = [0.5, 0.5])
+        num_groups = rng.randint(3, 2**(num_var-1))
+        form = nrng.choice(["min", "max"], p = [0.6, 0.4])
         # set dont cares
-        num_dc = random.randint(1, 10)
+        num_dc = rng.randint(1, 10)
         if num_dc_override is not None:
             num_dc = max(0, min(int(num_dc_override), (2**num_var) - 1))
-        dc_in = random.randint(0, num_dc)
+        dc_in = rng.randint(0, num_dc)
         dc_out = num_dc - dc_in
         s_o_probs = [0.5, 0.5]
     
     elif difficulty == 4:
         # TODO: Fix random difficulty, DO NOT USE FOR ACTUAL QUESTIONS UNTIL FIXED
-        num_var = random.randint(4, 6)
-        terms = sorted(npr.choice(range(2**num_var), size=random.randint(int((2**num_var)/8), int((2**num_var)/2)), replace=False).tolist())
-        num_dc = random.randint(0, 3)
+        num_var = rng.randint(4, 6)
+        terms = sorted(nrng.choice(range(2**num_var), size=rng.randint(int((2**num_var)/8), int((2**num_var)/2)), replace=False).tolist())
+        num_dc = rng.randint(0, 3)
         if num_dc_override is not None:
             num_dc = max(0, min(int(num_dc_override), (2**num_var) - 1))
         if num_dc != 0:
-            dont_cares = sorted(npr.choice(terms, size=min(num_dc, len(terms)-1), replace=False).tolist())
+            dont_cares = sorted(nrng.choice(terms, size=min(num_dc, len(terms)-1), replace=False).tolist())
             for dc in dont_cares:
                 terms.remove(dc)
-        form = random.choice(["min", "max"])
+        form = rng.choice(["min", "max"])
 
     separate_groups = []
     overlapping_groups = []
-    possible_s_groups = gg.generateGroups(num_var)
-    orig_groups = copy.deepcopy(possible_s_groups)
+    # Groups are picked as bitmasks of their terms (bit `t` set for term `t`), see `gg.groupMaskTable()`
+    orig_groups = [group for groups in gg.groupMaskTable(num_var) for group in groups]
+    group_terms = dict(zip(orig_groups, (group for groups in gg.groupTable(num_var) for group in groups)))
+    all_terms = 2**(2**num_var) - 1
+    possible_s_groups = [list(groups) for groups in gg.groupMaskTable(num_var)]
     possible_o_groups = [[] for _ in range(num_var)]
     dont_cares = []
 
@@ -140,7 +150,7 @@ def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tu
         elif all(len(group_sizes) == 0 for group_sizes in possible_o_groups) or (len(separate_groups) == 0 and len(overlapping_groups) == 0):
             c_type = "separate"
         else:
-            c_type = npr.choice(["separate", "overlapping"], p=s_o_probs) 
+            c_type = nrng.choice(["separate", "overlapping"], p=s_o_probs) 
 
         # Group type setter
         if c_type == "separate":
@@ -152,81 +162,77 @@ def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tu
         
         # randomly choose in possible groups
         while True:
-            c_group_size = random.randint(0, len(possible_group_set) - 1)
+            c_group_size = rng.randint(0, len(possible_group_set) - 1)
             if len(possible_group_set[c_group_size]) > 0:
                 break
-        c_group_idx = random.randint(0, len(possible_group_set[c_group_size])-1)
+        c_group_idx = rng.randint(0, len(possible_group_set[c_group_size])-1)
         chosen_group = possible_group_set[c_group_size][c_group_idx]
-        # print(chosen_group)
 
         # add to group set and remove from possible choices
         chosen_group_set.append(chosen_group)
         possible_group_set[c_group_size].remove(chosen_group)
         if c_type == "overlapping":
             for group in separate_groups:
-                if any([term in chosen_group for term in group]):
+                if group & chosen_group:
                     separate_groups.remove(group)
                     overlapping_groups.append(group)
 
+        chosen_groups = separate_groups + overlapping_groups
+        curr_terms = 0
+        for group in chosen_groups:
+            curr_terms |= group
+
+        # Terms of every chosen group that no other chosen group has
+        own_terms = []
+        for i, group in enumerate(chosen_groups):
+            other_terms = 0
+            for j, other in enumerate(chosen_groups):
+                if i != j:
+                    other_terms |= other
+            own_terms.append(group & ~other_terms)
+
+        # A new group formed with the current terms has terms both inside and outside of them,
+        # which also leaves out the chosen groups. `first_unused` is formed once every term is used.
+        formable_groups = [g for g in orig_groups if g & curr_terms and g & ~curr_terms]
+        first_unused = next(g for g in orig_groups if g not in chosen_groups)
+
         # Remove unusable groups
-        to_be_removed = []
+        to_be_removed = set()
+        formed_groups = set()
         can_be_overlapped = []
         for other_group, o_group_size in [(group, group_size) for group_size in range(len(possible_s_groups)) for group in possible_s_groups[group_size]] + [(group, group_size) for group_size in range(len(possible_o_groups)) for group in possible_o_groups[group_size]]:
-            if all([term in chosen_group for term in other_group]): # remove sub groups (also current group)
-                to_be_removed.append((o_group_size, other_group))
-            elif all([term in other_group for term in chosen_group]):  # remove parent groups
-                to_be_removed.append((o_group_size, other_group))
-            elif any([term in chosen_group for term in other_group]): # remove overlapping groups
-                to_be_removed.append((o_group_size, other_group))
+            if other_group & ~chosen_group == 0: # remove sub groups (also current group)
+                to_be_removed.add(other_group)
+            elif chosen_group & ~other_group == 0: # remove parent groups
+                to_be_removed.add(other_group)
+            elif other_group & chosen_group: # remove overlapping groups
+                to_be_removed.add(other_group)
                 can_be_overlapped.append((o_group_size, other_group))
             else: # remove forming groups (groups that will be formed by combining current and other group)
-                curr_terms = set([term for group in separate_groups for term in group] + [term for group in overlapping_groups for term in group] )
-                new_terms = copy.deepcopy(curr_terms)
-                new_terms.update(set([term for term in other_group]))
-                
+                new_terms = curr_terms | other_group
 
+                # Check if adding current group will form a new group, along with the sub groups of the formed group
+                if new_terms == all_terms:
+                    formed_group = first_unused
+                else:
+                    formed_group = next((g for g in formable_groups if g & ~new_terms == 0 and g & ~other_group), None)
+                if formed_group is not None:
+                    to_be_removed.add(other_group)
+                    formed_groups.add(formed_group)
 
-                # Check if adding current group will form a new group
-                unused_groups = [g for gs in orig_groups for g in gs]
-                for g in [g for g in separate_groups] + [g for g in overlapping_groups]:
-                    unused_groups.remove(g)
-                for g in unused_groups:
-                    if  ((any([term not in other_group for term in g]) and 
-                            any([term not in curr_terms for term in g]) and 
-                            all([term in new_terms for term in g])) or
-                            all([term in new_terms for term in range(2**num_var)])):
-                        # possible_groups[o_group_size].remove(other_group)
-                        to_be_removed.append((o_group_size, other_group))
-                        for gs2, g2 in [(possible_s_groups.index(gs), g3) for gs in possible_s_groups for g3 in gs] + [(possible_o_groups.index(gs),g4) for gs in possible_o_groups for g4 in gs]:
-                            if all(term in g for term in g2):
-                                to_be_removed.append((gs2, g2))
-                        break
-                
                 # Check if adding current group will remove an existing group
-                for g in separate_groups + overlapping_groups:
-                    new_terms_2 = [term for group in separate_groups for term in group] + [term for group in overlapping_groups for term in group] 
-                    for term in g:
-                        new_terms_2.remove(term)
-                    for term in other_group:
-                        new_terms_2.append(term)
-                    new_terms_2 = set(new_terms_2)    
-                    if all([term in new_terms_2 for term in curr_terms]):
-                        to_be_removed.append((o_group_size, other_group))
-                        break
+                if any(terms & ~other_group == 0 for terms in own_terms):
+                    to_be_removed.add(other_group)
 
-        # Update possible groups by removing all to be removed groups
-        for size, term in to_be_removed:
-            if len(possible_s_groups) - 1 >= size:
-                if term in possible_s_groups[size]:
-                    possible_s_groups[size].remove(term)
-            if len(possible_o_groups) - 1 >= size:
-                if term in possible_o_groups[size]:
-                    possible_o_groups[size].remove(term)
+        # Update possible groups by removing all to be removed groups (every group is in at most one list)
+        def is_removed(group):
+            return group in to_be_removed or any(group & ~formed_group == 0 for formed_group in formed_groups)
+        possible_s_groups = [[group for group in groups if not is_removed(group)] for groups in possible_s_groups]
+        possible_o_groups = [[group for group in groups if not is_removed(group)] for groups in possible_o_groups]
 
         # Update possible overlapping groups
-        for size, term in can_be_overlapped:
-            if term not in possible_o_groups[size]:
-                possible_o_groups[size].append(term)
+        for size, group in can_be_overlapped:
+            possible_o_groups[size].append(group)
 
 
         # Clean up possible groups by removing empty group sizes
@@ -234,13 +240,21 @@ def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tu
 
         num_groups -= 1
 
+    group_masks = separate_groups + overlapping_groups
+
+    # Back to the groups of terms for the rest of the question
+    separate_groups = [group_terms[group] for group in separate_groups]
+    overlapping_groups = [group_terms[group] for group in overlapping_groups]
+    possible_s_groups = [[group_terms[group] for group in groups] for groups in possible_s_groups]
+    possible_o_groups = [[group_terms[group] for group in groups] for groups in possible_o_groups]
+
     final_terms = list(set([int(term) for group in separate_groups for term in group] + [int(term) for group in overlapping_groups for term in group]))
 
     possible_dc = [(group, group_size) for group_size in range(len(possible_s_groups)) for group in possible_s_groups[group_size]]
     possible_dc += [(group, group_size) for group_size in range(len(possible_o_groups)) for group in possible_o_groups[group_size]]
     dc_out_arr = []
     if len(possible_dc) > 0:
-        dc_out_arr = random.choice(possible_dc)
+        dc_out_arr = rng.choice(possible_dc)
         dc_out_arr = list(filter(lambda term: term not in terms, dc_out_arr[0]))
     
     groups = separate_groups + overlapping_groups
@@ -248,7 +262,7 @@ def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tu
     for _ in range(dc_out):
         if len(dc_out_arr) == 0:
             break
-        dc = random.choice(dc_out_arr)
+        dc = rng.choice(dc_out_arr)
         dc_out_arr.remove(dc)
         dont_cares.append(int(dc))
     dc_in = num_dc - len(dont_cares)
@@ -259,7 +273,7 @@ def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tu
         if can_dc_terms.count(True) == 0:
             break
         else:
-            dc_idx = random.choice([i for i, val in enumerate(can_dc_terms) if val])
+            dc_idx = rng.choice([i for i, val in enumerate(can_dc_terms) if val])
             dc = final_terms[dc_idx]
             final_terms.pop(dc_idx)
             dont_cares.append(int(dc)) 
@@ -275,83 +289,33 @@ def randomizeQuestion(difficulty: int, num_dc_override: int | None = None) -> tu
                
          
 
-    # 0 - non cut group
-    # 1 - group divided into left/right
-    # 2 - group divided into top/bottom
-    # 3 - group divided into 4
-
-
-    _, terms = gg.generateTerms(num_var)
-
-    
-    groupings = [] # [group #, type of group, kind of anchor element (0, 1, 2, 3 for top left/right, bottom left/right), index row, index col, size of vertical, size of horizontal]
-    for i in range(len(groups)):
-        group = groups[i]
-        group_indices = []
-        # transforming them into coordinates.
-        for term in group:
-            group_indices.extend(list(zip(*np.where(terms == term))))
-
-        if len(group_indices[0]) == 3:
-            group_indices = [(r, c, l) for (l, r, c) in group_indices]
-        elif len(group_indices[0]) == 4:
-            group_indices = [(r, c, lr, lc) for (lr, lc, r, c) in group_indices]
-
-        # inside the group, make a subgroup based on their layer
-        overall_group_indices = []
-        if num_var == 6:
-            overall_group_indices = [[group for group in group_indices if group[2] * 2 + group[3] == i] for i in range(4)]      
-        elif num_var == 5:
-            overall_group_indices = [[group for group in group_indices if group[2] == i] for i in range(2)]
-        else:
-            overall_group_indices = [group_indices]
-
-        for layer_idx, group_indices in enumerate(overall_group_indices):
-            if len(group_indices) == 0:
-                continue
-
-            row_indices =  sorted(list(set([group[0] for group in group_indices])))
-            col_indices = sorted(list(set([group[1] for group in group_indices])))
-
-            group_type = 0
-            if any(row_index not in row_indices for row_index in range(min(row_indices), max(row_indices) + 1)):
-                group_type = 2
-            if any(col_index not in col_indices for col_index in range(min(col_indices), max(col_indices) + 1)):
-                if group_type == 2:
-                    group_type = 3
-                else:
-                    group_type = 1
-
-            if group_type == 0:
-                groupings.append([i, 0, 0, int(min(group_indices)[0]), int(min(group_indices)[1]), len(row_indices), len(col_indices), layer_idx])
-            elif group_type == 1:
-                groupings.append([i, 1, 0, int(min(group_indices)[0]), int(min(group_indices)[1]), len(row_indices), len(col_indices)/2, layer_idx])
-                groupings.append([i, 1, 1, int(min(group_indices)[0]), int(max(group_indices)[1]), len(row_indices), len(col_indices)/2, layer_idx])
-            elif group_type == 2:
-                groupings.append([i, 2, 0, int(min(group_indices)[0]), int(min(group_indices)[1]), len(row_indices) / 2, len(col_indices), layer_idx])
-                groupings.append([i, 2, 1, int(max(group_indices)[0]), int(min(group_indices)[1]), len(row_indices) / 2, len(col_indices), layer_idx])
-            elif group_type == 3:
-                groupings.append([i, 3, 3, int(min(group_indices)[0]), int(min(group_indices)[1]), 1, 1, layer_idx])
-                groupings.append([i, 3, 2, int(min(row_indices)), int(max(col_indices)), 1, 1, layer_idx])
-                groupings.append([i, 3, 1, int(max(row_indices)), int(min(col_indices)), 1, 1, layer_idx])
-                groupings.append([i, 3, 0, int(max(group_indices)[0]), int(max(group_indices)[1]), 1, 1, layer_idx])
-
+    groupings = _group_masks_to_groupings(num_var, group_masks)
 
     return num_var, form, final_terms, dont_cares, groupings
 
 
 def _apply_term_letter_mapping(num_var: int) -> list[str]:
-    terms = [chr(65 + x) for x in range(num_var)]
-    if num_var == 2:
-        terms[0], terms[1] = terms[1], terms[0]
-    elif num_var == 3:
-        terms[0], terms[1], terms[2] = terms[2], terms[0], terms[1]
-    elif num_var == 4:
-        terms[0:2], terms[2:4] = terms[2:4], terms[0:2]
-    elif num_var == 5:
-        terms[1:3], terms[3:5] = terms[3:5], terms[1:3]
-    elif num_var == 6:
-        terms[0], terms[1], terms[2:4], terms[4:6] = terms[1], terms[0], terms[4:6], terms[2:4]
+    """
+    Letter of the variable at every digit of a term (most significant first).
+
+    Letters go to the outer grid of maps before the inner map, and to columns before rows,
+    e.g. `[B, A, E, F, C, D]` for 6 variables.
+    """
+    axes = gg.generateLayout(num_var)
+    levels = [axes] if num_var <= 4 else [axes[:-2], axes[-2:]]
+
+    terms = [""] * num_var
+    letter = 0
+    start = 0
+    for level in levels:
+        axis_digits = []
+        for bits in level:
+            axis_digits.append(range(start, start + bits))
+            start += bits
+        for digits in reversed(axis_digits): # Columns first
+            for digit in digits:
+                terms[digit] = chr(65 + letter)
+                letter += 1
     return terms
 
 
@@ -368,83 +332,185 @@ def _implicant_to_literal_set(num_var: int, implicant: str, form_terms: str = "m
     return literals
 
 
-def _groups_to_groupings(num_var: int, groups: list[set[int]]) -> list[list[int]]:
-    _, terms = gg.generateTerms(num_var)
+@functools.lru_cache(maxsize=None)
+def _term_coordinates(num_var: int) -> tuple[tuple[int, int, int], ...]:
+    """
+    `gg.termCoordinates()` of every term, computed once per number of variables.
+    """
+    return tuple(gg.termCoordinates(num_var, term) for term in range(2**num_var))
+
+
+def _group_rectangles(num_var: int, group) -> list[list[int]]:
+    """
+    Rectangles to draw for a group of terms, as groupings without the group number (see `_groups_to_groupings()`).
+    """
+    # 0 - non cut group
+    # 1 - group divided into left/right
+    # 2 - group divided into top/bottom
+    # 3 - group divided into 4
+
+    coordinates = _term_coordinates(num_var)
+    rectangles = [] # [type of group, kind of anchor element (0, 1, 2, 3 for top left/right, bottom left/right), index row, index col, size of vertical, size of horizontal, layer]
+
+    # inside the group, make a subgroup based on their layer
+    overall_group_indices = {}
+    for term in group:
+        layer_idx, row, col = coordinates[int(term)]
+        overall_group_indices.setdefault(layer_idx, []).append((row, col))
+
+    for layer_idx in sorted(overall_group_indices):
+        group_indices = overall_group_indices[layer_idx]
+
+        row_indices = sorted(list(set([group[0] for group in group_indices])))
+        col_indices = sorted(list(set([group[1] for group in group_indices])))
+
+        group_type = 0
+        if any(row_index not in row_indices for row_index in range(min(row_indices), max(row_indices) + 1)):
+            group_type = 2
+        if any(col_index not in col_indices for col_index in range(min(col_indices), max(col_indices) + 1)):
+            if group_type == 2:
+                group_type = 3
+            else:
+                group_type = 1
+
+        if group_type == 0:
+            rectangles.append([0, 0, int(min(group_indices)[0]), int(min(group_indices)[1]), len(row_indices), len(col_indices), layer_idx])
+        elif group_type == 1:
+            rectangles.append([1, 0, int(min(group_indices)[0]), int(min(group_indices)[1]), len(row_indices), len(col_indices)/2, layer_idx])
+            rectangles.append([1, 1, int(min(group_indices)[0]), int(max(group_indices)[1]), len(row_indices), len(col_indices)/2, layer_idx])
+        elif group_type == 2:
+            rectangles.append([2, 0, int(min(group_indices)[0]), int(min(group_indices)[1]), len(row_indices) / 2, len(col_indices), layer_idx])
+            rectangles.append([2, 1, int(max(group_indices)[0]), int(min(group_indices)[1]), len(row_indices) / 2, len(col_indices), layer_idx])
+        elif group_type == 3:
+            rectangles.append([3, 3, int(min(group_indices)[0]), int(min(group_indices)[1]), 1, 1, layer_idx])
+            rectangles.append([3, 2, int(min(row_indices)), int(max(col_indices)), 1, 1, layer_idx])
+            rectangles.append([3, 1, int(max(row_indices)), int(min(col_indices)), 1, 1, layer_idx])
+            rectangles.append([3, 0, int(max(group_indices)[0]), int(max(group_indices)[1]), 1, 1, layer_idx])
+
+    return rectangles
+
+
+@functools.lru_cache(maxsize=None)
+def _grouping_table(num_var: int) -> dict[int, tuple[tuple, ...]]:
+    """
+    Rectangles of every group of `gg.groupMaskTable()`, keyed by the bitmask of the group, computed once per number of variables.
+    """
+    table = {}
+    for groups, masks in zip(gg.groupTable(num_var), gg.groupMaskTable(num_var)):
+        for group, mask in zip(groups, masks):
+            table[mask] = tuple(tuple(rectangle) for rectangle in _group_rectangles(num_var, group))
+    return table
+
+
+def _group_masks_to_groupings(num_var: int, masks: list[int]) -> list[list[int]]:
+    """
+    `_groups_to_groupings()` for groups given as bitmasks of their terms (bit `t` set for term `t`).
+    Every group of the K-Map is a lookup in `_grouping_table()`.
+    """
+    num_var = int(num_var)
+    table = _grouping_table(num_var)
+
     groupings = []
-    for i in range(len(groups)):
-        group = groups[i]
-        group_indices = []
+    for i, mask in enumerate(masks):
+        rectangles = table.get(mask)
+        if rectangles is None: # The whole K-Map, or not a group
+            rectangles = _group_rectangles(num_var, [term for term in range(2**num_var) if (mask >> term) & 1])
+        groupings.extend([i, *rectangle] for rectangle in rectangles)
+    return groupings
+
+
+def _groups_to_groupings(num_var: int, groups: list[set[int]]) -> list[list[int]]:
+    """
+    Rectangles to draw for every group of terms, as
+    `[group #, type of group, kind of anchor element, index row, index col, size of vertical, size of horizontal, layer]`.
+    """
+    masks = []
+    for group in groups:
+        mask = 0
         for term in group:
-            group_indices.extend(list(zip(*np.where(terms == term))))
+            mask |= 1 << int(term)
+        masks.append(mask)
+    return _group_masks_to_groupings(num_var, masks)
 
-        if len(group_indices) == 0:
-            continue
 
-        if len(group_indices[0]) == 3:
-            group_indices = [(r, c, l) for (l, r, c) in group_indices]
-        elif len(group_indices[0]) == 4:
-            group_indices = [(r, c, lr, lc) for (lr, lc, r, c) in group_indices]
+TUTORIAL_CACHE_SIZE = 1024 # Tutorial maps whose solutions are kept by `tutorial_solve()`
 
-        overall_group_indices = []
-        if num_var == 6:
-            overall_group_indices = [[group for group in group_indices if group[2] * 2 + group[3] == i] for i in range(4)]
-        elif num_var == 5:
-            overall_group_indices = [[group for group in group_indices if group[2] == i] for i in range(2)]
-        else:
-            overall_group_indices = [group_indices]
+# Exact solutions of `_tutorial_solve()` by its arguments other than the budget, least recently used first
+_tutorial_memo = collections.OrderedDict()
+_tutorial_memo_lock = threading.Lock()
 
-        for layer_idx, group_indices in enumerate(overall_group_indices):
-            if len(group_indices) == 0:
-                continue
 
-            row_indices = sorted(list(set([group[0] for group in group_indices])))
-            col_indices = sorted(list(set([group[1] for group in group_indices])))
+def tutorial_solve(num_var: int, terms: list[int], dont_cares: list[int], form_terms: str = "min",
+                   max_steps: int | None = None, max_seconds: float | None = None):
+    """
+    Solves a K-Map of 2 to 8 variables, returning one minimal expression, its terms, and the groupings to draw.
 
-            group_type = 0
-            if any(row_index not in row_indices for row_index in range(min(row_indices), max(row_indices) + 1)):
-                group_type = 2
-            if any(col_index not in col_indices for col_index in range(min(col_indices), max(col_indices) + 1)):
-                if group_type == 2:
-                    group_type = 3
-                else:
-                    group_type = 1
-
-            if group_type == 0:
-                groupings.append([i, 0, 0, int(min(group_indices)[0]), int(min(group_indices)[1]), len(row_indices), len(col_indices), layer_idx])
-            elif group_type == 1:
-                groupings.append([i, 1, 0, int(min(group_indices)[0]), int(min(group_indices)[1]), len(row_indices), len(col_indices)/2, layer_idx])
-                groupings.append([i, 1, 1, int(min(group_indices)[0]), int(max(group_indices)[1]), len(row_indices), len(col_indices)/2, layer_idx])
-            elif group_type == 2:
-                groupings.append([i, 2, 0, int(min(group_indices)[0]), int(min(group_indices)[1]), len(row_indices) / 2, len(col_indices), layer_idx])
-                groupings.append([i, 2, 1, int(max(group_indices)[0]), int(min(group_indices)[1]), len(row_indices) / 2, len(col_indices), layer_idx])
-            elif group_type == 3:
-                groupings.append([i, 3, 3, int(min(group_indices)[0]), int(min(group_indices)[1]), 1, 1, layer_idx])
-                groupings.append([i, 3, 2, int(min(row_indices)), int(max(col_indices)), 1, 1, layer_idx])
-                groupings.append([i, 3, 1, int(max(row_indices)), int(min(col_indices)), 1, 1, layer_idx])
-                groupings.append([i, 3, 0, int(max(group_indices)[0]), int(max(group_indices)[1]), 1, 1, layer_idx])
+    Question-like 7 and 8 variable maps (a few groups and don't cares) are timed by `benchmarks.run_solver_suite()`.
 
-    return groupings
+    The search is limited to `max_steps` steps and `max_seconds` seconds (see `SolverBudget`). `exact` is False
+    in the result if it ran out before a minimal expression was found, and the expression is from a greedy cover instead.
+
+    Exact solutions are memoized by number of variables, form, and the sets of terms and don't cares, so the order
+    of `terms` and `dont_cares` does not matter and repeated maps are not solved again. Greedy covers are not kept,
+    as they depend on the budget and on how busy the machine was, and the next call may find the minimal expression.
+    """
+    key = (int(num_var), form_terms, _terms_to_bitmask(terms), _terms_to_bitmask(dont_cares))
+    with _tutorial_memo_lock:
+        result = _tutorial_memo.get(key)
+        if result is not None:
+            _tutorial_memo.move_to_end(key)
+
+    if result is None:
+        result = _tutorial_solve(*key, max_steps, max_seconds)
+        if result["exact"]:
+            with _tutorial_memo_lock:
+                _tutorial_memo[key] = result
+                while len(_tutorial_memo) > TUTORIAL_CACHE_SIZE:
+                    _tutorial_memo.popitem(last=False)
+
+    # The cached result is shared, every caller gets its own lists
+    return {name: [list(item) for item in value] if name == "groupings" else list(value) if name == "terms" else value
+            for name, value in result.items()}
+
+
+def _clear_tutorial_memo():
+    """
+    Drops every solution memoized by `tutorial_solve()`.
+    """
+    with _tutorial_memo_lock:
+        _tutorial_memo.clear()
 
 
-def tutorial_solve(num_var: int, terms: list[int], dont_cares: list[int], form_terms: str = "min"):
+def _tutorial_solve(num_var: int, form_terms: str, on_set: int, dc_set: int, max_steps: int | None = None, max_seconds: float | None = None) -> dict:
+    """
+    `tutorial_solve()` of the terms and don't cares given as bitmasks (bit `t` set for term `t`), without the memo.
+    """
+    terms = [bit.bit_length() - 1 for bit in _bits(on_set)]
+    dont_cares = [bit.bit_length() - 1 for bit in _bits(dc_set & ~on_set)]
+    num_given = (on_set | dc_set).bit_count()
+
+    # Constant functions, whose expression has no terms
     if form_terms == "min":
         if len(terms) == 0:
-            return {"expression": "0", "groupings": []}
-        if len(terms) + len(dont_cares) >= 2**num_var:
-            return {"expression": "1", "groupings": []}
+            return {"expression": "0", "groupings": [], "terms": [], "exact": True}
+        if num_given >= 2**num_var:
+            return {"expression": "1", "groupings": [], "terms": [], "exact": True}
     else:
         if len(terms) == 0:
-            return {"expression": "1", "groupings": []}
-        if len(terms) + len(dont_cares) >= 2**num_var:
-            return {"expression": "0", "groupings": []}
+            return {"expression": "1", "groupings": [], "terms": [], "exact": True}
+        if num_given >= 2**num_var:
+            return {"expression": "0", "groupings": [], "terms": [], "exact": True}
 
+    budget = SolverBudget(max_steps, max_seconds)
     prime_implicants = getPrimeImplicants(num_var=num_var, terms=terms, dont_cares=dont_cares, form_terms=form_terms)
-    minimal_expressions = minimizePrimeImplicants(num_var=num_var, terms=terms, prime_implicants=prime_implicants, form_terms=form_terms)
 
-    if len(minimal_expressions) == 0:
-        return {"expression": "", "groupings": []}
+    # The first expression of `minimizePrimeImplicants()`, without building the others
+    cubes = [_string_to_cube(pi) for pi in prime_implicants]
+    cover = min(_iter_budgeted_covers(terms=terms, cubes=cubes, budget=budget), default=None)
+    if cover is None:
+        return {"expression": "", "groupings": [], "terms": [], "exact": budget.exact}
 
-    chosen_expression = minimal_expressions[0]
+    chosen_expression = [_implicant_to_literal_set(num_var, prime_implicants[idx], form_terms) for idx in cover]
     expression_str = stringifyExpression(expression=chosen_expression, form_answer=form_terms)
 
     def _stringify_term(term_set: set[str], form: str) -> str:
@@ -455,28 +521,103 @@ def tutorial_solve(num_var: int, terms: list[int], dont_cares: list[int], form_t
 
     expression_terms = [_stringify_term(term_set, form_terms) for term_set in chosen_expression]
 
-    literal_sets = [set(expr) for expr in chosen_expression]
-    implicants_by_literals = {frozenset(_implicant_to_literal_set(num_var, pi, form_terms)): pi for pi in prime_implicants}
+    groupings = expressionGroupings(num_var, chosen_expression, form_terms)
+    return {"expression": expression_str, "groupings": groupings, "terms": expression_terms, "exact": budget.exact}
+
+
+def expressionGroupings(num_var: int, expression: list[set[str]], form_terms: str = "min") -> list[list[int]]:
+    """
+    Groupings to draw for an expression, one group per term in the order of its terms (see `_groups_to_groupings()`).
+
+    Every term of a minimal expression is a prime implicant, whose covered terms come straight from its cube.
+    Terms that are not a valid set of literals are left out.
+
+    :rtype: list[ list[ int ] ]
+    """
+    group_masks = []
+    for literals in expression:
+        cube = _literal_set_to_cube(num_var, literals, form_terms)
+        if cube is not None:
+            group_masks.append(_cube_bitmask(cube))
+    return _group_masks_to_groupings(num_var, group_masks)
+
+
+def _cube_to_string(num_var: int, cube: tuple[int, int]) -> str:
+    """
+    Converts a `(value, mask)` cube into the binary string format used by `getPrimeImplicants()`,
+    where every bit set in `mask` is written as '-'.
+    """
+    value, mask = cube
+    chars = list(format(value, f"0{num_var}b"))
+    while mask:
+        bit = mask & -mask
+        chars[num_var - bit.bit_length()] = "-"
+        mask ^= bit
+    return "".join(chars)
+
+
+def _prime_implicant_cubes(num_var: int,
+                           terms: list[int],
+                           dont_cares: list[int] = [],
+                           form_terms: str = "min",
+                           ) -> list[tuple[int, int]]:
+    """
+    Quine-McCluskey merging on `(value, mask)` integer cubes. Bits set in `mask` are the merged
+    (don't care) digits, and their bits in `value` are always kept at 0.
+
+    Two cubes merge when they share the same mask and their values differ in exactly one bit.
+    Terms are grouped by their number of 1's (or 0's for maxterms), so the prime implicants come
+    out in the same order as the original string-based implementation.
+
+    :rtype: list[ tuple[ int, int ] ]
+    :returns: List of prime implicants as `(value, mask)` cubes.
+    """
+    full = (1 << num_var) - 1
+    count_ones = form_terms.lower() == "min"
 
-    chosen_implicants = []
-    for lit_set in literal_sets:
-        pi = implicants_by_literals.get(frozenset(lit_set))
-        if pi:
-            chosen_implicants.append(pi)
+    # Group terms with how many 1's/0's they have, dropping repeated terms
+    merged_terms = [[] for _ in range(num_var + 1)]
+    for term in dict.fromkeys(terms + dont_cares):
+        ones = int(term).bit_count()
+        merged_terms[ones if count_ones else num_var - ones].append((int(term), 0))
+    merged_terms = [group for group in merged_terms if group]
 
-    groups = []
-    for pi in chosen_implicants:
-        covered = set()
-        for i in range(2**num_var):
-            bits = bin(i).lstrip("0b").rjust(num_var, "0")
-            if all(p == "-" or p == b for p, b in zip(pi, bits)):
-                covered.add(i)
-        if len(covered) > 0:
-            groups.append(covered)
+    prime_implicants = []
+    while merged_terms:
+        merged = set() # Cubes that were merged into a larger cube this pass
+        new_merged_terms = []
+
+        for j in range(len(merged_terms) - 1):
+            # Index of next group's cubes so matches are hash lookups instead of pairwise scans
+            next_group = {cube: idx for idx, cube in enumerate(merged_terms[j + 1])}
+            new_group = {} # Insertion-ordered set
+            for value, mask in merged_terms[j]:
+                # The next group has one more 1 (or 0), so only those bits can be the differing digit
+                free = full & ~mask & (~value if count_ones else value)
+                matches = []
+                while free:
+                    b = free & -free
+                    free ^= b
+                    # The other cube has the same mask and differs only at `b`
+                    other = (value ^ b, mask)
+                    if other in next_group:
+                        matches.append((next_group[other], other, b))
+                if not matches:
+                    continue
+                merged.add((value, mask))
+                for _, other, b in sorted(matches):
+                    merged.add(other)
+                    new_group[(value & ~b, mask | b)] = None
+            new_merged_terms.append(list(new_group))
 
-    groupings = _groups_to_groupings(num_var, groups)
-    return {"expression": expression_str, "groupings": groupings, "terms": expression_terms}
+        for group in merged_terms:
+            for cube in group:
+                if cube not in merged:
+                    prime_implicants.append(cube)
 
+        merged_terms = [group for group in new_merged_terms if group]
+
+    return prime_implicants
 
 
 def getPrimeImplicants(num_var: int, 
@@ -499,85 +640,512 @@ def getPrimeImplicants(num_var: int,
 
     :return prime_implicants: List of binary strings of prime implicants with don't care digits as '-'.
     """
-    prime_implicants = []
-    merged_terms = [[] for _ in range(num_var + 1)] # Running group for number of 1's/0's in terms
+    cubes = _prime_implicant_cubes(num_var=num_var, terms=terms, dont_cares=dont_cares, form_terms=form_terms)
+    return [_cube_to_string(num_var, cube) for cube in cubes]
+
+
+
+@functools.lru_cache(maxsize=None)
+def _cube_table(num_var: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every one of the `3**num_var` cubes of a K-Map, computed once per number of variables.
+
+    :rtype: tuple[ np.ndarray, np.ndarray, np.ndarray, np.ndarray ]
+    :returns: Cube values and masks (ordered by mask, then value), the cube x term coverage matrix,
+    and for every cube the indices of the cubes with one more don't care digit that contain it.
+    Missing parents are padded with the index `3**num_var`.
+    """
+    full = (1 << num_var) - 1
+    cubes = []
+    for mask in range(1 << num_var):
+        free = full & ~mask
+        sub = free
+        values = []
+        while True: # Every subset of the fixed digits
+            values.append(sub)
+            if sub == 0:
+                break
+            sub = (sub - 1) & free
+        cubes.extend((value, mask) for value in sorted(values))
+    index = {cube: idx for idx, cube in enumerate(cubes)}
+
+    values = np.array([value for value, _ in cubes], dtype=np.int64)
+    masks = np.array([mask for _, mask in cubes], dtype=np.int64)
+    terms = np.arange(1 << num_var, dtype=np.int64)
+    coverage = (terms[None, :] & ~masks[:, None]) == values[:, None]
+
+    parents = np.full((len(cubes), max(num_var, 1)), len(cubes), dtype=np.int64)
+    for idx, (value, mask) in enumerate(cubes):
+        for j, bit in enumerate(_bits(full & ~mask)):
+            parents[idx, j] = index[(value & ~bit, mask | bit)]
+
+    for table in (values, masks, coverage, parents):
+        table.flags.writeable = False
+    return values, masks, coverage, parents
+
+
+def getPrimeImplicantsBatch(num_var: int, on_sets: np.ndarray, dc_sets: np.ndarray | None = None) -> np.ndarray:
+    """
+    Finds the prime implicants of many functions at once with matrix operations on the cube table
+    from `_cube_table()`, instead of running Quine-McCluskey on every function.
+
+    A cube is an implicant if it covers no term outside of the terms and don't cares, and it is prime
+    if none of the cubes with one more don't care digit that contain it is also an implicant.
+    As with `getPrimeImplicants()`, prime implicants that only cover don't cares are included.
+
+    :param num_var: Number of variables in boolean expressions
+    :type num_var: int
+    :param on_sets: Boolean array of shape `(N, 2**num_var)`, with `on_sets[i, t]` set if `t` is a term of function `i`.
+    :type on_sets: np.ndarray
+    :param dc_sets: Boolean array of the same shape for the don't cares. Defaults to no don't cares.
+    :type dc_sets: np.ndarray | None, optional
+
+    :rtype: np.ndarray
+    :returns: Boolean array of shape `(N, 3**num_var)`, with entry `[i, j]` set if cube `j` of `_cube_table(num_var)`
+    is a prime implicant of function `i`. Use `_cube_to_string()` on the cube for the `getPrimeImplicants()` format.
+    """
+    _, _, coverage, parents = _cube_table(num_var)
+    allowed = np.asarray(on_sets, dtype=bool)
+    if dc_sets is not None:
+        allowed = allowed | np.asarray(dc_sets, dtype=bool)
+
+    # Number of terms every cube covers outside of the terms and don't cares
+    outside = (~allowed).astype(np.int32) @ coverage.T.astype(np.int32)
+    implicants = np.zeros((allowed.shape[0], coverage.shape[0] + 1), dtype=bool) # Last column pads missing parents
+    implicants[:, :-1] = outside == 0
+
+    return implicants[:, :-1] & ~implicants[:, parents].any(axis=2)
+
+
+def getQuestionMetricsBatch(num_var: int, on_sets: np.ndarray, dc_sets: np.ndarray | None = None) -> dict[str, np.ndarray]:
+    """
+    Difficulty metrics of many functions at once, from the prime implicants of `getPrimeImplicantsBatch()`.
+
+    - `prime_implicants`: number of prime implicants
+    - `essential`: number of essential prime implicants (the only prime implicant covering some term)
+    - `uncovered`: number of terms not covered by the essential prime implicants. The cyclic core has at
+      most this many terms, and there is no cyclic core if it is 0.
+
+    :param num_var: Number of variables in boolean expressions
+    :type num_var: int
+    :param on_sets: Boolean array of shape `(N, 2**num_var)`, with `on_sets[i, t]` set if `t` is a term of function `i`.
+    :type on_sets: np.ndarray
+    :param dc_sets: Boolean array of the same shape for the don't cares. Defaults to no don't cares.
+    :type dc_sets: np.ndarray | None, optional
+
+    :rtype: dict[ str, np.ndarray ]
+    :returns: Integer array of shape `(N,)` for every metric.
+    """
+    _, _, coverage, _ = _cube_table(num_var)
+    on_sets = np.asarray(on_sets, dtype=bool)
+    prime_implicants = getPrimeImplicantsBatch(num_var, on_sets, dc_sets)
+
+    coverage = coverage.astype(np.int32)
+    covering = prime_implicants.astype(np.int32) @ coverage # Prime implicants covering every term
+    single = (covering == 1) & on_sets
+    essential = prime_implicants & (single.astype(np.int32) @ coverage.T > 0)
+    covered = essential.astype(np.int32) @ coverage > 0
+
+    return {
+        'prime_implicants': prime_implicants.sum(axis=1),
+        'essential': essential.sum(axis=1),
+        'uncovered': (on_sets & ~covered).sum(axis=1),
+    }
+
+
+class SolverBudgetExceeded(Exception):
+    """
+    Raised by `SolverBudget.step()` once a budget is used up.
+    """
 
-    # Start to group terms with how many 1's/0's they have
-    for term in list(map(lambda t: bin(t).lstrip("0b").rjust(num_var, "0"), terms + dont_cares)): # Convert to binary strings
-        if form_terms.lower() == "min":
-            count = term.count("1")
-        elif form_terms.lower() == "max":
-            count = term.count("0")
-        merged_terms[count].append(term)
 
-    merged_terms = list(filter(lambda b: b, merged_terms)) # Remove groups with no terms
-    # print(merged_terms)
+class SolverBudget:
+    """
+    Limit on the work of the exact cover search of one function, in search steps (nodes of the branch and
+    bound in `_iter_covers()`) and in seconds from its first step. Crafted functions, such as the terms with two
+    ones of 6 variables with the terms with three ones as don't cares, have millions of minimum covers,
+    and some 7 and 8 variable functions take minutes to find the size of one.
+
+    Solvers given a budget stop the search when it is used up and set `exceeded`. If no minimum cover was found
+    by then, they return an irredundant cover found greedily instead (see `_greedy_cover()`) and set `exact` to False,
+    as it may have more terms than a minimal expression. Otherwise the minimal expressions found so far are returned.
+
+    :param max_steps: Search steps allowed, no limit if None.
+    :type max_steps: int | None
+    :param max_seconds: Seconds allowed, no limit if None.
+    :type max_seconds: float | None
+    """
+
+    def __init__(self, max_steps: int | None = None, max_seconds: float | None = None):
+        self.max_steps = max_steps
+        self.max_seconds = max_seconds
+        self.steps = 0
+        self.exceeded = False
+        self.exact = True
+        self._deadline = None
+
+    def step(self):
+        """
+        Counts one search step.
+
+        :raises SolverBudgetExceeded: If the steps or seconds allowed are used up.
+        """
+        self.steps += 1
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise SolverBudgetExceeded()
+        if self.max_seconds is not None:
+            now = time.monotonic()
+            if self._deadline is None:
+                self._deadline = now + self.max_seconds
+            elif now > self._deadline:
+                raise SolverBudgetExceeded()
+
+
+class SolverBudgetStats:
+    """
+    Counts of budgeted solves and of the ones that fell back to a greedy cover, for the `exact` flag
+    of solutions that may come from other processes. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._solves = 0
+        self._fallbacks = 0
 
-    # print("Current merged minterms:", merged_terms)
+    def record(self, exact: bool):
+        """Counts one solve, and one fallback if it is not `exact`."""
+        with self._lock:
+            self._solves += 1
+            self._fallbacks += not exact
 
+    def stats(self) -> dict:
+        """Solves and fallbacks since the process started."""
+        with self._lock:
+            return {
+                'solves': self._solves,
+                'fallbacks': self._fallbacks,
+                'fallback_rate': self._fallbacks / self._solves if self._solves else 0.0,
+            }
+
+
+def _cover_metrics(terms: list[int], cubes: list[tuple[int, int]], max_solutions: int | None = None) -> tuple[int, int, int, tuple[int, ...] | None]:
+    """
+    Metrics of the prime implicant chart of `terms` that need a search, for one function at a time.
+
+    :rtype: tuple[ cyclic_core, min_terms, solutions, cover ]
+    :returns: Number of terms in the cyclic core, number of cubes in a minimum cover, number of minimum covers
+    (counting stops past `max_solutions`) and the first minimum cover as indices into `cubes` (None if there is none).
+    """
+    _, core = _reduce_chart(_cover_chart(terms, cubes))
+    cover = None
+    solutions = 0
+    for found in _iter_minimum_covers(terms, cubes):
+        cover = cover or found
+        solutions += 1
+        if max_solutions is not None and solutions > max_solutions:
+            break
+    return len(core), len(cover) if cover else 0, solutions, cover
+
+
+def _string_to_cube(implicant: str) -> tuple[int, int]:
+    """
+    Converts a binary string implicant (with '-' as don't care digits) into a `(value, mask)` cube.
+    """
+    value = 0
+    mask = 0
+    for ch in implicant:
+        value <<= 1
+        mask <<= 1
+        if ch == "-":
+            mask |= 1
+        elif ch == "1":
+            value |= 1
+    return value, mask
+
+
+def _bits(mask: int):
+    """
+    Yields every set bit of `mask` as a single-bit integer, lowest first.
+    """
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
 
+
+def _cover_chart(terms: list[int], cubes: list[tuple[int, int]]) -> list[int]:
+    """
+    Builds the prime implicant chart column by column: for every term, a bitmask of the indices
+    of the cubes that cover it.
+    """
+    columns = []
+    for term in dict.fromkeys(terms):
+        column = 0
+        for idx, (value, mask) in enumerate(cubes):
+            if term & ~mask == value:
+                column |= 1 << idx
+        columns.append(column)
+    return columns
+
+
+def _reduce_chart(columns: list[int], row_dominance: bool = False) -> tuple[int, list[int]]:
+    """
+    Reduces a prime implicant chart to its cyclic core.
+
+    - Essential prime implicants (the only cover of some term) are taken out along with every term they cover.
+    - Column dominance: a term whose covering set contains another term's covering set is dropped,
+      since covering the other term covers it too. This keeps every cover of the chart.
+    - Row dominance (optional): a prime implicant covering a subset of another's remaining terms is
+      dropped. This keeps the minimum cover size but not every minimum cover, so it is only used to
+      bound the search.
+
+    :rtype: tuple[ int, list[ int ] ]
+    :returns: Bitmask of the essential prime implicants and the columns of the cyclic core.
+    """
+    essential = 0
     while True:
-        merged_terms_cache = [] # Cache to avoid adding duplicate unmatched terms, especially for largest group of terms
-        new_merged_terms = [[] for _ in range(num_var + 1)]
-
-        for j in range(len(merged_terms)-1): # Loop for every term group except last one
-            for term1 in merged_terms[j]: # Loop for every term in current term group
-                noMatches = True 
-                for term2 in merged_terms[j+1]: # Check every term of next term group
-                    
-                    diff = -1 # index of only different digit
-                    for d in range(len(term1)): # Check every digit of two terms
-                        if term1[d] != term2[d] and diff == -1:
-                            diff = d
-                        elif term1[d] == term2[d]:
-                            continue
-                        else:
-                            break # Stop if there's another difference
-                    else: #
-                        noMatches = False
-
-                        # Save to cache for prime implicant saving
-                        if term1 not in merged_terms_cache:
-                            merged_terms_cache.append(term1)
-                        if term2 not in merged_terms_cache:
-                            merged_terms_cache.append(term2)
-
-                        new_term = list(term1)
-                        new_term[diff] = "-"
-                        new_term = "".join(new_term)
-                        if new_term not in new_merged_terms[j]: # Avoid repeating terms
-                            new_merged_terms[j].append(new_term)
-
-                if noMatches:
-                    if term1 not in merged_terms_cache:
-                        prime_implicants.append(term1)
-
-        # Check last group of terms
-        for mt in merged_terms[-1]:
-            if mt not in merged_terms_cache:
-                    prime_implicants.append(mt)
-
-        if new_merged_terms == [[] for _ in range(num_var + 1)]: # If no new terms were merged
-            # Add all remaining terms if not in current prime implicant list and finish loop
-            for group in merged_terms:
-                for mt in group:
-                    if mt not in prime_implicants:
-                        prime_implicants.append(mt)
-            break 
-
-        else: # If there are new minterms, repeat loop
-            merged_terms = new_merged_terms
-            merged_terms = list(filter(lambda b: b, merged_terms)) # Remove groups with no terms
-
-    # print(prime_implicants)
-    return prime_implicants
+        if any(column == 0 for column in columns):
+            return essential, [0] # Some term can not be covered
+
+        singles = 0
+        for column in columns:
+            if column & (column - 1) == 0:
+                singles |= column
+        essential |= singles
+
+        # Column dominance (also removes repeated columns)
+        reduced = []
+        for column in sorted(set(column for column in columns if not column & singles), key=lambda c: (c.bit_count(), c)):
+            if not any(kept & column == kept for kept in reduced):
+                reduced.append(column)
+
+        if row_dominance:
+            rows = {}
+            for j, column in enumerate(reduced):
+                for bit in _bits(column):
+                    rows[bit] = rows.get(bit, 0) | (1 << j)
+            dominated = 0
+            for bit, row in rows.items():
+                for other, other_row in rows.items():
+                    if other == bit or other & dominated:
+                        continue
+                    # Ties keep the lower index
+                    if row & other_row == row and (row != other_row or other < bit):
+                        dominated |= bit
+                        break
+            reduced = [column & ~dominated for column in reduced]
+
+        if reduced == columns:
+            return essential, columns
+        columns = reduced
+
+
+def _cover_lower_bound(columns: list[int]) -> int:
+    """
+    Lower bound for the number of prime implicants needed to cover `columns`: the size of a greedy
+    set of columns that share no prime implicant.
+    """
+    used = 0
+    count = 0
+    for column in sorted(columns, key=int.bit_count):
+        if not column & used:
+            used |= column
+            count += 1
+    return count
+
 
+def _iter_covers(columns: list[int], bound: int, chosen: int = 0, size: int = 0, budget: SolverBudget | None = None):
+    """
+    Branch and bound over a prime implicant chart.
+
+    Branches on the term with the fewest covering prime implicants. Each branch takes one of them
+    and excludes the ones tried before it, so no cover is visited twice. Branches that can not
+    finish within `bound` prime implicants are pruned. Every branch is one step of `budget`.
+
+    :returns: Generator of every cover of size `bound` or less as a bitmask of prime implicant indices,
+    in the order the search finds them.
+    """
+    if budget is not None:
+        budget.step()
+    if not columns:
+        yield chosen
+        return
+    if size + _cover_lower_bound(columns) > bound:
+        return
+
+    column = min(columns, key=int.bit_count)
+    excluded = 0
+    for bit in _bits(column):
+        remaining = []
+        for other in columns:
+            if other & bit:
+                continue
+            other &= ~excluded
+            if other == 0:
+                break
+            remaining.append(other)
+        else:
+            yield from _iter_covers(remaining, bound, chosen | bit, size + 1, budget)
+        excluded |= bit
+
+
+def _minimum_cover_size(columns: list[int], budget: SolverBudget | None = None) -> int:
+    """
+    Size of a minimum cover of `columns`, found by branch and bound on the chart reduced with both
+    row and column dominance.
+
+    :raises SolverBudgetExceeded: If `budget` is used up.
+    """
+    essential, core = _reduce_chart(columns, row_dominance=True)
+    best = essential.bit_count()
+    if not core:
+        return best
+
+    # Tighten the bound until a cover is found
+    bound = _cover_lower_bound(core)
+    while next(_iter_covers(core, bound, budget=budget), None) is None:
+        bound += 1
+    return best + bound
+
+
+def _iter_minimum_covers(terms: list[int], cubes: list[tuple[int, int]], budget: SolverBudget | None = None):
+    """
+    Finds every minimum-cardinality set of cubes that covers all terms.
+
+    Essential prime implicants and column dominance are applied first, then the minimum size is
+    found on the chart further reduced with row dominance. Every cover of that size in the cyclic
+    core is then enumerated and joined with the essential prime implicants.
+
+    :raises SolverBudgetExceeded: If `budget` is used up.
+    :returns: Generator of covers, each a sorted tuple of indices into `cubes`, in the order the search finds them.
+    """
+    columns = _cover_chart(terms, cubes)
+    essential, core = _reduce_chart(columns)
+    if 0 in core:
+        return
+
+    bound = _minimum_cover_size(core, budget) if core else 0
+    covers = _iter_covers(core, bound, budget=budget) if core else [0]
+
+    for cover in covers:
+        cover |= essential
+        yield tuple(idx for idx in range(len(cubes)) if (cover >> idx) & 1)
+
+
+def _minimum_covers(terms: list[int], cubes: list[tuple[int, int]]) -> list[tuple[int, ...]]:
+    """
+    Every minimum-cardinality cover from `_iter_minimum_covers()`, sorted.
+
+    :rtype: list[ tuple[ int, ... ] ]
+    :returns: List of covers, each a sorted tuple of indices into `cubes`.
+    """
+    return sorted(_iter_minimum_covers(terms, cubes))
+
+
+def _greedy_cover(terms: list[int], cubes: list[tuple[int, int]]) -> tuple[int, ...]:
+    """
+    A cover of `terms` found without a search, for when the search for a minimum one is over its budget.
+    The essential prime implicants are taken, then the cube covering the most terms of the cyclic core left
+    until all are covered, and cubes that every term they cover is covered by another are dropped.
+    The cover is irredundant, but it may not be minimum. `terms` must be coverable by `cubes`.
+
+    :rtype: tuple[ int, ... ]
+    :returns: Sorted tuple of indices into `cubes`.
+    """
+    columns = _cover_chart(terms, cubes)
+    chosen, remaining = _reduce_chart(columns)
+    while remaining:
+        counts = {}
+        for column in remaining:
+            for bit in _bits(column):
+                counts[bit] = counts.get(bit, 0) + 1
+        best = max(counts, key=lambda bit: (counts[bit], -bit)) # Ties take the lower index
+        chosen |= best
+        remaining = [column for column in remaining if not column & best]
+
+    for bit in sorted(_bits(chosen), reverse=True):
+        if all(column & chosen & ~bit for column in columns):
+            chosen &= ~bit
+    return tuple(idx for idx in range(len(cubes)) if (chosen >> idx) & 1)
+
+
+def _iter_budgeted_covers(terms: list[int], cubes: list[tuple[int, int]], budget: SolverBudget | None = None):
+    """
+    `_iter_minimum_covers()` within `budget` (see `SolverBudget`). When it is used up, stops, or yields
+    `_greedy_cover()` if no minimum cover was found yet.
+    """
+    found = False
+    try:
+        for cover in _iter_minimum_covers(terms, cubes, budget):
+            found = True
+            yield cover
+    except SolverBudgetExceeded:
+        budget.exceeded = True
+        if not found:
+            budget.exact = False
+            yield _greedy_cover(terms, cubes)
+
+
+def _absorb(products: set[int]) -> list[int]:
+    """
+    Absorption on a sum of products of prime implicants, e.g. X + XY = X. Every product is a bitmask
+    of prime implicant indices, and any product containing another product is removed.
+    """
+    kept = []
+    for product in sorted(products, key=lambda p: (p.bit_count(), p)):
+        if not any(other & product == other for other in kept):
+            kept.append(product)
+    return kept
+
+
+def _petrick_covers(terms: list[int], cubes: list[tuple[int, int]], max_products: int | None = None) -> tuple[list[tuple[int, ...]], int]:
+    """
+    Petrick's method with every product term stored as a bitmask of cube indices.
+
+    The chart is first reduced to its essential prime implicants and cyclic core (both keep every
+    irredundant cover). The clauses of the core are then multiplied in one at a time, shortest
+    first, and absorption is applied after every multiplication so the running sum only ever holds
+    irredundant products.
+
+    :param max_products: Raises `OverflowError` if a multiplication step produces more than this many products.
+    :type max_products: int | None
+
+    :rtype: tuple[ list[ tuple[ int, ... ] ], int ]
+    :returns: List of irredundant covers as sorted tuples of indices into `cubes` (smallest covers
+    first), and the peak number of products held at once during the expansion (before absorption).
+    """
+    essential, core = _reduce_chart(_cover_chart(terms, cubes))
+    if 0 in core:
+        return [], 0
+
+    products = [0]
+    peak = 1
+    for column in sorted(core, key=lambda c: (c.bit_count(), c)):
+        expanded = set()
+        for product in products:
+            if product & column: # (X)(X+Y) = X
+                expanded.add(product)
+                continue
+            for bit in _bits(column):
+                expanded.add(product | bit)
+            if max_products is not None and len(expanded) > max_products:
+                raise OverflowError(f"Petrick expansion exceeded {max_products} products.")
+
+        peak = max(peak, len(expanded))
+        products = _absorb(expanded)
+
+    covers = []
+    for product in products:
+        product |= essential
+        covers.append(tuple(idx for idx in range(len(cubes)) if (product >> idx) & 1))
+    return sorted(covers, key=lambda cover: (len(cover), cover)), peak
 
 
 def minimizePrimeImplicants(num_var: int, 
                                 terms: list, 
                                 prime_implicants: list[str],
-                                form_terms: str = "min"
+                                form_terms: str = "min",
+                                budget: SolverBudget | None = None
                                 ) -> list[list[set[str]]]:
     """
     Returns a list of all possible minimal expressions given a list of terms and prime implicants.
@@ -592,177 +1160,308 @@ def minimizePrimeImplicants(num_var: int,
     :type prime_implicants: list[str]
     :param form_terms: `"min"` or `"max"`, determines if the given terms are minterms or maxterms. Defaults to `"min"`.
     :type form_terms: str, optional
+    :param budget: Limit on the search, see `SolverBudget`. Defaults to no limit.
+    :type budget: SolverBudget | None, optional
 
     :rtype: list[ list[ set[ str ] ] ]
     :returns: List of all possible minimal expressions. Each expression is a list of terms, 
     which are represented as a set of strings.
     """
 
-    prime_implicant_chart: dict = {}
-    terms = list(map(lambda mt: bin(mt).lstrip("0b").rjust(num_var, "0"), terms)) # Convert to strings of binary
-    for pi in prime_implicants: # Add keys with empty string values in chart for every prime implicant
-        prime_implicant_chart[pi] = ""
+    if len(terms) == 0:
+        return []
 
-    # Fill up prime implicant chart
-    for pi in prime_implicant_chart.keys(): # For every prime implicant...
-        for term in terms: # ... check if they cover any term in list of terms
-            for answer in range(len(pi)):
-                if pi[answer] == term[answer] or pi[answer] == "-":
-                    continue
-                else:
-                    prime_implicant_chart[pi] += "0"
-                    break # Stop if prime implicant does not cover term
-            else:
-                prime_implicant_chart[pi] += "1"
+    cubes = [_string_to_cube(pi) for pi in prime_implicants]
+    covers = sorted(_iter_budgeted_covers(terms=terms, cubes=cubes, budget=budget))
 
+    # Get final expression from literals, converting every prime implicant once as there can be thousands of covers
+    literal_sets = [_implicant_to_literal_set(num_var, pi, form_terms) for pi in prime_implicants]
+    final_expressions = []
+    for cover in covers:
+        final_expressions.append([set(literal_sets[idx]) for idx in cover])
 
-    # Start of chart simplification (at this point, currently SOP of prime implicant literals?)
-    curr_min_exp = [[] for _ in range(len(terms))]
-    
-    # Write initial expression
-    for i in range(len(terms)):
-        for pi in prime_implicant_chart.keys():
-            if prime_implicant_chart[pi][i] == "1":
-                curr_min_exp[i].append(prime_implicants.index(pi))
-
-
-    # Minimize absorbing literals, e.g. (A)(A+B) = (A), (A+B)(A+B+C) = (A+B), ...
-    temp_min_exp = copy.deepcopy(curr_min_exp)
-    for curr_answer in curr_min_exp:
-        for other_group in curr_min_exp:
-            if curr_answer == other_group:
-                continue
-            elif all(literal in other_group for literal in curr_answer) and other_group in temp_min_exp:
-                temp_min_exp.remove(other_group)
-    curr_min_exp = temp_min_exp
-                    
-    # Minimize distributive groups with the same number of literals
-    # Example: (A+B) (B+C) = (B + AC), (A+B+C)(A+B+D) = (A + B + CD),...
-    # For now, this code block only processes groups with only 1 different literalm check if need to check for more
-    while True:
-        temp_min_exp = copy.deepcopy(curr_min_exp)
-        for curr_answer in curr_min_exp:
-            if len(curr_answer) < 2:
-                continue
-            for other_group in curr_min_exp:
-                if curr_answer == other_group:
-                    continue
-                else:
-                    curr_in_other = [literal in other_group for literal in curr_answer] # list of boolean if elements in curr_group are missing in other
-                    other_in_curr = [literal in curr_answer for literal in other_group] # list of boolean if elements in other_group are missing in curr
-                    if curr_in_other.count(False) == 1 and other_in_curr.count(False) == 1:
-                        if curr_answer in temp_min_exp and other_group in temp_min_exp:
-                            temp_min_exp.remove(curr_answer)
-                            temp_min_exp.remove(other_group)
-                            # Get all literals existing in both groups
-                            new_literal = list(filter(lambda literal: curr_in_other[curr_answer.index(literal)], curr_answer))
-                            # Get all literals that are different in both groups
-                            curr_missing = list(filter(lambda literal: not curr_in_other[curr_answer.index(literal)], curr_answer))
-                            other_missing = list(filter(lambda literal: not other_in_curr[other_group.index(literal)], other_group))
-                            new_literal.append(tuple(curr_missing + other_missing))
-                            temp_min_exp.append(new_literal)
-
-        if curr_min_exp == temp_min_exp: # If no simplification was done
-            break
-        else:
-            curr_min_exp = temp_min_exp
+    return final_expressions
 
 
-    # Multiply all POS to form SOPs
-    new_min_exp = []
-    while len(curr_min_exp) > 0:
-        curr_group = []
-        for group in curr_min_exp.pop(0):
-            if type(group) is tuple:
-                curr_group.append(''.join(str(val) for val in group))
-            else:
-                curr_group.append(group)
 
-        if len(new_min_exp) == 0:
-            if len(curr_min_exp) == 0:
-                new_min_exp.append(curr_group)
-            else:
-                new_min_exp = curr_group
-            continue 
-        else:
-            temp_minbool = []
-            for el1 in new_min_exp:
-                for el2 in curr_group:
-                    temp_minbool.append(str(el1) + str(el2))
-            new_min_exp = temp_minbool
-
-    # Convert to sets to remove repeating literals, e.g. AAB = AB
-    for i in range(len(new_min_exp)):
-        new_min_exp[i] = sorted(list(set(list(new_min_exp[i]))))
-    new_min_exp.sort(key=lambda x: len(x))
-
-    # Remove all absorbing literals but in SOP form
-    while True:
-        temp_min_exp = copy.deepcopy(new_min_exp)
-        for i in range(len(new_min_exp)):
-            for j in range(i, len(new_min_exp)):
-                curr_answer = new_min_exp[i]
-                other_group = new_min_exp[j]
-                if curr_answer == other_group:
-                    continue
-                elif len(other_group) > len(curr_answer) and [literal in other_group for literal in curr_answer].count(False) >= 1 and other_group in temp_min_exp:
-                    temp_min_exp.remove(other_group)
+def iterMinimalExpressions(num_var: int,
+                           terms: list,
+                           prime_implicants: list[str],
+                           form_terms: str = "min",
+                           limit: int | None = None,
+                           budget: SolverBudget | None = None
+                           ):
+    """
+    Lazy version of `minimizePrimeImplicants()`: yields minimal expressions one at a time as the cover
+    search finds them, so callers that need only a few do not pay for enumerating all of them.
+    Expressions come in search order, not the sorted order of `minimizePrimeImplicants()`.
 
-        if new_min_exp == temp_min_exp:
-            break
-        else:
-            new_min_exp = temp_min_exp
+    :param num_var: Number of variables in boolean expression
+    :type num_var: int
+    :param terms: List of given min/maxterms as integers
+    :type terms: list[int]
+    :param prime_implicants: List of prime implicants as strings of binary and '-' as don't cares.
+    :type prime_implicants: list[str]
+    :param form_terms: `"min"` or `"max"`, determines if the given terms are minterms or maxterms. Defaults to `"min"`.
+    :type form_terms: str, optional
+    :param limit: Stop after this many expressions. Defaults to no limit.
+    :type limit: int | None, optional
+    :param budget: Limit on the search, see `SolverBudget`. Defaults to no limit.
+    :type budget: SolverBudget | None, optional
 
-    # Get the smallest length groups
-    min_length = min(len(x) for x in new_min_exp)
-    minimal_expressions = list(filter(lambda x: len(x) == min_length, new_min_exp))
-    # print(f"Minimal expression: {minimal_expressions}")
+    :returns: Generator of minimal expressions in the same format as `minimizePrimeImplicants()`.
+    """
+    if len(terms) == 0 or (limit is not None and limit <= 0):
+        return
 
-    # Get final expression from literals
-    final_expressions = []
-    terms = [chr(65+x) for x in range(num_var)]
-
-    # brute force switching T_T sorry AHAHHA
-    if num_var == 2:
-        terms[0], terms[1] = terms[1], terms[0]
-    elif num_var == 3:
-        terms[0], terms[1], terms[2] = terms[2], terms[0], terms[1]
-    elif num_var == 4:
-        terms[0:2], terms[2:4] = terms[2:4], terms[0:2]
-    elif num_var == 5:
-        terms[1:3], terms[3:5] = terms[3:5], terms[1:3]
-    elif num_var == 6:
-        terms[0], terms[1], terms[2:4], terms[4:6] = terms[1], terms[0], terms[4:6], terms[2:4]
-    # print(f"Terms: {terms}")
-    for answer in minimal_expressions:
-        curr_answer = []
-        for group in answer:
-            curr_group = set()
-            for f in range(len(prime_implicants[int(group)])):
-                if prime_implicants[int(group)][f] == "-":
-                    continue
-                elif prime_implicants[int(group)][f] == "1":
-                    curr_group.add(str(terms[f]) if form_terms == "min" else str(terms[f]) + "'")
-                elif prime_implicants[int(group)][f] == "0":
-                    curr_group.add(str(terms[f]) + "'" if form_terms == "min" else str(terms[f]))
-            curr_answer.append(curr_group)
-        final_expressions.append(curr_answer)
+    cubes = [_string_to_cube(pi) for pi in prime_implicants]
+    for count, cover in enumerate(_iter_budgeted_covers(terms=terms, cubes=cubes, budget=budget), start=1):
+        yield [_implicant_to_literal_set(num_var, prime_implicants[idx], form_terms) for idx in cover]
+        if limit is not None and count >= limit:
+            return
 
-    return final_expressions
 
 
+def getIrredundantExpressions(num_var: int,
+                              terms: list,
+                              prime_implicants: list[str],
+                              form_terms: str = "min",
+                              max_products: int | None = None
+                              ) -> tuple[list[list[set[str]]], int]:
+    """
+    Returns every irredundant expression (no term can be removed) given a list of terms and prime implicants,
+    not just the ones with the fewest terms. Uses Petrick's method with absorption at every multiplication step.
 
-def checkAnswer(minimal_expressions: list[list[set[str]]], input_answer: str, form_answer: str = "min") -> int:
+    :param num_var: Number of variables in boolean expression
+    :type num_var: int
+    :param terms: List of given min/maxterms as integers
+    :type terms: list[int]
+    :param prime_implicants: List of prime implicants as strings of binary and '-' as don't cares.
+    :type prime_implicants: list[str]
+    :param form_terms: `"min"` or `"max"`, determines if the given terms are minterms or maxterms. Defaults to `"min"`.
+    :type form_terms: str, optional
+    :param max_products: Limit on the number of intermediate products. Raises `OverflowError` when exceeded. Defaults to no limit.
+    :type max_products: int | None, optional
+
+    :rtype: tuple[ list[ list[ set[ str ] ] ], int ]
+    :returns: List of all irredundant expressions, fewest terms first, in the same format as `minimizePrimeImplicants()`,
+    and the peak number of intermediate products held during the expansion.
     """
-    Checks a given answer against the minimal expression given by `minimizePrimeImplicants()`.
+    if len(terms) == 0:
+        return [], 0
 
-    :param minimal_expressions: List of all possible minimal expressions. Each expression is a list of terms, 
-    which are represented as a set of strings.
-    :type minimal_expressions: list[list[set[str]]]
+    cubes = [_string_to_cube(pi) for pi in prime_implicants]
+    covers, peak = _petrick_covers(terms=terms, cubes=cubes, max_products=max_products)
+
+    expressions = []
+    for cover in covers:
+        expressions.append([_implicant_to_literal_set(num_var, prime_implicants[idx], form_terms) for idx in cover])
+
+    return expressions, peak
+
+
+class AnswerCharacterError(ValueError):
+    """
+    Raised by `_parse_answer()` for a character that can not appear in an answer.
+    """
+    def __init__(self, message: str, position: int):
+        super().__init__(f"{message} (position {position})")
+        self.position = position
+
+
+class AnswerLengthError(Exception):
+    """
+    Raised by `_parse_answer()` for an answer longer than `MAX_ANSWER_LENGTH`, before reading any of it.
+    """
+
+
+class AnswerFormError(IndexError):
+    """
+    Raised by `_parse_answer()` for an answer that can not be read in the given form.
+    """
+    def __init__(self, message: str, position: int):
+        super().__init__(f"{message} (position {position})")
+        self.position = position
+
+
+# Longest answer read. A minimal expression of 8 variables has at most 128 terms of at most 8 literals,
+# which is about 3300 characters in either form
+MAX_ANSWER_LENGTH = 4096
+
+# Token kinds for every character accepted in an answer, including the quote variants sent by phone keyboards
+_LETTER, _QUOTE, _PLUS, _OPEN, _CLOSE, _SPACE = range(6)
+_ANSWER_TOKENS = {
+    **{letter: _LETTER for letter in "ABCDEFGH"},
+    "'": _QUOTE, "\u2018": _QUOTE, "\u2019": _QUOTE,
+    "+": _PLUS,
+    "(": _OPEN,
+    ")": _CLOSE,
+    " ": _SPACE,
+}
+
+
+def _parse_answer(input_answer: str, form_answer: str = "min") -> list[set[str]]:
+    """
+    Reads a given answer in one pass into a list of terms, each a set of literals such as `"A"` or `"B'"`.
+    Every quote variant is read as `'`. This is the inverse of `stringifyExpression()`.
+
+    - SOP (`"min"`): terms are split by `+`, parentheses are ignored, and a quote complements the letter before it.
+    - POS (`"max"`): terms are split by parentheses and literals by `+`, e.g. `(A+B')(C)`.
+
+    Raises `AnswerCharacterError` (a `ValueError`) if the answer contains other characters and
+    `AnswerFormError` (an `IndexError`) if it is given in the wrong form, both with the position of the character.
+    Raises `AnswerLengthError` if the answer is longer than `MAX_ANSWER_LENGTH`.
+    """
+    if len(input_answer) > MAX_ANSWER_LENGTH:
+        raise AnswerLengthError(f"Answer is longer than {MAX_ANSWER_LENGTH} characters.")
+    terms = []
+    if form_answer == "min":
+        term = set()
+        literal = None # Last literal read, kept out of `term` until its quotes are read
+        for position, char in enumerate(input_answer):
+            token = _ANSWER_TOKENS.get(char)
+            if token == _LETTER:
+                if literal is not None:
+                    term.add(literal)
+                literal = char
+            elif token == _QUOTE:
+                if literal is None:
+                    raise AnswerFormError("Quote is not after a literal.", position)
+                literal += "'"
+            elif token == _PLUS:
+                if literal is not None:
+                    term.add(literal)
+                terms.append(term)
+                term = set()
+                literal = None
+            elif token is None:
+                raise AnswerCharacterError("Answer contains other characters besides ABCDEFGH'()+.", position)
+        if literal is not None:
+            term.add(literal)
+        terms.append(term)
+
+    elif form_answer == "max":
+        term = set()
+        literal = ""
+        started = False # If anything was read since the last parenthesis
+        for position, char in enumerate(input_answer):
+            token = _ANSWER_TOKENS.get(char)
+            if token == _LETTER:
+                literal += char
+                started = True
+            elif token == _QUOTE:
+                literal += "'"
+                started = True
+            elif token == _PLUS:
+                term.add(literal)
+                literal = ""
+                started = True
+            elif token == _OPEN or token == _CLOSE:
+                if started:
+                    term.add(literal)
+                    terms.append(term)
+                term = set()
+                literal = ""
+                started = False
+            elif token is None:
+                raise AnswerCharacterError("Answer contains other characters besides ABCDEFGH'()+.", position)
+        if started:
+            term.add(literal)
+            terms.append(term)
+
+        if len(terms) == 0:
+            raise AnswerFormError("Answer is given as SOP, not POS form.", len(input_answer))
+
+    return terms
+
+
+def _terms_to_bitmask(terms: list[int]) -> int:
+    """
+    Truth table of a list of terms as a `2**num_var` bit integer, with bit `t` set for every term `t`.
+    """
+    bitmask = 0
+    for term in terms:
+        bitmask |= 1 << int(term)
+    return bitmask
+
+
+def _cube_bitmask(cube: tuple[int, int]) -> int:
+    """
+    Truth table of every term covered by a `(value, mask)` cube.
+    """
+    value, mask = cube
+    bitmask = 0
+    sub = mask
+    while True: # Every subset of the mask
+        bitmask |= 1 << (value | sub)
+        if sub == 0:
+            return bitmask
+        sub = (sub - 1) & mask
+
+
+def _literal_set_to_cube(num_var: int, literals: set[str], form_terms: str = "min") -> tuple[int, int] | None:
+    """
+    Inverse of `_implicant_to_literal_set()`: converts a term's literals into a `(value, mask)` cube.
+
+    :rtype: tuple[ int, int ] | None
+    :returns: The cube, or `None` if a literal is not one of the variables or a variable appears
+    both complemented and uncomplemented.
+    """
+    positions = {letter: num_var - 1 - idx for idx, letter in enumerate(_apply_term_letter_mapping(num_var))}
+    value = 0
+    fixed = 0
+    for literal in literals:
+        letter = literal.rstrip("'")
+        if letter not in positions or len(literal) - len(letter) > 1:
+            return None
+        bit = 1 << positions[letter]
+        # Minterms use an uncomplemented literal for a 1, maxterms for a 0
+        one = (letter == literal) == (form_terms == "min")
+        if fixed & bit and bool(value & bit) != one:
+            return None
+        fixed |= bit
+        if one:
+            value |= bit
+    return value, ((1 << num_var) - 1) & ~fixed
+
+
+def checkAnswerCover(num_var: int,
+                     terms: list[int],
+                     dont_cares: list[int],
+                     input_answer: str,
+                     form_answer: str = "min",
+                     minimum_terms: int | None = None,
+                     on_set: int | None = None,
+                     dc_set: int | None = None,
+                     minimum_exact: bool = True
+                     ) -> int:
+    """
+    Checks a given answer by evaluating it instead of comparing it against every minimal expression.
+
+    Every term of the answer is turned into a cube and its truth table is compared against the given
+    terms and don't cares. The answer is correct if it covers every term and nothing outside of the terms
+    and don't cares, every term is a prime implicant, and it has as many terms as a minimal expression.
+    Only the size of one minimum cover is needed, so the minimal expressions do not have to be enumerated.
+
+    :param num_var: Number of variables in boolean expression
+    :type num_var: int
+    :param terms: List of given min/maxterms as integers
+    :type terms: list[int]
+    :param dont_cares: List of don't cares.
+    :type dont_cares: list[int]
     :param input_answer: Given answer in string. Must only contain the following characters: ABCD\'()+ and space.
     :type input_answer: str
-    :param form_terms: `"min"` or `"max"`, determines if the given terms are minterms or maxterms. Defaults to `"min"`.
-    :type form_terms: str, optional
+    :param form_answer: `"min"` or `"max"`, determines if the given terms are minterms or maxterms. Defaults to `"min"`.
+    :type form_answer: str, optional
+    :param minimum_terms: Number of terms in a minimal expression, if already known. Found with the cover solver otherwise.
+    :type minimum_terms: int | None, optional
+    :param on_set: Bitmask of `terms` (bit `t` set for term `t`), if already known. Found from `terms` otherwise.
+    :type on_set: int | None, optional
+    :param dc_set: Bitmask of `dont_cares`, if already known. Found from `dont_cares` otherwise.
+    :type dc_set: int | None, optional
+    :param minimum_exact: If False, `minimum_terms` is the size of a cover that may not be minimum (see `SolverBudget`),
+        and answers with fewer terms are correct too. Defaults to True.
+    :type minimum_exact: bool, optional
 
     :rtype result: int
     :returns:  Results in the following integer values:
@@ -771,82 +1470,58 @@ def checkAnswer(minimal_expressions: list[list[set[str]]], input_answer: str, fo
             - `0` = input answer is incorrect
             - `-1` = Answer contains other characters
             - `-2`= Answer is given in the wrong form (SOP/POS, does not guarantee correctness)
-            - `-3`= Any other error caught by the checker (ideally should not be returned)
-    
+            - `-3`= Any other error caught by the checker, such as an answer over `MAX_ANSWER_LENGTH` characters
     """
-    # Input parser
     try:
-        if all(char in ['A', 'B', 'C', 'D', 'E', 'F', '\'', ' ', '(', ')', '+', '', '\u2018', '\u0027', '\u2019'] for char in input_answer) == False: 
-            raise ValueError('Answer contains other characters besides ABCD\'()+.')
-        else:
-            input_answer = input_answer.replace(' ', '')
-            input_answer = input_answer.replace('\u2018', '\'')
-            input_answer = input_answer.replace('\u0027', '\'')
-            input_answer = input_answer.replace('\u2019', '\'')
-            if form_answer == "min":
-                # Group minterms
-                input_answer = input_answer.replace("(", '').replace(")", '').split('+')
-
-                # Answer check
-                if len(input_answer) == 0:
-                    raise IndexError('Answer is given as POS, not SOP form.')
-
-                # Group literals
-                for i in range(len(input_answer)): # Loop through minterms
-                    temp_term = []
-                    for j in range(len(input_answer[i])): # Loop through literals
-                        char = input_answer[i][j]
-                        if char == '\'':
-                            temp_term[-1] = temp_term[-1] + '\''
-                        else:
-                            temp_term.append(char)
-                    input_answer[i] = set(temp_term)
-
-            elif form_answer == "max":
-                # Group maxterms
-                input_answer = re.split('\)\(|\(|\)', input_answer)
-                input_answer = list(filter(lambda x: x != "", input_answer))
-                # Answer check
-                if len(input_answer) == 0:
-                    raise IndexError('Answer is given as SOP, not POS form.')
-
-                # Clean max terms of parentheses and group literals
-                for i in range(len(input_answer)):
-                    input_answer[i] = set(input_answer[i].strip('()').split('+'))
-
-            # print("Input answer:", input_answer)
-
-
+        input_answer = _parse_answer(input_answer, form_answer)
     except ValueError: # Answer contains other characters besides ABCD\'()+.
         return -1
     except IndexError: # Answer is given in wrong form (SOP/POS).
         return -2
     except: # Catch all, answer is given in wrong format.
         return -3
-    
-    # Checker proper
-    for answer in minimal_expressions:
-        # print(answer)
-        for term in answer:
-            # print(term)
-            if len(input_answer) == 1:
-                if len(term) == len(input_answer[0]) and list(term)[0] in list(input_answer[0])[0]:
-                    continue
-                else:
-                    print("oh no")
-                    break
-            else:
-                if term in input_answer:
-                    continue
-                else:
-                    break
-        else:
-            # print("Answer is right!")
-            return 1
-    else:
-        # print("Answer is wrong!")
+
+    if len(terms) == 0:
         return 0
 
+    if on_set is None:
+        on_set = _terms_to_bitmask(terms)
+    if dc_set is None:
+        dc_set = _terms_to_bitmask(dont_cares)
+    allowed = on_set | dc_set
+
+    cubes = set()
+    covered = 0
+    for literals in input_answer:
+        cube = _literal_set_to_cube(num_var, literals, form_answer)
+        if cube is None:
+            return 0
+        if cube in cubes: # Repeated term
+            continue
+        cube_terms = _cube_bitmask(cube)
+        if cube_terms & ~allowed: # Covers a term outside of the terms and don't cares
+            return 0
+
+        # Prime implicant check: removing any literal must cover a term outside of the terms and don't cares
+        value, mask = cube
+        for bit in _bits(((1 << num_var) - 1) & ~mask):
+            if not _cube_bitmask((value & ~bit, mask | bit)) & ~allowed:
+                return 0
+
+        cubes.add(cube)
+        covered |= cube_terms
+
+    if on_set & ~covered: # Some term is not covered
+        return 0
+
+    if minimum_terms is None:
+        prime_implicants = _prime_implicant_cubes(num_var=num_var, terms=terms, dont_cares=dont_cares, form_terms=form_answer)
+        minimum_terms = _minimum_cover_size(_cover_chart(terms, prime_implicants))
+
+    if not minimum_exact:
+        return 1 if len(cubes) <= minimum_terms else 0
+    return 1 if len(cubes) == minimum_terms else 0
+
 
 
 def stringifyExpression(expression: list[set[str]], form_answer: str = "min") -> str:
@@ -859,7 +1534,7 @@ def stringifyExpression(expression: list[set[str]], form_answer: str = "min") ->
     :type form_terms: str, optional
 
     :rtype: str
-    :returns:  String equivalent of the given minimal expression.
+    :returns:  String equivalent of the given minimal expression, which `_parse_answer()` reads back into the same terms.
     """
     stringified_expression = ""
     if form_answer == "min":
@@ -891,11 +1566,18 @@ def minimizeAndCheck(
         terms: list[int], 
         dont_cares: list[int] = [],  
         form_terms: str = "min",
-        input_answer: str = ""
+        input_answer: str = "",
+        limit: int | None = None,
+        budget: SolverBudget | None = None
         ):
     prime_implicants = getPrimeImplicants(num_var=num_var, terms=terms, dont_cares=dont_cares, form_terms=form_terms)
-    final_expressions = minimizePrimeImplicants(num_var=num_var, terms=terms, prime_implicants=prime_implicants, form_terms=form_terms)
-    result = checkAnswer(minimal_expressions=final_expressions, input_answer=input_answer, form_answer=form_terms)
+    if limit is None:
+        final_expressions = minimizePrimeImplicants(num_var=num_var, terms=terms, prime_implicants=prime_implicants, form_terms=form_terms, budget=budget)
+    else:
+        final_expressions = list(iterMinimalExpressions(num_var=num_var, terms=terms, prime_implicants=prime_implicants, form_terms=form_terms, limit=limit, budget=budget))
+    result = checkAnswerCover(num_var=num_var, terms=terms, dont_cares=dont_cares, input_answer=input_answer,
+                              form_answer=form_terms, minimum_terms=len(final_expressions[0]) if final_expressions else None,
+                              minimum_exact=budget is None or budget.exact)
     stringified_expressions = []
     for i in range(len(final_expressions)):
         stringified_expressions.append(stringifyExpression(expression=final_expressions[i], form_answer=form_terms))
@@ -932,7 +1614,7 @@ def answerUserQuestion():
             print(f"Correct answer {i}:", stringified_expression)
     print("Given answer", input_answer)
 
-    result = checkAnswer(minimal_expressions=final_expressions, input_answer=input_answer, form_answer=form_terms)
+    result = checkAnswerCover(num_var=num_var, terms=terms, dont_cares=dont_cares, input_answer=input_answer, form_answer=form_terms)
     if result == 1:
         print("Correct!")
     elif result == 0:
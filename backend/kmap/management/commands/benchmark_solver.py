@@ -0,0 +1,47 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kmap import benchmarks
+
+
+class Command(BaseCommand):
+    help = "Times every stage of the solver with fixed seeds and fails if any stage regressed against a saved baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=50, help='Number of calls per stage and number of variables.')
+        parser.add_argument('--question-samples', type=int, default=5, help='Number of randomizeQuestion calls per difficulty.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--baseline', help='JSON baseline to compare against.')
+        parser.add_argument('--save', help='Write the results as a JSON baseline to this path.')
+        parser.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown or memory growth as a fraction, e.g. 0.25 for 25%%.')
+
+    def handle(self, *args, **options):
+        results = benchmarks.run_solver_suite(
+            samples=options['samples'],
+            question_samples=options['question_samples'],
+            seed=options['seed'],
+        )
+
+        self.stdout.write(f"{'stage':<28} {'calls':>6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9} {'peak (KiB)':>11}")
+        for stage, row in results['stages'].items():
+            self.stdout.write(
+                f"{stage:<28} {row['calls']:>6} {row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} "
+                f"{row['max_ms']:>9.3f} {row['peak_kib']:>11.1f}"
+            )
+
+        if options['save']:
+            with open(options['save'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Saved baseline to {options['save']}")
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+            regressions = benchmarks.find_regressions(results, baseline, threshold=options['threshold'])
+            for row in regressions:
+                self.stdout.write(
+                    f"Regression: {row['stage']} {row['metric']} {row['baseline']:.3f} -> {row['current']:.3f} (+{row['change']:.0%})"
+                )
+            if regressions:
+                raise CommandError(f"{len(regressions)} stage(s) regressed past the {options['threshold']:.0%} threshold.")
@@ -0,0 +1,98 @@
+import multiprocessing, os, random, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from kmap import question_pool
+from kmap.models import Question
+
+
+SYNTHESIS_BLOCK = 256 # Questions per task with --synthesize
+
+
+def _generate(task):
+    # Runs in a worker process. Seeding per task keeps a run reproducible whatever the number of processes.
+    difficulty, allow_dont_cares, seed, answer_limit, count = task
+    if count is None:
+        questions = [question_pool.generateQuestion(difficulty, allow_dont_cares, answer_limit, seed)]
+    else:
+        try:
+            questions = question_pool.synthesizeQuestions(difficulty, count, allow_dont_cares, seed, answer_limit)
+        except question_pool.SynthesisError as e: # Raised again by the pool in the command
+            raise CommandError(f"{e}. The band of difficulty {difficulty} in question_pool.DIFFICULTY_BANDS may be too narrow.")
+    return difficulty, allow_dont_cares, questions
+
+
+class Command(BaseCommand):
+    help = "Generates questions into the question bank with a pool of worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000, help='Number of questions per difficulty and don\'t care setting.')
+        parser.add_argument('--difficulty', type=int, action='append', choices=[1, 2, 3], help='Difficulty to generate, can be repeated. Defaults to all.')
+        parser.add_argument('--no-dont-cares-only', action='store_true', help='Only generate questions without don\'t cares.')
+        parser.add_argument('--processes', type=int, default=os.cpu_count(), help='Number of worker processes.')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Number of questions per bulk insert.')
+        parser.add_argument('--answer-limit', type=int, default=5, help='Minimal expressions stored per question.')
+        parser.add_argument('--seed', type=int, help='Seed of the first question. Random if not given.')
+        parser.add_argument('--synthesize', action='store_true',
+                            help='Sample questions in batches and keep those inside the difficulty bands of question_pool.DIFFICULTY_BANDS. '
+                                 'Faster, but the questions have no question ID.')
+
+    def handle(self, *args, **options):
+        if options['count'] < 1 or options['chunk_size'] < 1 or options['processes'] < 1:
+            raise CommandError("--count, --chunk-size and --processes must be positive.")
+
+        difficulties = sorted(set(options['difficulty'] or [1, 2, 3]))
+        dont_care_settings = [False] if options['no_dont_cares_only'] else [True, False]
+        seed = options['seed'] if options['seed'] is not None else random.SystemRandom().getrandbits(question_pool.SEED_BITS)
+        if options['synthesize']:
+            counts = [min(SYNTHESIS_BLOCK, options['count'] - start) for start in range(0, options['count'], SYNTHESIS_BLOCK)]
+        else:
+            counts = [None] * options['count']
+        tasks = [
+            (difficulty, allow_dont_cares, (seed + i) % 2**question_pool.SEED_BITS, options['answer_limit'], count)
+            for i, (difficulty, allow_dont_cares, count) in enumerate(
+                (difficulty, allow_dont_cares, count)
+                for difficulty in difficulties
+                for allow_dont_cares in dont_care_settings
+                for count in counts
+            )
+        ]
+        total = len(difficulties) * len(dont_care_settings) * options['count']
+
+        # Workers never use the database, but must not inherit open connections
+        connections.close_all()
+
+        started = time.perf_counter()
+        created = 0
+        chunk = []
+        with multiprocessing.Pool(options['processes']) as pool:
+            for difficulty, allow_dont_cares, questions in pool.imap_unordered(_generate, tasks, chunksize=1 if options['synthesize'] else 64):
+                chunk.extend(Question(
+                    question_id=question.question_id,
+                    difficulty=difficulty,
+                    allow_dont_cares=allow_dont_cares,
+                    num_var=question.num_var,
+                    form=question.form,
+                    terms=question.terms,
+                    dont_cares=question.dont_cares,
+                    groupings=question.groupings,
+                    answers=question.answers,
+                    num_prime_implicants=question.num_prime_implicants,
+                    min_terms=question.min_terms,
+                    min_literals=question.min_literals,
+                ) for question in questions)
+                if len(chunk) >= options['chunk_size']:
+                    Question.objects.bulk_create(chunk)
+                    created += len(chunk)
+                    chunk = []
+                    self.stdout.write(f"{created}/{total} questions")
+
+        if chunk:
+            Question.objects.bulk_create(chunk)
+            created += len(chunk)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} questions in {elapsed:.1f} s ({created / elapsed:.0f}/s) with seed {seed}."
+        ))
@@ -0,0 +1,54 @@
+import datetime, multiprocessing, os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from kmap import question_pool
+from kmap.models import DailyChallenge
+
+
+def _generate(task):
+    # Runs in a worker process
+    date, secret, answer_limit = task
+    return date, question_pool.generateDailyQuestion(date, secret, answer_limit)
+
+
+class Command(BaseCommand):
+    help = "Creates and solves the daily challenges of the coming days, so no request has to generate one."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Number of days to create, starting with --start.')
+        parser.add_argument('--start', type=datetime.date.fromisoformat, help='First date (YYYY-MM-DD). Defaults to today (UTC).')
+        parser.add_argument('--processes', type=int, default=os.cpu_count(), help='Number of worker processes.')
+        parser.add_argument('--answer-limit', type=int, default=5, help='Minimal expressions computed per challenge.')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1 or options['processes'] < 1:
+            raise CommandError("--days and --processes must be positive.")
+
+        start = options['start'] or timezone.now().date()
+        dates = [start + datetime.timedelta(days=i) for i in range(options['days'])]
+        existing = set(DailyChallenge.objects.filter(date__in=dates).values_list('date', flat=True))
+        missing = [date for date in dates if date not in existing]
+        if not missing:
+            self.stdout.write(f"All {len(dates)} daily challenges from {start} already exist.")
+            return
+
+        # Workers never use the database, but must not inherit open connections
+        connections.close_all()
+
+        tasks = [(date, settings.SECRET_KEY, options['answer_limit']) for date in missing]
+        with multiprocessing.Pool(min(options['processes'], len(tasks))) as pool:
+            generated = pool.map(_generate, tasks)
+
+        # A challenge created in the meantime (by a request falling back to creating it) is kept
+        DailyChallenge.objects.bulk_create(
+            [DailyChallenge.from_question(date, question) for date, question in generated],
+            ignore_conflicts=True,
+        )
+        created = DailyChallenge.objects.filter(date__in=missing).count()
+        self.stdout.write(self.style.SUCCESS(
+            f"{created} of {len(missing)} missing daily challenges from {missing[0]} to {missing[-1]} now exist."
+        ))
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:32
+
+import kmap.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kmap', '0005_timeattackresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Question',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('difficulty', models.IntegerField(choices=[(1, 'Easy'), (2, 'Medium'), (3, 'Hard')])),
+                ('allow_dont_cares', models.BooleanField(default=True)),
+                ('num_var', models.IntegerField()),
+                ('form', models.CharField(max_length=5)),
+                ('terms', models.JSONField()),
+                ('dont_cares', models.JSONField()),
+                ('groupings', models.JSONField()),
+                ('answers', models.JSONField()),
+                ('num_prime_implicants', models.IntegerField()),
+                ('min_terms', models.IntegerField()),
+                ('min_literals', models.IntegerField()),
+                ('sample_key', models.IntegerField(default=kmap.models.random_sample_key)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('allow_dont_cares', True)), fields=['difficulty', 'sample_key'], name='question_sample_dc_idx'), models.Index(condition=models.Q(('allow_dont_cares', False)), fields=['difficulty', 'sample_key'], name='question_sample_no_dc_idx')],
+            },
+        ),
+    ]
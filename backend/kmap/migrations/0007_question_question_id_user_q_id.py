@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kmap', '0006_question'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='question_id',
+            field=models.CharField(blank=True, max_length=8, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='q_id',
+            field=models.CharField(blank=True, max_length=8, null=True),
+        ),
+    ]
@@ -0,0 +1,135 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:40
+
+import itertools
+
+from django.db import migrations, models
+
+
+# The solver as it was when this migration was written, so that the backfill does not change with kmap_solver
+
+ANSWER_LIMIT = 5 # views.MAX_ANSWERS when this migration was written
+
+# Letter of the variable at every digit of a term (most significant first), see kmap_solver._apply_term_letter_mapping()
+LETTERS = {2: "BA", 3: "CAB", 4: "CDAB", 5: "ADEBC", 6: "BAEFCD", 7: "CABFGDE", 8: "CDABGHEF"}
+
+
+def _prime_implicants(num_var, terms, dont_cares):
+    """
+    Quine-McCluskey prime implicants as `(value, mask)` cubes, bits set in `mask` being the merged digits.
+    """
+    cubes = {(term, 0) for term in terms + dont_cares}
+    prime_implicants = []
+    while cubes:
+        merged = set()
+        larger = set()
+        for value, mask in cubes:
+            for bit in range(num_var):
+                b = 1 << bit
+                if not mask & b and (value ^ b, mask) in cubes:
+                    merged.add((value, mask))
+                    larger.add((value & ~b, mask | b))
+        prime_implicants.extend(sorted(cubes - merged))
+        cubes = larger
+    return prime_implicants
+
+
+def _minimum_covers(terms, cubes, limit):
+    """
+    Up to `limit` covers of `terms` with the fewest cubes, as lists of cube indices. Every minimum cover has the
+    essential cubes, so only the terms they leave uncovered are searched.
+    """
+    def covers(idx, term):
+        return term & ~cubes[idx][1] == cubes[idx][0]
+
+    columns = {term: [idx for idx in range(len(cubes)) if covers(idx, term)] for term in terms}
+    essential = sorted({idxs[0] for idxs in columns.values() if len(idxs) == 1})
+    left = [term for term in terms if not any(covers(idx, term) for idx in essential)]
+    candidates = sorted({idx for term in left for idx in columns[term]})
+
+    for size in range(len(candidates) + 1):
+        found = []
+        for extra in itertools.combinations(candidates, size):
+            if all(any(covers(idx, term) for idx in extra) for term in left):
+                found.append(sorted(essential + list(extra)))
+                if len(found) == limit:
+                    return found
+        if found:
+            return found
+    return []
+
+
+def _cube_to_string(num_var, cube):
+    value, mask = cube
+    return "".join("-" if mask >> (num_var - 1 - i) & 1 else digit for i, digit in enumerate(format(value, f"0{num_var}b")))
+
+
+def _stringify(num_var, cubes, form):
+    """
+    Minimal expression of a cover, written as kmap_solver.stringifyExpression() does.
+    """
+    expression = []
+    for cube in cubes:
+        literals = []
+        for letter, digit in zip(LETTERS[num_var], _cube_to_string(num_var, cube)):
+            if digit != "-":
+                literals.append(letter if (digit == "1") == (form == "min") else letter + "'")
+        expression.append(sorted(literals))
+    expression.sort(key=len)
+    if form == "min":
+        return " + ".join("".join(literals) for literals in expression)
+    return " ".join("(" + "+".join(literals) + ")" for literals in expression)
+
+
+def _mask(terms):
+    return format(sum(1 << term for term in set(terms)), 'x')
+
+
+def backfill_solutions(apps, schema_editor):
+    DailyChallenge = apps.get_model('kmap', 'DailyChallenge')
+    challenges = list(DailyChallenge.objects.filter(min_terms__isnull=True))
+    for challenge in challenges:
+        num_var, form, terms, dont_cares = challenge.num_var, challenge.form, challenge.terms, challenge.dont_cares
+        cubes = _prime_implicants(num_var, terms, dont_cares)
+        covers = _minimum_covers(terms, cubes, ANSWER_LIMIT) if terms else []
+        challenge.answers = [_stringify(num_var, [cubes[idx] for idx in cover], form) for cover in covers]
+        challenge.prime_implicants = [_cube_to_string(num_var, cube) for cube in cubes]
+        challenge.min_terms = len(covers[0]) if covers else 0
+        challenge.on_mask = _mask(terms)
+        challenge.dc_mask = _mask(dont_cares)
+    DailyChallenge.objects.bulk_update(challenges, ['answers', 'prime_implicants', 'min_terms', 'on_mask', 'dc_mask'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kmap', '0007_question_question_id_user_q_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailychallenge',
+            name='answers',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='dailychallenge',
+            name='dc_mask',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='dailychallenge',
+            name='min_terms',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dailychallenge',
+            name='on_mask',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='dailychallenge',
+            name='prime_implicants',
+            field=models.JSONField(default=list),
+        ),
+        migrations.RunPython(backfill_solutions, migrations.RunPython.noop),
+    ]
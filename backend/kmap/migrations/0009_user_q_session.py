@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kmap', '0008_dailychallenge_solution'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='q_session',
+            field=models.CharField(blank=True, max_length=32, null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 21:05
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+SESSION_TABLE = 'kmap_question_sessions' # settings.CACHES['question_sessions']['LOCATION'] when this migration was written
+
+
+def create_session_table(apps, schema_editor):
+    # Does nothing if the table exists
+    call_command('createcachetable', SESSION_TABLE, database=schema_editor.connection.alias, verbosity=0)
+
+
+def drop_session_table(apps, schema_editor):
+    schema_editor.execute(f'DROP TABLE IF EXISTS {schema_editor.quote_name(SESSION_TABLE)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kmap', '0009_user_q_session'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_session_table, drop_session_table),
+    ]
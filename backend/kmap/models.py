@@ -1,6 +1,10 @@
+import random
+
 from django.db import models
 from django.utils import timezone
 
+from . import kmap_solver
+
 class User(models.Model):
     username = models.CharField(max_length=50)
     score = models.IntegerField()
@@ -11,11 +15,21 @@ class User(models.Model):
     q_terms = models.JSONField()
     q_dont_cares = models.JSONField()
     q_groupings = models.JSONField()
+    q_id = models.CharField(max_length=8, null=True, blank=True) # See question_pool.encodeQuestionId()
+    q_session = models.CharField(max_length=32, null=True, blank=True) # See question_sessions.start_session()
     
     time_started = models.DateTimeField(null=True, blank=True)
     time_completed = models.DateTimeField(null=True, blank=True)
 
 
+def daily_masks(terms, dont_cares):
+    """`on_mask` and `dc_mask` of a DailyChallenge: bit `t` is set for every term `t`, written in hex"""
+    return {
+        'on_mask': format(kmap_solver._terms_to_bitmask(terms), 'x'),
+        'dc_mask': format(kmap_solver._terms_to_bitmask(dont_cares), 'x'),
+    }
+
+
 class DailyChallenge(models.Model):
     date = models.DateField(unique=True)
     num_var = models.IntegerField()
@@ -25,12 +39,35 @@ class DailyChallenge(models.Model):
     groupings = models.JSONField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Solution computed once at creation, so answers are checked without solving the challenge again
+    answers = models.JSONField(default=list) # Minimal expressions, as given after an answer is checked
+    prime_implicants = models.JSONField(default=list)
+    min_terms = models.IntegerField(null=True, blank=True) # Terms in a minimal expression, None if not computed
+    on_mask = models.CharField(max_length=64, blank=True, default='') # Truth tables of the terms and don't cares in hex, see daily_masks()
+    dc_mask = models.CharField(max_length=64, blank=True, default='')
+
     class Meta:
         ordering = ['-date']
 
     def __str__(self):
         return f"Daily Challenge - {self.date}"
 
+    @classmethod
+    def from_question(cls, date, question):
+        """Unsaved challenge of a date from a question_pool.PooledQuestion"""
+        return cls(
+            date=date,
+            num_var=question.num_var,
+            form=question.form,
+            terms=question.terms,
+            dont_cares=question.dont_cares,
+            groupings=question.groupings,
+            answers=question.answers,
+            prime_implicants=question.prime_implicants,
+            min_terms=question.min_terms,
+            **daily_masks(question.terms, question.dont_cares),
+        )
+
 
 class DailyChallengeResult(models.Model):
     username = models.CharField(max_length=50)
@@ -65,3 +102,55 @@ class TimeAttackResult(models.Model):
 
     def __str__(self):
         return f"{self.username} - {self.get_difficulty_display()} - {self.questions_solved} solved"
+
+
+def random_sample_key():
+    return random.randrange(2**31)
+
+
+class QuestionQuerySet(models.QuerySet):
+    def sample(self, difficulty, allow_dont_cares=True):
+        """
+        Random question of a difficulty and don't care setting, or None if there is none.
+        Seeks the first sample key past a random key on the index instead of ordering the whole table randomly.
+        """
+        questions = self.filter(difficulty=difficulty, allow_dont_cares=allow_dont_cares).order_by('sample_key')
+        return questions.filter(sample_key__gte=random_sample_key()).first() or questions.first()
+
+
+class Question(models.Model):
+    DIFFICULTY_CHOICES = [
+        (1, 'Easy'),
+        (2, 'Medium'),
+        (3, 'Hard'),
+    ]
+
+    question_id = models.CharField(max_length=8, null=True, blank=True) # See question_pool.encodeQuestionId()
+    difficulty = models.IntegerField(choices=DIFFICULTY_CHOICES)
+    allow_dont_cares = models.BooleanField(default=True)
+    num_var = models.IntegerField()
+    form = models.CharField(max_length=5)
+    terms = models.JSONField()
+    dont_cares = models.JSONField()
+    groupings = models.JSONField()
+    answers = models.JSONField() # Minimal expressions, as given after an answer is checked
+
+    # Difficulty metrics
+    num_prime_implicants = models.IntegerField()
+    min_terms = models.IntegerField()
+    min_literals = models.IntegerField()
+
+    sample_key = models.IntegerField(default=random_sample_key)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = QuestionQuerySet.as_manager()
+
+    class Meta:
+        # One index per don't care setting, as boolean filters are not matched against a column of a composite index
+        indexes = [
+            models.Index(fields=['difficulty', 'sample_key'], condition=models.Q(allow_dont_cares=True), name='question_sample_dc_idx'),
+            models.Index(fields=['difficulty', 'sample_key'], condition=models.Q(allow_dont_cares=False), name='question_sample_no_dc_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_difficulty_display()} - {self.num_var} variables - {self.terms}"
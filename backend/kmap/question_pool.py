@@ -0,0 +1,441 @@
+# Pool of ready questions, so that views do not generate a question before responding.
+# Questions are kept per (difficulty, allow_dont_cares) bucket and refilled by a background thread.
+
+import collections, datetime, functools, hashlib, random, threading, time
+from typing import NamedTuple
+
+import numpy as np
+import numpy.random as npr
+
+from . import kmap_solver
+
+
+_ID_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+SEED_BITS = 32
+
+
+def encodeQuestionId(difficulty: int, allow_dont_cares: bool, seed: int) -> str:
+    """
+    Short ID of the question `randomizeQuestion()` gives for a difficulty, don't care setting and seed.
+    The three are packed into one integer, written in base 36.
+
+    :rtype: str
+    """
+    if difficulty not in (1, 2, 3) or not 0 <= seed < 2**SEED_BITS:
+        raise ValueError(f"No question ID for difficulty {difficulty} and seed {seed}")
+
+    packed = (seed << 3) | (int(bool(allow_dont_cares)) << 2) | difficulty
+    digits = []
+    while True:
+        packed, digit = divmod(packed, 36)
+        digits.append(_ID_DIGITS[digit])
+        if packed == 0:
+            return "".join(reversed(digits))
+
+
+def decodeQuestionId(question_id: str) -> tuple[int, bool, int]:
+    """
+    Reverse of `encodeQuestionId()`. Raises `ValueError` for anything that is not a question ID.
+
+    :rtype: tuple[ difficulty, allow_dont_cares, seed ]
+    """
+    if not isinstance(question_id, str) or not 0 < len(question_id) <= 8 or any(c not in _ID_DIGITS for c in question_id):
+        raise ValueError(f"Invalid question ID {question_id!r}")
+
+    packed = int(question_id, 36)
+    difficulty, allow_dont_cares, seed = packed & 3, bool(packed & 4), packed >> 3
+    if encodeQuestionId(difficulty, allow_dont_cares, seed) != question_id: # Wrong difficulty, or not written the same way
+        raise ValueError(f"Invalid question ID {question_id!r}")
+    return difficulty, allow_dont_cares, seed
+
+
+class PooledQuestion(NamedTuple):
+    question_id: str | None
+    num_var: int
+    form: str
+    terms: list[int]
+    dont_cares: list[int]
+    groupings: list
+    answers: list[str]
+    num_prime_implicants: int
+    min_terms: int # Terms in a minimal expression
+    min_literals: int # Literals in the first minimal expression
+    prime_implicants: list[str]
+
+
+def generateQuestion(difficulty: int, allow_dont_cares: bool = True, answer_limit: int | None = None, seed: int | None = None) -> PooledQuestion:
+    """
+    Generates a question with `kmap_solver.randomizeQuestion()` along with its minimal expressions
+    and the metrics of how hard it is to solve.
+
+    :param difficulty: Difficulty of question to be generated, see `randomizeQuestion()`.
+    :type difficulty: int
+    :param allow_dont_cares: Generates no don't cares if False.
+    :type allow_dont_cares: bool
+    :param answer_limit: Maximum number of minimal expressions kept with the question. Keeps all if None.
+    :type answer_limit: int | None
+    :param seed: Seed of the question, drawn from `random` if None. See `encodeQuestionId()`.
+    :type seed: int | None
+
+    :rtype: PooledQuestion
+    """
+    if seed is None:
+        seed = random.getrandbits(SEED_BITS)
+    question_id = encodeQuestionId(difficulty, allow_dont_cares, seed)
+
+    num_dc_override = None if allow_dont_cares else 0
+    num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=difficulty, num_dc_override=num_dc_override, seed=seed)
+    return _solveQuestion(question_id, int(num_var), str(form), terms, dont_cares, groupings, answer_limit)
+
+
+def solveQuestion(num_var: int, form: str, terms: list[int], dont_cares: list[int], answer_limit: int | None = None,
+                  with_groupings: bool = False, budget: kmap_solver.SolverBudget | None = None) -> dict:
+    """
+    Minimal expressions, prime implicants and difficulty metrics of a question, so that it can be stored
+    with the question and answers can be checked without solving it again.
+
+    :rtype: dict
+    :returns: `answers` (stringified minimal expressions, up to `answer_limit`), `prime_implicants` (strings
+    from `getPrimeImplicants()`), `min_terms` and `min_literals` (terms and literals of the first minimal expression).
+    With `with_groupings`, also the `groupings` of the first minimal expression (see `kmap_solver.expressionGroupings()`).
+    `exact` is False if the search ran out of `budget` and the only answer is a greedy cover (see `kmap_solver.SolverBudget`).
+    """
+    prime_implicants = kmap_solver.getPrimeImplicants(num_var=num_var, terms=terms, dont_cares=dont_cares, form_terms=form)
+    expressions = list(kmap_solver.iterMinimalExpressions(num_var=num_var, terms=terms, prime_implicants=prime_implicants, form_terms=form, limit=answer_limit, budget=budget))
+
+    solution = {
+        'answers': [kmap_solver.stringifyExpression(expression=expression, form_answer=form) for expression in expressions],
+        'prime_implicants': prime_implicants,
+        'min_terms': len(expressions[0]) if expressions else 0,
+        'min_literals': sum(len(literals) for literals in expressions[0]) if expressions else 0,
+        'exact': budget is None or budget.exact,
+    }
+    if with_groupings:
+        solution['groupings'] = kmap_solver.expressionGroupings(num_var, expressions[0], form) if expressions else []
+    return solution
+
+
+def _solveQuestion(question_id, num_var, form, terms, dont_cares, groupings, answer_limit):
+    """
+    Adds the minimal expressions and difficulty metrics to a question.
+    """
+    solution = solveQuestion(num_var, form, terms, dont_cares, answer_limit)
+    return PooledQuestion(question_id, num_var, form, terms, dont_cares, groupings, solution['answers'],
+                          len(solution['prime_implicants']), solution['min_terms'], solution['min_literals'],
+                          solution['prime_implicants'])
+
+
+def dailySeed(date: datetime.date, secret: str) -> int:
+    """
+    Seed of the daily challenge of a date. It is the same in every process, so whoever generates the
+    challenge of a date generates the same question, and it can not be guessed without `secret`.
+
+    :rtype: int
+    """
+    digest = hashlib.sha256(f"{secret}:daily:{date.isoformat()}".encode()).digest()
+    return int.from_bytes(digest[:4], "big") % 2**SEED_BITS
+
+
+def generateDailyQuestion(date: datetime.date, secret: str, answer_limit: int | None = None) -> PooledQuestion:
+    """
+    Generates the daily challenge of a date, a hard question with don't cares seeded with `dailySeed()`.
+
+    :rtype: PooledQuestion
+    """
+    return generateQuestion(3, True, answer_limit, dailySeed(date, secret))
+
+
+# Target band of every difficulty for `synthesizeQuestions()`, with the variables, form and don't cares of `randomizeQuestion()`.
+# Metric bands are inclusive (min, max). Easy and medium questions have a single minimal expression of essential
+# prime implicants only, as `randomizeQuestion()` gives. Hard questions may have a small cyclic core.
+DIFFICULTY_BANDS = {
+    1: {'num_var': ([2, 3], [0.5, 0.5]), 'form': [0.7, 0.3], 'max_dont_cares': 0,
+        'prime_implicants': (1, 3), 'min_terms': (1, 3), 'cyclic_core': (0, 0), 'solutions': (1, 1)},
+    2: {'num_var': ([3, 4], [0.3, 0.7]), 'form': [0.5, 0.5], 'max_dont_cares': 6,
+        'prime_implicants': (2, 8), 'min_terms': (2, 6), 'cyclic_core': (0, 0), 'solutions': (1, 1)},
+    3: {'num_var': ([5, 6], [0.5, 0.5]), 'form': [0.6, 0.4], 'max_dont_cares': 10,
+        'prime_implicants': (4, 20), 'min_terms': (4, 12), 'cyclic_core': (0, 8), 'solutions': (1, 2)},
+}
+
+
+class SynthesisError(RuntimeError):
+    """
+    Raised by `synthesizeQuestions()` when it runs out of batches before finding enough questions in the band.
+    """
+
+
+def _in_band(value, band):
+    return band[0] <= value <= band[1]
+
+
+def _sampleCandidates(num_var: int, band: dict, allow_dont_cares: bool, size: int, rng: npr.RandomState) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Samples `size` candidate functions as the union of a few random cubes of the K-Map (the groups of
+    the answer), with random don't cares on top.
+
+    :rtype: tuple[ np.ndarray, np.ndarray ]
+    :returns: Boolean term and don't care arrays of shape `(size, 2**num_var)`.
+    """
+    _, _, coverage, _ = kmap_solver._cube_table(num_var)
+    num_cubes = coverage.shape[0] - 1 # Leaves out the last cube, the whole K-Map
+    low, high = band['min_terms']
+
+    picks = rng.randint(0, num_cubes, size=(size, high))
+    used = np.arange(high)[None, :] < rng.randint(low, high + 1, size=(size, 1))
+    on_sets = (coverage[picks] & used[:, :, None]).any(axis=1)
+
+    num_terms = 2**num_var
+    max_dont_cares = band['max_dont_cares'] if allow_dont_cares else 0
+    ranks = rng.random_sample((size, num_terms)).argsort(axis=1).argsort(axis=1) # Random order of the terms
+    dc_sets = ranks < rng.randint(0, max_dont_cares + 1, size=(size, 1))
+    on_sets &= ~dc_sets
+    return on_sets, dc_sets
+
+
+def synthesizeQuestions(difficulty: int, count: int, allow_dont_cares: bool = True, seed: int | None = None,
+                        answer_limit: int | None = None, batch_size: int = 512, max_batches: int = 1000) -> list[PooledQuestion]:
+    """
+    Generates questions whose difficulty is measured, instead of following the group picking of `randomizeQuestion()`.
+
+    Candidates are sampled a batch at a time as arrays, and their prime implicant and essential prime implicant
+    counts are computed in bulk with `kmap_solver.getQuestionMetricsBatch()`. Only the candidates that can still
+    be in the band of `DIFFICULTY_BANDS` go through the search for the cyclic core and minimal expressions.
+
+    Questions have no question ID, as they do not come from `randomizeQuestion()`. Their groupings are the
+    groups of their first minimal expression.
+
+    Raises `SynthesisError` if `max_batches` batches of one number of variables do not give enough questions,
+    which only happens with a band that (almost) no function is in.
+
+    :param difficulty: 1 = easy, 2 = medium, 3 = hard.
+    :type difficulty: int
+    :param count: Number of questions.
+    :type count: int
+    :param allow_dont_cares: Generates no don't cares if False.
+    :type allow_dont_cares: bool
+    :param seed: Seed of the whole run. Uses the global state of `numpy.random` if None.
+    :type seed: int | None
+    :param answer_limit: Maximum number of minimal expressions kept with every question. Keeps all if None.
+    :type answer_limit: int | None
+    :param batch_size: Number of candidates sampled at a time.
+    :type batch_size: int
+    :param max_batches: Maximum number of batches sampled per number of variables.
+    :type max_batches: int
+
+    :rtype: list[ PooledQuestion ]
+    """
+    band = DIFFICULTY_BANDS[difficulty]
+    rng = npr if seed is None else npr.RandomState(seed % 2**32)
+    num_vars = [int(num_var) for num_var in rng.choice(band['num_var'][0], size=count, p=band['num_var'][1])]
+
+    # Questions are found for every number of variables separately, then given in the order of `num_vars`
+    found = {}
+    for num_var in sorted(set(num_vars)):
+        found[num_var] = _synthesizeFunctions(num_var, band, num_vars.count(num_var), allow_dont_cares, rng, answer_limit, batch_size, max_batches)
+    return [found[num_var].pop() for num_var in num_vars]
+
+
+def _synthesizeFunctions(num_var, band, count, allow_dont_cares, rng, answer_limit, batch_size, max_batches):
+    questions = []
+    for _ in range(max_batches):
+        on_sets, dc_sets = _sampleCandidates(num_var, band, allow_dont_cares, batch_size, rng)
+        forms = rng.choice(["min", "max"], size=batch_size, p=band['form'])
+
+        # Bulk filter, on bounds that every question in the band meets: the minimal expression has every
+        # essential prime implicant, and at most one more term per term left uncovered by them
+        metrics = kmap_solver.getQuestionMetricsBatch(num_var, on_sets, dc_sets)
+        low, high = band['min_terms']
+        keep = (
+            on_sets.any(axis=1) & ~(on_sets | dc_sets).all(axis=1)
+            & (metrics['prime_implicants'] >= band['prime_implicants'][0])
+            & (metrics['prime_implicants'] <= band['prime_implicants'][1])
+            & (metrics['essential'] <= high)
+            & (metrics['essential'] + metrics['uncovered'] >= low)
+            & (metrics['uncovered'] >= band['cyclic_core'][0])
+        )
+
+        for i in np.flatnonzero(keep):
+            terms = np.flatnonzero(on_sets[i]).tolist()
+            dont_cares = np.flatnonzero(dc_sets[i]).tolist()
+            form = str(forms[i])
+            cubes = kmap_solver._prime_implicant_cubes(num_var, terms, dont_cares, form)
+            cyclic_core, min_terms, solutions, cover = kmap_solver._cover_metrics(terms, cubes, band['solutions'][1])
+            if not (_in_band(cyclic_core, band['cyclic_core']) and _in_band(min_terms, band['min_terms']) and _in_band(solutions, band['solutions'])):
+                continue
+
+            groups = [[term for term in terms + dont_cares if term & ~cubes[idx][1] == cubes[idx][0]] for idx in cover]
+            groupings = kmap_solver._groups_to_groupings(num_var, groups)
+            questions.append(_solveQuestion(None, num_var, form, terms, dont_cares, groupings, answer_limit))
+            if len(questions) == count:
+                return questions
+
+    raise SynthesisError(f"Found {len(questions)} of {count} {num_var} variable questions in {max_batches} batches of {batch_size} candidates")
+
+
+@functools.lru_cache(maxsize=4096)
+def questionFromId(question_id: str, answer_limit: int | None = None) -> PooledQuestion:
+    """
+    Regenerates the question of a question ID, cached by ID. Raises `ValueError` for an invalid ID.
+    IDs only give the same question with the same version of `randomizeQuestion()`.
+
+    :rtype: PooledQuestion
+    """
+    difficulty, allow_dont_cares, seed = decodeQuestionId(question_id)
+    return generateQuestion(difficulty, allow_dont_cares, answer_limit, seed)
+
+
+def functionFromId(question_id: str) -> tuple[int, str, list[int], list[int]]:
+    """
+    Regenerates the function of a question ID without solving it, so that the caller can solve it with a budget.
+    Raises `ValueError` for an invalid ID.
+
+    :rtype: tuple[ num_var, form, terms, dont_cares ]
+    """
+    difficulty, allow_dont_cares, seed = decodeQuestionId(question_id)
+    num_dc_override = None if allow_dont_cares else 0
+    num_var, form, terms, dont_cares, _ = kmap_solver.randomizeQuestion(difficulty=difficulty, num_dc_override=num_dc_override, seed=seed)
+    return int(num_var), str(form), terms, dont_cares
+
+
+class QuestionPool:
+    """
+    Keeps up to `size` generated questions for every (difficulty, allow_dont_cares) bucket.
+
+    `popQuestion()` takes a question from its bucket, and wakes the refill thread once the bucket has
+    `low_water` questions or fewer. An empty bucket (starvation) falls back to generating the question
+    right away. The refill thread is started on first use, so importing the pool has no side effects.
+
+    Every worker process has its own pool.
+    """
+
+    def __init__(self, size: int = 20, low_water: int = 5, difficulties=(1, 2, 3), answer_limit: int | None = None):
+        self.size = size
+        self.low_water = min(low_water, size)
+        self.difficulties = tuple(difficulties)
+        self.answer_limit = answer_limit
+
+        self._buckets = {(difficulty, allow_dont_cares): collections.deque()
+                         for difficulty in self.difficulties for allow_dont_cares in (True, False)}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+        self._hits = 0
+        self._misses = 0
+        self._starved = collections.Counter()
+        self._refills = 0
+        self._refill_seconds = collections.deque(maxlen=1000) # Latest refills only, for the percentiles
+
+    def _start(self):
+        with self._lock: # Callers race to start the thread on first use
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._refill_loop, name="question-pool-refill", daemon=True)
+                self._thread.start()
+
+    def _low_buckets(self):
+        with self._lock:
+            return [key for key, bucket in self._buckets.items() if len(bucket) <= self.low_water]
+
+    def _refill(self, key):
+        """
+        Tops up a bucket to `size` questions. Questions are generated outside the lock.
+        """
+        difficulty, allow_dont_cares = key
+        started = time.perf_counter()
+        while True:
+            with self._lock:
+                if len(self._buckets[key]) >= self.size:
+                    break
+            question = generateQuestion(difficulty, allow_dont_cares, self.answer_limit)
+            with self._lock:
+                self._buckets[key].append(question)
+
+        with self._lock:
+            self._refills += 1
+            self._refill_seconds.append(time.perf_counter() - started)
+
+    def _refill_loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            for key in self._low_buckets():
+                try:
+                    self._refill(key)
+                except Exception:
+                    import traceback
+                    traceback.print_exc() # Keep the thread alive, the bucket is retried on the next wake up
+
+    def warm(self):
+        """
+        Starts the refill thread and fills every bucket in the background.
+        """
+        self._start()
+        self._wake.set()
+
+    def takeQuestion(self, difficulty: int, allow_dont_cares: bool = True) -> PooledQuestion | None:
+        """
+        Takes a question from the pool without generating one, so that the caller can generate it elsewhere.
+        Returns None if its bucket is empty, or for difficulties without a bucket, which are not counted in the metrics.
+
+        :rtype: PooledQuestion | None
+        """
+        key = (difficulty, bool(allow_dont_cares))
+        if key not in self._buckets:
+            return None
+
+        with self._lock:
+            bucket = self._buckets[key]
+            question = bucket.popleft() if bucket else None
+            if question is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+                self._starved[key] += 1
+            low = len(bucket) <= self.low_water
+
+        if low:
+            self._start()
+            self._wake.set()
+        return question
+
+    def popQuestion(self, difficulty: int, allow_dont_cares: bool = True) -> PooledQuestion:
+        """
+        Takes a question from the pool, or generates one if its bucket is empty.
+        Difficulties without a bucket are always generated right away and are not counted in the metrics.
+
+        :rtype: PooledQuestion
+        """
+        question = self.takeQuestion(difficulty, allow_dont_cares)
+        if question is None:
+            question = generateQuestion(difficulty, allow_dont_cares, self.answer_limit)
+        return question
+
+    def stats(self) -> dict:
+        """
+        Pool metrics: hit rate, refill latency (in ms) and starvation counts per bucket.
+        """
+        with self._lock:
+            requests = self._hits + self._misses
+            refill_ms = sorted(seconds * 1000 for seconds in self._refill_seconds)
+            buckets = {
+                f"{difficulty}/{'dc' if allow_dont_cares else 'no-dc'}": {
+                    'size': len(bucket),
+                    'starved': self._starved[(difficulty, allow_dont_cares)],
+                }
+                for (difficulty, allow_dont_cares), bucket in self._buckets.items()
+            }
+
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / requests if requests else None,
+                'refills': self._refills,
+                'refill_ms': {
+                    'p50': refill_ms[len(refill_ms) // 2] if refill_ms else None,
+                    'p95': refill_ms[min(len(refill_ms) - 1, int(len(refill_ms) * 0.95))] if refill_ms else None,
+                    'max': refill_ms[-1] if refill_ms else None,
+                },
+                'buckets': buckets,
+                'size': self.size,
+                'low_water': self.low_water,
+            }
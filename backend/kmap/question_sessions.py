@@ -0,0 +1,83 @@
+import secrets
+
+from django.core.cache import caches
+
+from . import kmap_solver
+
+
+SESSION_CACHE = 'question_sessions' # Alias in settings.CACHES
+SESSION_ID_BYTES = 16
+
+
+def _cache():
+    return caches[SESSION_CACHE]
+
+
+def make_session(num_var, form, terms, dont_cares, answers, min_terms, on_set=None, dc_set=None, exact=True):
+    """
+    A question with its solution, as stored by `start_session()`. `answers` are the stringified minimal expressions
+    shown after an answer is checked, and `min_terms` the number of terms in a minimal expression. `on_set` and
+    `dc_set` are the bitmasks of the terms and don't cares, found from them if not given. `exact` is False if
+    `min_terms` is from a greedy cover, which answers with as many terms or fewer pass.
+    """
+    return {
+        'num_var': num_var,
+        'form': form,
+        'terms': list(terms),
+        'dont_cares': list(dont_cares),
+        'on_set': kmap_solver._terms_to_bitmask(terms) if on_set is None else on_set,
+        'dc_set': kmap_solver._terms_to_bitmask(dont_cares) if dc_set is None else dc_set,
+        'answers': list(answers),
+        'min_terms': min_terms,
+        'exact': exact,
+    }
+
+
+def start_session(num_var, form, terms, dont_cares, answers, min_terms):
+    """
+    Store a question served to a client with its solution (see `make_session()`), and return the session ID
+    the client answers it with. The ID is random, so it tells nothing about the question.
+    """
+    session_id = secrets.token_urlsafe(SESSION_ID_BYTES)
+    _cache().set(session_id, make_session(num_var, form, terms, dont_cares, answers, min_terms))
+    return session_id
+
+
+def _valid_session_id(session_id):
+    return isinstance(session_id, str) and 0 < len(session_id) <= 64
+
+
+def get_session(session_id):
+    """Get a question session, or None if the ID is invalid or the session expired"""
+    if not _valid_session_id(session_id):
+        return None
+    return _cache().get(session_id)
+
+
+def check_session_answer(session, answer):
+    """Check an answer against the solution stored in a question session. Returns the same as minimizeAndCheck"""
+    result = kmap_solver.checkAnswerCover(
+        num_var=session['num_var'],
+        terms=session['terms'],
+        dont_cares=session['dont_cares'],
+        input_answer=answer,
+        form_answer=session['form'],
+        minimum_terms=session['min_terms'],
+        on_set=session['on_set'],
+        dc_set=session['dc_set'],
+        minimum_exact=session.get('exact', True))
+    return result, session['answers']
+
+
+async def astart_session(num_var, form, terms, dont_cares, answers, min_terms):
+    """`start_session()` for async views"""
+    session_id = secrets.token_urlsafe(SESSION_ID_BYTES)
+    await _cache().aset(session_id, make_session(num_var, form, terms, dont_cares, answers, min_terms))
+    return session_id
+
+
+async def aget_session(session_id):
+    """`get_session()` for async views"""
+    if not _valid_session_id(session_id):
+        return None
+    return await _cache().aget(session_id)
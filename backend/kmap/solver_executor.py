@@ -0,0 +1,128 @@
+import asyncio, multiprocessing, threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+
+
+class SolverBusy(Exception):
+    """Every worker is busy and the queue is full."""
+
+
+class SolverTimeout(Exception):
+    """A task did not finish in time."""
+
+
+class SolverExecutor:
+    """
+    Bounded pool of worker processes for solver work, so that slow solves run outside of the server's
+    threads and event loop. Workers are spawned rather than forked on first use, so they do not inherit
+    the threads and database connections of the server.
+
+    At most `max_workers` tasks run at once and `queue_depth` more wait for a worker. Past that,
+    `submit()` raises `SolverBusy` instead of queueing. A task that times out keeps its worker
+    until it finishes (a running process can not be stopped), so it still counts against the bound.
+
+    :param max_workers: Number of worker processes.
+    :type max_workers: int
+    :param queue_depth: Number of tasks that can wait for a worker.
+    :type queue_depth: int
+    :param timeout: Seconds `run()` waits for a task by default.
+    :type timeout: float
+    """
+
+    def __init__(self, max_workers: int, queue_depth: int, timeout: float):
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+
+        self._pool = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def submit(self, fn, *args) -> Future:
+        """
+        Runs `fn(*args)` in a worker process. `fn` and its arguments must be picklable.
+
+        :raises SolverBusy: If `max_workers + queue_depth` tasks are already pending.
+        """
+        pool = self._get_pool()
+        with self._lock:
+            if self._pending >= self.max_workers + self.queue_depth:
+                self._rejected += 1
+                raise SolverBusy()
+            self._pending += 1
+        try:
+            future = pool.submit(fn, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled(): # Timed out before it started, see result()
+                self._cancelled += 1
+            else:
+                self._completed += 1
+
+    def result(self, future: Future, timeout: float | None = None):
+        """
+        Waits for the result of a task from `submit()`, for sync views. A task that times out is cancelled
+        if it has not started, so it stops counting against the bound.
+
+        :raises SolverTimeout: If the task does not finish within `timeout` seconds, `self.timeout` if not given.
+        """
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except TimeoutError:
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            raise SolverTimeout() from None
+
+    async def run(self, fn, *args, timeout: float | None = None):
+        """
+        Awaits `fn(*args)` run in a worker process (see `submit()`), without blocking the event loop.
+
+        :raises SolverBusy: If the queue is full.
+        :raises SolverTimeout: If the task does not finish within `timeout` seconds, `self.timeout` if not given.
+        """
+        future = self.submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise SolverTimeout() from None
+
+    def shutdown(self, wait: bool = True):
+        """Stops the worker processes. They are started again on the next `submit()`."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> dict:
+        """Bounds of the executor, tasks pending now, and tasks completed, cancelled, rejected and timed out since it started."""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'queue_depth': self.queue_depth,
+                'timeout': self.timeout,
+                'pending': self._pending,
+                'completed': self._completed,
+                'cancelled': self._cancelled,
+                'rejected': self._rejected,
+                'timeouts': self._timeouts,
+            }
@@ -1,3 +1,1228 @@
-from django.test import TestCase
+"""
+Tests for the K-Map solver and the game views.
 
-# Create your tests here.
+The original implementations of solver functions that were rewritten are frozen here as `_legacy_*`
+functions, as the references the rewrites are checked against.
+"""
+
+import copy, datetime, importlib, itertools, json, math, random, re, threading, time
+
+import numpy as np
+
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import benchmarks, daily_cache, group_generator, kmap_solver, question_pool, question_sessions, views
+from .models import DailyChallengeResult
+from .solver_executor import SolverBusy, SolverExecutor, SolverTimeout
+from .benchmarks import _grouped_functions, _random_functions
+
+
+# Frozen copies of the original solver
+
+
+def _legacy_get_prime_implicants(num_var: int,
+                                  terms: list[int], 
+                                  dont_cares: list[int] = [],
+                                  form_terms: str = "min",
+                                  ) -> list[str]:
+    """
+    Original string-based implementation of `kmap_solver.getPrimeImplicants()`, kept as the
+    reference that the `(value, mask)` cube engine is checked against.
+    """
+    prime_implicants = []
+    merged_terms = [[] for _ in range(num_var + 1)] # Running group for number of 1's/0's in terms
+
+    # Start to group terms with how many 1's/0's they have
+    for term in list(map(lambda t: bin(t).lstrip("0b").rjust(num_var, "0"), terms + dont_cares)): # Convert to binary strings
+        if form_terms.lower() == "min":
+            count = term.count("1")
+        elif form_terms.lower() == "max":
+            count = term.count("0")
+        merged_terms[count].append(term)
+
+    merged_terms = list(filter(lambda b: b, merged_terms)) # Remove groups with no terms
+    # print(merged_terms)
+
+    # print("Current merged minterms:", merged_terms)
+
+
+    while True:
+        merged_terms_cache = [] # Cache to avoid adding duplicate unmatched terms, especially for largest group of terms
+        new_merged_terms = [[] for _ in range(num_var + 1)]
+
+        for j in range(len(merged_terms)-1): # Loop for every term group except last one
+            for term1 in merged_terms[j]: # Loop for every term in current term group
+                noMatches = True 
+                for term2 in merged_terms[j+1]: # Check every term of next term group
+                    
+                    diff = -1 # index of only different digit
+                    for d in range(len(term1)): # Check every digit of two terms
+                        if term1[d] != term2[d] and diff == -1:
+                            diff = d
+                        elif term1[d] == term2[d]:
+                            continue
+                        else:
+                            break # Stop if there's another difference
+                    else: #
+                        noMatches = False
+
+                        # Save to cache for prime implicant saving
+                        if term1 not in merged_terms_cache:
+                            merged_terms_cache.append(term1)
+                        if term2 not in merged_terms_cache:
+                            merged_terms_cache.append(term2)
+
+                        new_term = list(term1)
+                        new_term[diff] = "-"
+                        new_term = "".join(new_term)
+                        if new_term not in new_merged_terms[j]: # Avoid repeating terms
+                            new_merged_terms[j].append(new_term)
+
+                if noMatches:
+                    if term1 not in merged_terms_cache:
+                        prime_implicants.append(term1)
+
+        # Check last group of terms
+        for mt in merged_terms[-1]:
+            if mt not in merged_terms_cache:
+                    prime_implicants.append(mt)
+
+        if new_merged_terms == [[] for _ in range(num_var + 1)]: # If no new terms were merged
+            # Add all remaining terms if not in current prime implicant list and finish loop
+            for group in merged_terms:
+                for mt in group:
+                    if mt not in prime_implicants:
+                        prime_implicants.append(mt)
+            break 
+
+        else: # If there are new minterms, repeat loop
+            merged_terms = new_merged_terms
+            merged_terms = list(filter(lambda b: b, merged_terms)) # Remove groups with no terms
+
+    # print(prime_implicants)
+    return prime_implicants
+
+
+def _legacy_minimize_prime_implicants(num_var: int,
+                                      terms: list,
+                                      prime_implicants: list[str],
+                                      form_terms: str = "min"
+                                      ) -> list[list[set[str]]]:
+    """
+    Original Petrick's method implementation of `kmap_solver.minimizePrimeImplicants()`, kept as
+    the reference that the branch and bound cover engine is checked against.
+
+    Known limitations: prime implicant indices are joined as strings (so charts with 10 or more
+    prime implicants are misread), and a chart with a single term returns every prime implicant
+    covering it as one expression (as does any chart that absorbs down to a single clause).
+    """
+
+    prime_implicant_chart: dict = {}
+    terms = list(map(lambda mt: bin(mt).lstrip("0b").rjust(num_var, "0"), terms)) # Convert to strings of binary
+    for pi in prime_implicants: # Add keys with empty string values in chart for every prime implicant
+        prime_implicant_chart[pi] = ""
+
+    # Fill up prime implicant chart
+    for pi in prime_implicant_chart.keys(): # For every prime implicant...
+        for term in terms: # ... check if they cover any term in list of terms
+            for answer in range(len(pi)):
+                if pi[answer] == term[answer] or pi[answer] == "-":
+                    continue
+                else:
+                    prime_implicant_chart[pi] += "0"
+                    break # Stop if prime implicant does not cover term
+            else:
+                prime_implicant_chart[pi] += "1"
+
+
+    # Start of chart simplification (at this point, currently SOP of prime implicant literals?)
+    curr_min_exp = [[] for _ in range(len(terms))]
+    
+    # Write initial expression
+    for i in range(len(terms)):
+        for pi in prime_implicant_chart.keys():
+            if prime_implicant_chart[pi][i] == "1":
+                curr_min_exp[i].append(prime_implicants.index(pi))
+
+
+    # Minimize absorbing literals, e.g. (A)(A+B) = (A), (A+B)(A+B+C) = (A+B), ...
+    temp_min_exp = copy.deepcopy(curr_min_exp)
+    for curr_answer in curr_min_exp:
+        for other_group in curr_min_exp:
+            if curr_answer == other_group:
+                continue
+            elif all(literal in other_group for literal in curr_answer) and other_group in temp_min_exp:
+                temp_min_exp.remove(other_group)
+    curr_min_exp = temp_min_exp
+                    
+    # Minimize distributive groups with the same number of literals
+    # Example: (A+B) (B+C) = (B + AC), (A+B+C)(A+B+D) = (A + B + CD),...
+    # For now, this code block only processes groups with only 1 different literalm check if need to check for more
+    while True:
+        temp_min_exp = copy.deepcopy(curr_min_exp)
+        for curr_answer in curr_min_exp:
+            if len(curr_answer) < 2:
+                continue
+            for other_group in curr_min_exp:
+                if curr_answer == other_group:
+                    continue
+                else:
+                    curr_in_other = [literal in other_group for literal in curr_answer] # list of boolean if elements in curr_group are missing in other
+                    other_in_curr = [literal in curr_answer for literal in other_group] # list of boolean if elements in other_group are missing in curr
+                    if curr_in_other.count(False) == 1 and other_in_curr.count(False) == 1:
+                        if curr_answer in temp_min_exp and other_group in temp_min_exp:
+                            temp_min_exp.remove(curr_answer)
+                            temp_min_exp.remove(other_group)
+                            # Get all literals existing in both groups
+                            new_literal = list(filter(lambda literal: curr_in_other[curr_answer.index(literal)], curr_answer))
+                            # Get all literals that are different in both groups
+                            curr_missing = list(filter(lambda literal: not curr_in_other[curr_answer.index(literal)], curr_answer))
+                            other_missing = list(filter(lambda literal: not other_in_curr[other_group.index(literal)], other_group))
+                            new_literal.append(tuple(curr_missing + other_missing))
+                            temp_min_exp.append(new_literal)
+
+        if curr_min_exp == temp_min_exp: # If no simplification was done
+            break
+        else:
+            curr_min_exp = temp_min_exp
+
+
+    # Multiply all POS to form SOPs
+    new_min_exp = []
+    while len(curr_min_exp) > 0:
+        curr_group = []
+        for group in curr_min_exp.pop(0):
+            if type(group) is tuple:
+                curr_group.append(''.join(str(val) for val in group))
+            else:
+                curr_group.append(group)
+
+        if len(new_min_exp) == 0:
+            if len(curr_min_exp) == 0:
+                new_min_exp.append(curr_group)
+            else:
+                new_min_exp = curr_group
+            continue 
+        else:
+            temp_minbool = []
+            for el1 in new_min_exp:
+                for el2 in curr_group:
+                    temp_minbool.append(str(el1) + str(el2))
+            new_min_exp = temp_minbool
+
+    # Convert to sets to remove repeating literals, e.g. AAB = AB
+    for i in range(len(new_min_exp)):
+        new_min_exp[i] = sorted(list(set(list(new_min_exp[i]))))
+    new_min_exp.sort(key=lambda x: len(x))
+
+    # Remove all absorbing literals but in SOP form
+    while True:
+        temp_min_exp = copy.deepcopy(new_min_exp)
+        for i in range(len(new_min_exp)):
+            for j in range(i, len(new_min_exp)):
+                curr_answer = new_min_exp[i]
+                other_group = new_min_exp[j]
+                if curr_answer == other_group:
+                    continue
+                elif len(other_group) > len(curr_answer) and [literal in other_group for literal in curr_answer].count(False) >= 1 and other_group in temp_min_exp:
+                    temp_min_exp.remove(other_group)
+
+        if new_min_exp == temp_min_exp:
+            break
+        else:
+            new_min_exp = temp_min_exp
+
+    # Get the smallest length groups
+    min_length = min(len(x) for x in new_min_exp)
+    minimal_expressions = list(filter(lambda x: len(x) == min_length, new_min_exp))
+    # print(f"Minimal expression: {minimal_expressions}")
+
+    # Get final expression from literals
+    final_expressions = []
+    terms = [chr(65+x) for x in range(num_var)]
+
+    # brute force switching T_T sorry AHAHHA
+    if num_var == 2:
+        terms[0], terms[1] = terms[1], terms[0]
+    elif num_var == 3:
+        terms[0], terms[1], terms[2] = terms[2], terms[0], terms[1]
+    elif num_var == 4:
+        terms[0:2], terms[2:4] = terms[2:4], terms[0:2]
+    elif num_var == 5:
+        terms[1:3], terms[3:5] = terms[3:5], terms[1:3]
+    elif num_var == 6:
+        terms[0], terms[1], terms[2:4], terms[4:6] = terms[1], terms[0], terms[4:6], terms[2:4]
+    # print(f"Terms: {terms}")
+    for answer in minimal_expressions:
+        curr_answer = []
+        for group in answer:
+            curr_group = set()
+            for f in range(len(prime_implicants[int(group)])):
+                if prime_implicants[int(group)][f] == "-":
+                    continue
+                elif prime_implicants[int(group)][f] == "1":
+                    curr_group.add(str(terms[f]) if form_terms == "min" else str(terms[f]) + "'")
+                elif prime_implicants[int(group)][f] == "0":
+                    curr_group.add(str(terms[f]) + "'" if form_terms == "min" else str(terms[f]))
+            curr_answer.append(curr_group)
+        final_expressions.append(curr_answer)
+
+    return final_expressions
+
+
+def _legacy_parse_answer(input_answer: str, form_answer: str = "min") -> list[set[str]]:
+    """
+    Original multi-pass answer parser, kept as the reference that the one-pass
+    `kmap_solver._parse_answer()` is checked against.
+    """
+    if all(char in ['A', 'B', 'C', 'D', 'E', 'F', '\'', ' ', '(', ')', '+', '', '\u2018', '\u0027', '\u2019'] for char in input_answer) == False: 
+        raise ValueError('Answer contains other characters besides ABCD\'()+.')
+
+    input_answer = input_answer.replace(' ', '')
+    input_answer = input_answer.replace('\u2018', '\'')
+    input_answer = input_answer.replace('\u0027', '\'')
+    input_answer = input_answer.replace('\u2019', '\'')
+    if form_answer == "min":
+        # Group minterms
+        input_answer = input_answer.replace("(", '').replace(")", '').split('+')
+
+        # Answer check
+        if len(input_answer) == 0:
+            raise IndexError('Answer is given as POS, not SOP form.')
+
+        # Group literals
+        for i in range(len(input_answer)): # Loop through minterms
+            temp_term = []
+            for j in range(len(input_answer[i])): # Loop through literals
+                char = input_answer[i][j]
+                if char == '\'':
+                    temp_term[-1] = temp_term[-1] + '\''
+                else:
+                    temp_term.append(char)
+            input_answer[i] = set(temp_term)
+
+    elif form_answer == "max":
+        # Group maxterms
+        input_answer = re.split(r'\)\(|\(|\)', input_answer)
+        input_answer = list(filter(lambda x: x != "", input_answer))
+        # Answer check
+        if len(input_answer) == 0:
+            raise IndexError('Answer is given as SOP, not POS form.')
+
+        # Clean max terms of parentheses and group literals
+        for i in range(len(input_answer)):
+            input_answer[i] = set(input_answer[i].strip('()').split('+'))
+
+    return input_answer
+
+
+def _legacy_generate_groups(num_var):
+    """
+    Original sliding window group generator for up to 6 variables, kept as the reference for the order of
+    `group_generator.groupTable()`, which seeded questions depend on.
+    """
+    shape, terms = group_generator.generateTerms(num_var)
+    groups = [[] for _ in range(num_var)]
+
+    # Duplicate the last row when size of dimension is 4 (for groups that wrap at the ends)
+    for a in range(len(terms.shape)):
+        axis = terms.shape[a]
+        if axis == 4:
+            terms = np.insert(terms, 4, np.take(terms, 0, axis=a), axis=a)
+
+    # Generate a list of all possible groups with the given shape
+    ranges = [range(1, dim + 1) for dim in shape]
+    group_shapes = [s for s in itertools.product(*ranges) if (math.log2(np.prod(s)) == round(math.log2(np.prod(s))) and np.prod(s) < np.prod(shape))]
+
+    for s in group_shapes:
+        # Get all possible groups with given size
+        curr_groups = np.reshape(np.lib.stride_tricks.sliding_window_view(terms, s), (-1, np.prod(s))).tolist()
+        # Remove repeating elements
+        curr_groups = [set(item) for item in set(frozenset(item) for item in curr_groups)]
+        curr_groups = sorted(curr_groups, key=min)
+        # Insert groups
+        groups[int(math.log2(np.prod(s)))].extend(curr_groups)
+
+    return groups
+
+
+# Solver
+
+
+def _all_functions(num_var: int) -> list[list[int]]:
+    """
+    Every non-empty function of `num_var` variables as a list of minterms.
+    """
+    return [[term for term in range(2**num_var) if (f >> term) & 1] for f in range(1, 2**(2**num_var))]
+
+
+def _expression_key(expression: list[set[str]]) -> tuple[str, ...]:
+    return tuple(sorted("".join(sorted(term)) for term in expression))
+
+
+def _random_answer(length: int, rng: random.Random) -> str:
+    """
+    Random string of `length` characters that are mostly valid in an answer.
+    """
+    return "".join(rng.choice("ABCDEF'()+ \u2018\u2019") for _ in range(length))
+
+
+def _adversarial_answers(length: int) -> dict[str, str]:
+    """
+    Long answers built to stress the parser: many terms, long literals, deep parentheses and many quotes.
+    """
+    return {
+        "terms": "+".join(["AB'C'D"] * (length // 7))[:length],
+        "literals": "ABCDEF" * (length // 6),
+        "parentheses": "(" * ((length - 1) // 2) + "A" + ")" * ((length - 1) // 2),
+        "clauses": "(A+B')" * (length // 6),
+        "quotes": "A" + "'" * (length - 1),
+        "spaces": "A" + " " * (length - 2) + "B",
+    }
+
+
+def _parse_outcome(parser, answer: str, form: str):
+    """
+    Result of a parser as something comparable: the terms, or the type of error raised.
+    """
+    try:
+        return sorted(sorted(term) for term in parser(answer, form))
+    except ValueError:
+        return ValueError
+    except IndexError:
+        return IndexError
+
+
+class GroupTableTests(SimpleTestCase):
+    def test_same_groups_in_the_same_order_as_the_original(self):
+        for num_var in (2, 3, 4, 5, 6):
+            self.assertEqual(group_generator.generateGroups(num_var), _legacy_generate_groups(num_var), f"{num_var} variables")
+
+    def test_every_cube_of_larger_maps(self):
+        for num_var in (7, 8):
+            groups = group_generator.groupTable(num_var)
+            self.assertEqual(sum(map(len, groups)), 3**num_var - 1)
+            for size, size_groups in enumerate(groups):
+                self.assertEqual(len(set(size_groups)), len(size_groups))
+                for group in size_groups:
+                    self.assertEqual(len(group), 2**size)
+                    fixed = min(group) ^ max(group) ^ (2**num_var - 1)
+                    self.assertTrue(all(term & fixed == min(group) & fixed for term in group))
+
+
+class PrimeImplicantTests(SimpleTestCase):
+    def assertSamePrimeImplicants(self, num_var, cases):
+        for terms, dont_cares in cases:
+            for form in ("min", "max"):
+                expected = _legacy_get_prime_implicants(num_var, terms, dont_cares, form)
+                actual = kmap_solver.getPrimeImplicants(num_var, terms, dont_cares, form)
+                # Order included, as the order of answers depends on it
+                self.assertEqual(actual, expected, f"{num_var} variables, {form}terms {terms}, don't cares {dont_cares}")
+
+    def test_every_function_of_up_to_4_variables(self):
+        for num_var in (1, 2, 3, 4):
+            self.assertSamePrimeImplicants(num_var, [(terms, []) for terms in _all_functions(num_var)])
+
+    def test_random_functions_with_dont_cares(self):
+        rng = random.Random(0)
+        for num_var in (5, 6):
+            self.assertSamePrimeImplicants(num_var, _random_functions(num_var, 50, rng))
+
+    def test_batch_matches_one_function_at_a_time(self):
+        rng = random.Random(0)
+        for num_var in (2, 3, 4, 5, 6):
+            cases = _random_functions(num_var, 200, rng)
+            on_sets = np.zeros((len(cases), 2**num_var), dtype=bool)
+            dc_sets = np.zeros_like(on_sets)
+            for i, (terms, dont_cares) in enumerate(cases):
+                on_sets[i, terms] = True
+                dc_sets[i, dont_cares] = True
+
+            primes = kmap_solver.getPrimeImplicantsBatch(num_var, on_sets, dc_sets)
+            values, masks, _, _ = kmap_solver._cube_table(num_var)
+            strings = [kmap_solver._cube_to_string(num_var, (int(value), int(mask))) for value, mask in zip(values, masks)]
+            for row, (terms, dont_cares) in zip(primes, cases):
+                self.assertEqual({strings[idx] for idx in np.flatnonzero(row)}, set(kmap_solver.getPrimeImplicants(num_var, terms, dont_cares)),
+                                 f"{num_var} variables, minterms {terms}, don't cares {dont_cares}")
+
+
+class MinimalCoverTests(SimpleTestCase):
+    def test_finds_every_expression_of_petricks_method(self):
+        """
+        Every expression of the original is found. The original can not handle 10 or more prime implicants or a single term,
+        merges a chart that absorbs down to one clause into a non-minimal expression, and can drop some minimum covers.
+        """
+        rng = random.Random(0)
+        compared = 0
+        for num_var in (3, 4, 5, 6):
+            for terms, dont_cares in _random_functions(num_var, 60, rng):
+                form = rng.choice(["min", "max"])
+                prime_implicants = kmap_solver.getPrimeImplicants(num_var, terms, dont_cares, form)
+                actual = kmap_solver.minimizePrimeImplicants(num_var, terms, prime_implicants, form)
+                self.assertEqual(len({len(expression) for expression in actual}), 1)
+
+                if len(prime_implicants) >= 10 or len(terms) < 2:
+                    continue
+                try:
+                    expected = _legacy_minimize_prime_implicants(num_var, terms, prime_implicants, form)
+                except Exception:
+                    continue
+                if any(len(expression) != len(actual[0]) for expression in expected):
+                    continue
+
+                compared += 1
+                self.assertLessEqual(set(map(_expression_key, expected)), set(map(_expression_key, actual)),
+                                     f"{num_var} variables, {form}terms {terms}, don't cares {dont_cares}")
+        self.assertGreater(compared, 50)
+
+    def test_lazy_expressions_are_the_minimal_ones(self):
+        rng = random.Random(0)
+        for num_var in (3, 4, 5, 6):
+            for terms, dont_cares in _random_functions(num_var, 40, rng):
+                form = rng.choice(["min", "max"])
+                prime_implicants = kmap_solver.getPrimeImplicants(num_var, terms, dont_cares, form)
+                expected = set(map(_expression_key, kmap_solver.minimizePrimeImplicants(num_var, terms, prime_implicants, form)))
+                message = f"{num_var} variables, {form}terms {terms}, don't cares {dont_cares}"
+
+                every = list(map(_expression_key, kmap_solver.iterMinimalExpressions(num_var, terms, prime_implicants, form)))
+                self.assertEqual(len(every), len(set(every)), message)
+                self.assertEqual(set(every), expected, message)
+
+                limited = list(map(_expression_key, kmap_solver.iterMinimalExpressions(num_var, terms, prime_implicants, form, limit=2)))
+                self.assertEqual(len(limited), min(2, len(expected)), message)
+                self.assertLessEqual(set(limited), expected, message)
+
+
+class IrredundantCoverTests(SimpleTestCase):
+    def test_smallest_irredundant_expressions_are_the_minimal_ones(self):
+        rng = random.Random(0)
+        for num_var in (3, 4, 5, 6):
+            for terms, dont_cares in _random_functions(num_var, 40, rng):
+                form = rng.choice(["min", "max"])
+                prime_implicants = kmap_solver.getPrimeImplicants(num_var, terms, dont_cares, form)
+                minimal = kmap_solver.minimizePrimeImplicants(num_var, terms, prime_implicants, form)
+                try:
+                    irredundant, _ = kmap_solver.getIrredundantExpressions(num_var, terms, prime_implicants, form, max_products=2000)
+                except OverflowError:
+                    continue
+                smallest = [expression for expression in irredundant if len(expression) == len(irredundant[0])]
+                self.assertEqual(set(map(_expression_key, smallest)), set(map(_expression_key, minimal)),
+                                 f"{num_var} variables, {form}terms {terms}, don't cares {dont_cares}")
+
+    def test_max_products_stops_the_expansion(self):
+        terms = [term for term in range(64) if term.bit_count() == 2]
+        dont_cares = [term for term in range(64) if term.bit_count() == 3]
+        prime_implicants = kmap_solver.getPrimeImplicants(6, terms, dont_cares)
+        with self.assertRaises(OverflowError):
+            kmap_solver.getIrredundantExpressions(6, terms, prime_implicants, max_products=1000)
+
+
+def _band(num_var: int, ones: tuple[int, ...]) -> list[int]:
+    """
+    Terms of `num_var` variables with a number of ones in `ones`, one band of a symmetric function.
+    """
+    return [term for term in range(2**num_var) if term.bit_count() in ones]
+
+
+def _worst_case_functions() -> dict[str, tuple[int, list[int], list[int]]]:
+    """
+    Functions that make the exact cover search blow up, with dozens to hundreds of prime implicants in a cyclic chart.
+    Without a budget, the 6 variable ones have over a million minimum covers, and finding even the size of a minimum
+    cover of the 7 and 8 variable ones takes minutes.
+    """
+    cells = list(range(256))
+    random.Random(0).shuffle(cells)
+    return {
+        "6 vars, 2 ones, 3 ones as don't cares": (6, _band(6, (2,)), _band(6, (3,))),
+        "6 vars, 2 or 3 ones": (6, _band(6, (2, 3)), []),
+        "7 vars, 3 or 4 ones": (7, _band(7, (3, 4)), []),
+        "8 vars, 4 or 5 ones": (8, _band(8, (4, 5)), []),
+        "8 vars, random with don't cares": (8, sorted(cells[:85]), sorted(cells[85:170])),
+    }
+
+
+class SolverBudgetTests(SimpleTestCase):
+    MAX_STEPS = 20000
+
+    def setUp(self):
+        kmap_solver._clear_tutorial_memo()
+        self.addCleanup(kmap_solver._clear_tutorial_memo)
+
+    def test_worst_cases_are_solved_within_the_budget(self):
+        """Greedy covers must still be correct answers, which `checkAnswerCover()` checks to be covers of prime implicants"""
+        for name, (num_var, terms, dont_cares) in _worst_case_functions().items():
+            start = time.perf_counter()
+            solution = kmap_solver.tutorial_solve(num_var, terms, dont_cares, "min", self.MAX_STEPS)
+            result, _ = kmap_solver.minimizeAndCheck(num_var, terms, dont_cares, "min", solution["expression"], limit=5,
+                                                     budget=kmap_solver.SolverBudget(self.MAX_STEPS))
+            self.assertEqual(result, 1, name)
+            self.assertLess(time.perf_counter() - start, 5, name)
+
+    def test_budget_does_not_change_question_like_maps(self):
+        rng = random.Random(0)
+        for num_var in (7, 8):
+            for terms, dont_cares in _grouped_functions(num_var, 10, rng):
+                form = rng.choice(["min", "max"])
+                budgeted = kmap_solver.tutorial_solve(num_var, terms, dont_cares, form, self.MAX_STEPS)
+                kmap_solver._clear_tutorial_memo()
+                unbudgeted = kmap_solver.tutorial_solve(num_var, terms, dont_cares, form)
+                kmap_solver._clear_tutorial_memo()
+                self.assertTrue(budgeted["exact"])
+                self.assertEqual(budgeted, unbudgeted, f"{num_var} variables, {form}terms {terms}, don't cares {dont_cares}")
+
+    def test_only_exact_solutions_are_memoized(self):
+        # A cyclic chart, which needs more than one step to search
+        terms = [0, 1, 2, 5, 6, 7]
+        greedy = kmap_solver.tutorial_solve(3, terms, [], "min", max_steps=1)
+        self.assertFalse(greedy["exact"])
+
+        exact = kmap_solver.tutorial_solve(3, terms, [], "min")
+        self.assertTrue(exact["exact"])
+        with mock.patch.object(kmap_solver, "_tutorial_solve", wraps=kmap_solver._tutorial_solve) as solve:
+            self.assertEqual(kmap_solver.tutorial_solve(3, list(reversed(terms)), [], "min", max_steps=1), exact)
+        solve.assert_not_called()
+
+    def test_constant_maps_have_the_same_keys(self):
+        for num_var, terms, dont_cares, form, expression in ((3, [], [], "min", "0"), (3, list(range(8)), [], "min", "1"),
+                                                             (3, [1], [0, *range(2, 8)], "max", "0"), (3, [], [0], "max", "1")):
+            self.assertEqual(kmap_solver.tutorial_solve(num_var, terms, dont_cares, form),
+                             {"expression": expression, "groupings": [], "terms": [], "exact": True})
+
+
+class AnswerCheckerTests(SimpleTestCase):
+    def test_accepts_exactly_the_minimal_irredundant_expressions(self):
+        """Every irredundant expression (up to 20 per function) is submitted, those with the fewest terms must pass"""
+        rng = random.Random(0)
+        answers = 0
+        for num_var in (3, 4, 5, 6):
+            for terms, dont_cares in _random_functions(num_var, 40, rng):
+                form = rng.choice(["min", "max"])
+                if len(terms) + len(dont_cares) == 2**num_var: # Constant functions have no expression to submit
+                    continue
+                prime_implicants = kmap_solver.getPrimeImplicants(num_var, terms, dont_cares, form)
+                try:
+                    irredundant, _ = kmap_solver.getIrredundantExpressions(num_var, terms, prime_implicants, form, max_products=2000)
+                except OverflowError:
+                    continue
+                for expression in irredundant[:20]:
+                    expected = 1 if len(expression) == len(irredundant[0]) else 0
+                    answer = kmap_solver.stringifyExpression(expression, form)
+                    answers += 1
+                    self.assertEqual(kmap_solver.checkAnswerCover(num_var, terms, dont_cares, answer, form), expected,
+                                     f"{answer!r} for {num_var} variables, {form}terms {terms}, don't cares {dont_cares}")
+        self.assertGreater(answers, 100)
+
+    def test_rejects_non_prime_and_non_covering_answers(self):
+        # F = A'B' + AB' = B', with 2 variables where term 0 is A'B'
+        terms = [0, 2]
+        expected = kmap_solver.minimizeAndCheck(2, terms, [], "min", "", limit=1)[1][0]
+        self.assertEqual(kmap_solver.checkAnswerCover(2, terms, [], expected), 1)
+        for wrong in ("A'B' + AB'", "A", "A + A'"):
+            self.assertEqual(kmap_solver.checkAnswerCover(2, terms, [], wrong), 0, wrong)
+
+    def test_malformed_answers(self):
+        self.assertEqual(kmap_solver.checkAnswerCover(3, [1, 2], [], "A + X"), -1)
+        self.assertEqual(kmap_solver.checkAnswerCover(3, [1, 2], [], "()", "max"), -2)
+
+
+class AnswerParserTests(SimpleTestCase):
+    def test_matches_the_original_parser(self):
+        rng = random.Random(0)
+        for _ in range(5000):
+            answer = _random_answer(rng.randint(0, 12), rng)
+            for form in ("min", "max"):
+                self.assertEqual(_parse_outcome(kmap_solver._parse_answer, answer, form), _parse_outcome(_legacy_parse_answer, answer, form),
+                                 f"{answer!r} in {form} form")
+
+    def test_long_answers_are_read_in_linear_time(self):
+        for name, answer in _adversarial_answers(kmap_solver.MAX_ANSWER_LENGTH).items():
+            for form in ("min", "max"):
+                start = time.perf_counter()
+                _parse_outcome(kmap_solver._parse_answer, answer, form)
+                self.assertLess(time.perf_counter() - start, 0.5, f"{name} in {form} form")
+
+    def test_answers_over_the_length_limit_are_rejected(self):
+        answer = "+".join(["AB'C'D"] * (kmap_solver.MAX_ANSWER_LENGTH // 6))
+        self.assertGreater(len(answer), kmap_solver.MAX_ANSWER_LENGTH)
+        with self.assertRaises(kmap_solver.AnswerLengthError):
+            kmap_solver._parse_answer(answer)
+        self.assertEqual(kmap_solver.checkAnswerCover(4, [0, 1], [], answer), -3)
+
+
+class RegressionGateTests(SimpleTestCase):
+    def test_flags_only_stages_slower_or_larger_than_the_baseline(self):
+        def stage(p50_ms, peak_kib):
+            return {"calls": 50, "p50_ms": p50_ms, "p95_ms": p50_ms, "max_ms": p50_ms, "peak_kib": peak_kib}
+
+        baseline = {"stages": {"slower": stage(1.0, 10), "larger": stage(1.0, 10), "steady": stage(1.0, 10), "tiny": stage(0.01, 10)}}
+        results = {"stages": {"slower": stage(1.5, 10), "larger": stage(1.0, 20), "steady": stage(1.2, 11), "tiny": stage(0.04, 10),
+                              "new": stage(100.0, 1000)}}
+
+        regressions = benchmarks.find_regressions(results, baseline, threshold=0.25)
+        self.assertEqual([(row["stage"], row["metric"]) for row in regressions], [("slower", "p50_ms"), ("larger", "peak_kib")])
+
+
+# Questions
+
+
+class QuestionSynthesisTests(SimpleTestCase):
+    def test_questions_are_in_their_band(self):
+        for difficulty, band in question_pool.DIFFICULTY_BANDS.items():
+            questions = question_pool.synthesizeQuestions(difficulty, 40, seed=0)
+            self.assertEqual(len(questions), 40)
+            self.assertEqual(questions, question_pool.synthesizeQuestions(difficulty, 40, seed=0))
+
+            for question in questions:
+                num_var, terms, dont_cares = question.num_var, question.terms, question.dont_cares
+                message = f"difficulty {difficulty}, {question.form}terms {terms}, don't cares {dont_cares}"
+                self.assertIn(num_var, band['num_var'][0], message)
+                self.assertLessEqual(len(dont_cares), band['max_dont_cares'], message)
+
+                # Bulk metrics match the prime implicant chart of the question
+                cubes = kmap_solver._prime_implicant_cubes(num_var, terms, dont_cares, question.form)
+                columns = kmap_solver._cover_chart(terms, cubes)
+                essential = 0
+                for column in columns:
+                    if column & (column - 1) == 0:
+                        essential |= column
+                on_sets = np.zeros((1, 2**num_var), dtype=bool)
+                dc_sets = np.zeros_like(on_sets)
+                on_sets[0, terms] = True
+                dc_sets[0, dont_cares] = True
+                metrics = kmap_solver.getQuestionMetricsBatch(num_var, on_sets, dc_sets)
+                self.assertEqual((metrics['prime_implicants'][0], metrics['essential'][0], metrics['uncovered'][0]),
+                                 (len(cubes), essential.bit_count(), sum(1 for column in columns if not column & essential)), message)
+
+                cyclic_core, min_terms, solutions, _ = kmap_solver._cover_metrics(terms, cubes, band['solutions'][1])
+                self.assertTrue(band['prime_implicants'][0] <= len(cubes) <= band['prime_implicants'][1], message)
+                self.assertTrue(band['cyclic_core'][0] <= cyclic_core <= band['cyclic_core'][1], message)
+                self.assertTrue(band['min_terms'][0] <= min_terms <= band['min_terms'][1], message)
+                self.assertTrue(band['solutions'][0] <= solutions <= band['solutions'][1], message)
+                self.assertEqual(question.min_terms, min_terms, message)
+                for answer in question.answers:
+                    self.assertEqual(kmap_solver.checkAnswerCover(num_var, terms, dont_cares, answer, question.form), 1, message)
+
+    def test_gives_up_on_a_band_no_function_is_in(self):
+        band = {**question_pool.DIFFICULTY_BANDS[1], 'prime_implicants': (50, 60)}
+        with mock.patch.dict(question_pool.DIFFICULTY_BANDS, {1: band}):
+            with self.assertRaises(question_pool.SynthesisError):
+                question_pool.synthesizeQuestions(1, 5, seed=0, batch_size=64, max_batches=3)
+
+
+class QuestionIdTests(SimpleTestCase):
+    def test_same_seed_gives_the_same_question(self):
+        for difficulty in (1, 2, 3):
+            for num_dc_override in (None, 0):
+                for seed in (0, 1, 12345, 2**question_pool.SEED_BITS - 1):
+                    random.seed(seed)
+                    first = kmap_solver.randomizeQuestion(difficulty, num_dc_override, seed=seed)
+                    random.seed(seed + 1) # The global random state must not matter
+                    self.assertEqual(kmap_solver.randomizeQuestion(difficulty, num_dc_override, seed=seed), first,
+                                     f"difficulty {difficulty}, seed {seed}")
+
+        for seed in range(5):
+            self.assertEqual(question_pool.generateQuestion(3, True, seed=seed), question_pool.generateQuestion(3, True, seed=seed))
+
+    def test_question_id_round_trips(self):
+        for difficulty in (1, 2, 3):
+            for allow_dont_cares in (True, False):
+                for seed in (0, 1, 35, 36, 12345, 2**question_pool.SEED_BITS - 1):
+                    question_id = question_pool.encodeQuestionId(difficulty, allow_dont_cares, seed)
+                    self.assertLessEqual(len(question_id), 8)
+                    self.assertEqual(question_pool.decodeQuestionId(question_id), (difficulty, allow_dont_cares, seed))
+
+        question = question_pool.generateQuestion(2, False, seed=7)
+        self.assertEqual(question_pool.decodeQuestionId(question.question_id), (2, False, 7))
+        self.assertEqual(question_pool.functionFromId(question.question_id), (question.num_var, question.form, question.terms, question.dont_cares))
+
+    def test_invalid_question_ids(self):
+        for difficulty, seed in ((0, 0), (4, 0), (1, -1), (1, 2**question_pool.SEED_BITS)):
+            with self.assertRaises(ValueError):
+                question_pool.encodeQuestionId(difficulty, True, seed)
+
+        valid = question_pool.encodeQuestionId(2, True, 12345)
+        # Not a string, empty, outside the digits, too long, a difficulty of 0, and a leading zero
+        for question_id in (None, 12345, "", "!", valid.upper(), "1" * 9, "0", "0" + valid):
+            with self.assertRaises(ValueError, msg=repr(question_id)):
+                question_pool.decodeQuestionId(question_id)
+
+
+class QuestionPoolTests(SimpleTestCase):
+    def make_pool(self):
+        return question_pool.QuestionPool(size=4, low_water=2, difficulties=(1, 2), answer_limit=1)
+
+    def wait_for(self, condition, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "Timed out waiting for the refill thread")
+            time.sleep(0.01)
+
+    def bucket_sizes(self, pool):
+        return {name: bucket['size'] for name, bucket in pool.stats()['buckets'].items()}
+
+    def test_drained_bucket_is_refilled(self):
+        pool = self.make_pool()
+        pool.warm()
+        self.wait_for(lambda: set(self.bucket_sizes(pool).values()) == {4})
+        refills = pool.stats()['refills']
+        self.assertEqual(refills, 4)
+
+        # Down to the low water mark, the bucket is refilled
+        for _ in range(3):
+            question = pool.takeQuestion(2, False)
+            self.assertEqual(question_pool.decodeQuestionId(question.question_id)[:2], (2, False))
+            self.assertEqual(question.dont_cares, [])
+        self.assertEqual(self.bucket_sizes(pool)['1/dc'], 4)
+        self.wait_for(lambda: pool.stats()['refills'] == refills + 1)
+        self.assertEqual(set(self.bucket_sizes(pool).values()), {4})
+
+        stats = pool.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (3, 0, 1.0))
+        self.assertIsNotNone(stats['refill_ms']['p50'])
+        self.assertLessEqual(stats['refill_ms']['p50'], stats['refill_ms']['p95'])
+        self.assertLessEqual(stats['refill_ms']['p95'], stats['refill_ms']['max'])
+
+    def test_empty_bucket_starves(self):
+        pool = self.make_pool()
+        with mock.patch.object(pool, '_start'): # No refill, so the bucket stays empty
+            self.assertIsNone(pool.takeQuestion(1, True))
+            question = pool.popQuestion(1, True)
+            self.assertEqual(question_pool.decodeQuestionId(question.question_id)[:2], (1, True))
+            # Difficulties without a bucket are generated right away and not counted
+            self.assertIsNone(pool.takeQuestion(3, True))
+            self.assertIn(pool.popQuestion(3, True).num_var, (5, 6))
+
+        stats = pool.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (0, 2, 0.0))
+        self.assertEqual({name: bucket['starved'] for name, bucket in stats['buckets'].items()},
+                         {'1/dc': 2, '1/no-dc': 0, '2/dc': 0, '2/no-dc': 0})
+        self.assertEqual((stats['refills'], stats['refill_ms']['max']), (0, None))
+
+    def test_refill_thread_is_started_once(self):
+        pool = self.make_pool()
+        barrier = threading.Barrier(8)
+
+        def start():
+            barrier.wait()
+            pool._start()
+
+        callers = [threading.Thread(target=start) for _ in range(8)]
+        def slow_thread(**kwargs): # Widens the window between checking and setting the thread
+            time.sleep(0.05)
+            return mock.Mock()
+
+        with mock.patch.object(question_pool.threading, 'Thread', side_effect=slow_thread) as thread:
+            for caller in callers:
+                caller.start()
+            for caller in callers:
+                caller.join()
+        thread.assert_called_once()
+
+
+# Views
+
+
+def _worksheet_answers(functions: int, answers_per_function: int, rng: random.Random) -> list[dict]:
+    """
+    `/check-batch` items of a worksheet of `functions` question-like functions of 4 to 6 variables, each answered
+    `answers_per_function` times: a minimal expression, one with a term dropped, or a random wrong answer.
+    """
+    items = []
+    for _ in range(functions):
+        num_var = rng.randint(4, 6)
+        terms, dont_cares = _grouped_functions(num_var, 1, rng)[0]
+        form = rng.choice(["min", "max"])
+        answer = question_pool.solveQuestion(num_var, form, terms, dont_cares, 1)["answers"][0]
+        separator = " + " if form == "min" else " "
+        answers = [answer, separator.join(answer.split(separator)[:-1]) or answer, separator.join(rng.sample("ABCD", 2))]
+        for _ in range(answers_per_function):
+            items.append({"q_num_var": num_var, "q_form": form, "q_terms": terms, "q_dont_cares": dont_cares, "answer": rng.choice(answers)})
+    rng.shuffle(items)
+    return items
+
+
+class SolutionBackfillTests(SimpleTestCase):
+    def test_frozen_solver_of_the_migration_matches_the_solver(self):
+        migration = importlib.import_module('kmap.migrations.0008_dailychallenge_solution')
+
+        def terms_of(answer):
+            return sorted(re.split(r" \+ |(?<=\)) ", answer))
+
+        for seed in range(60):
+            question = question_pool.generateQuestion(seed % 3 + 1, seed=seed)
+            num_var, form, terms, dont_cares = question.num_var, question.form, question.terms, question.dont_cares
+            solution = question_pool.solveQuestion(num_var, form, terms, dont_cares)
+            message = f"{num_var} variables, {form}terms {terms}, don't cares {dont_cares}"
+
+            cubes = migration._prime_implicants(num_var, terms, dont_cares)
+            covers = migration._minimum_covers(terms, cubes, migration.ANSWER_LIMIT)
+            answers = [terms_of(migration._stringify(num_var, [cubes[idx] for idx in cover], form)) for cover in covers]
+            self.assertEqual(sorted(migration._cube_to_string(num_var, cube) for cube in cubes), sorted(solution['prime_implicants']), message)
+            self.assertEqual(len(covers[0]), solution['min_terms'], message)
+            self.assertEqual(len(answers), min(migration.ANSWER_LIMIT, len(solution['answers'])), message)
+            for answer in answers:
+                self.assertIn(answer, [terms_of(expected) for expected in solution['answers']], message)
+            self.assertEqual(migration._mask(terms), format(kmap_solver._terms_to_bitmask(terms), 'x'), message)
+
+
+class DailyChallengeTests(TestCase):
+    def setUp(self):
+        views.DAILY_CHALLENGE_CACHE.clear()
+        self.addCleanup(views.DAILY_CHALLENGE_CACHE.clear)
+        self.client = APIClient()
+        self.challenge = views.store_daily_challenge(timezone.now().date(), question_pool.generateQuestion(2, answer_limit=views.MAX_ANSWERS, seed=3))
+
+    def check_without_solving(self, user):
+        """
+        Answers today's challenge with the first stored answer, and fails if anything solves it again.
+        """
+        with mock.patch.object(question_pool, 'solveQuestion') as solve_question, \
+                mock.patch.object(kmap_solver, 'getPrimeImplicants') as get_prime_implicants, \
+                mock.patch.object(kmap_solver, 'iterMinimalExpressions') as iter_minimal_expressions:
+            response = self.client.post(reverse('check-answer'), {'type': 0, 'user': {**user, 'answer': self.challenge.answers[0]}}, format='json')
+        solve_question.assert_not_called()
+        get_prime_implicants.assert_not_called()
+        iter_minimal_expressions.assert_not_called()
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data, {'result': 1, 'answers': self.challenge.answers})
+
+    def test_check_from_the_question_session(self):
+        user = self.client.post(reverse('check-user'), {'username': 'player', 'difficulty': 'timed'}, format='json').data
+        self.assertIsNotNone(user['q_session'])
+        self.check_without_solving(user)
+        self.assertEqual(DailyChallengeResult.objects.filter(username='player', daily_challenge=self.challenge).count(), 1)
+
+    def test_check_from_the_stored_solution(self):
+        self.check_without_solving({
+            'username': 'player', 'difficulty': 4, 'q_session': None, 'q_id': None, 'q_num_var': self.challenge.num_var, 'q_form': self.challenge.form,
+            'q_terms': self.challenge.terms, 'q_dont_cares': self.challenge.dont_cares,
+        })
+
+
+class DailyCacheTests(SimpleTestCase):
+    def test_value_is_kept_until_the_date_changes(self):
+        cache = daily_cache.DailyCache()
+        load = mock.Mock(side_effect=["first", "second"])
+        today = datetime.date(2026, 1, 1)
+
+        self.assertEqual(cache.get(today, load), "first")
+        self.assertEqual(cache.get(today, load), "first")
+        self.assertEqual(load.call_count, 1)
+
+        self.assertEqual(cache.get(today + datetime.timedelta(days=1), load), "second")
+        self.assertEqual(load.call_count, 2)
+        self.assertEqual(cache.stats(), {'date': '2026-01-02', 'hits': 1, 'misses': 2})
+
+    def test_none_is_not_cached(self):
+        cache = daily_cache.DailyCache()
+        load = mock.Mock(side_effect=[None, "created"])
+        today = datetime.date(2026, 1, 1)
+
+        self.assertIsNone(cache.get(today, load))
+        self.assertEqual(cache.get(today, load), "created")
+        self.assertEqual(load.call_count, 2)
+
+    def test_loads_outside_the_lock_once_per_date(self):
+        cache = daily_cache.DailyCache()
+        today = datetime.date(2026, 1, 1)
+        loading, release = threading.Event(), threading.Event()
+
+        def slow_load():
+            loading.set()
+            self.assertTrue(release.wait(10))
+            return "today"
+
+        load = mock.Mock(side_effect=slow_load)
+        results = []
+        getters = [threading.Thread(target=lambda: results.append(cache.get(today, load))) for _ in range(4)]
+        for getter in getters:
+            getter.start()
+        self.assertTrue(loading.wait(10))
+
+        # Another date is not held up by the load of today
+        self.assertEqual(cache.get(today - datetime.timedelta(days=1), lambda: "yesterday"), "yesterday")
+        release.set()
+        for getter in getters:
+            getter.join()
+        self.assertEqual(results, ["today"] * 4)
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(cache.get(today, load), "today")
+
+    def test_failed_load_is_retried(self):
+        cache = daily_cache.DailyCache()
+        load = mock.Mock(side_effect=[RuntimeError, "created"])
+        today = datetime.date(2026, 1, 1)
+
+        with self.assertRaises(RuntimeError):
+            cache.get(today, load)
+        self.assertEqual(cache.get(today, load), "created")
+
+
+class DailyChallengeCacheTests(TestCase):
+    def setUp(self):
+        views.DAILY_CHALLENGE_CACHE.clear()
+        self.addCleanup(views.DAILY_CHALLENGE_CACHE.clear)
+
+    def test_warm_challenge_needs_no_queries(self):
+        challenge = views.store_daily_challenge(timezone.now().date(), question_pool.generateQuestion(2, answer_limit=views.MAX_ANSWERS, seed=3))
+        self.assertEqual(views.get_or_create_daily_challenge(), challenge)
+        with self.assertNumQueries(0):
+            self.assertEqual(views.get_or_create_daily_challenge(), challenge)
+            self.assertEqual(views.get_daily_challenge(), challenge)
+
+    def test_missing_challenge_is_created_once(self):
+        with mock.patch.object(question_pool, 'generateDailyQuestion', wraps=question_pool.generateDailyQuestion) as generate:
+            challenge = views.get_or_create_daily_challenge()
+            with self.assertNumQueries(0):
+                self.assertEqual(views.get_or_create_daily_challenge(), challenge)
+        generate.assert_called_once()
+
+
+class QuestionSessionTests(TestCase):
+    def start(self):
+        question = question_pool.generateQuestion(2, answer_limit=views.MAX_ANSWERS, seed=3)
+        session_id = question_sessions.start_session(question.num_var, question.form, question.terms, question.dont_cares,
+                                                     question.answers, question.min_terms)
+        return question, session_id
+
+    def test_session_is_seen_by_every_worker(self):
+        question, session_id = self.start()
+        # A new connection to the cache, like the one of another worker process
+        session = caches.create_connection(question_sessions.SESSION_CACHE).get(session_id)
+        self.assertEqual(session, question_sessions.make_session(question.num_var, question.form, question.terms, question.dont_cares,
+                                                                 question.answers, question.min_terms))
+        self.assertEqual(question_sessions.check_session_answer(session, question.answers[0]), (1, question.answers))
+
+    def test_async_session_round_trip(self):
+        question = question_pool.generateQuestion(2, answer_limit=views.MAX_ANSWERS, seed=3)
+        session_id = async_to_sync(question_sessions.astart_session)(question.num_var, question.form, question.terms, question.dont_cares,
+                                                                       question.answers, question.min_terms)
+        self.assertEqual(question_sessions.get_session(session_id), async_to_sync(question_sessions.aget_session)(session_id))
+        self.assertEqual(question_sessions.get_session(session_id)['min_terms'], question.min_terms)
+
+    def test_session_expires(self):
+        cache_settings = copy.deepcopy(settings.CACHES)
+        cache_settings[question_sessions.SESSION_CACHE]['TIMEOUT'] = 2
+        with override_settings(CACHES=cache_settings):
+            _, session_id = self.start()
+            self.assertIsNotNone(question_sessions.get_session(session_id))
+            time.sleep(2.1)
+            self.assertIsNone(question_sessions.get_session(session_id))
+
+    def test_invalid_session_ids(self):
+        for session_id in (None, "", 5, "x" * 65, "unknown"):
+            self.assertIsNone(question_sessions.get_session(session_id))
+
+
+class CheckBatchTests(TestCase):
+    def post(self, items):
+        return APIClient().post(reverse('check-batch'), {'items': items}, format='json')
+
+    def test_same_results_as_one_item_at_a_time(self):
+        items = _worksheet_answers(views.MAX_BATCH_FUNCTIONS, 4, random.Random(0))
+        response = self.post(items)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['functions_solved'], views.MAX_BATCH_FUNCTIONS)
+        self.assertEqual(response.data['results'], [self.post([item]).data['results'][0] for item in items])
+        self.assertIn(1, [row['result'] for row in response.data['results']])
+        self.assertIn(0, [row['result'] for row in response.data['results']])
+
+    def test_served_questions_and_invalid_items(self):
+        question = question_pool.generateQuestion(2, answer_limit=views.MAX_ANSWERS, seed=3)
+        session_id = question_sessions.start_session(question.num_var, question.form, question.terms, question.dont_cares,
+                                                     question.answers, question.min_terms)
+        response = self.post([
+            {'q_session': session_id, 'answer': question.answers[0]},
+            {'q_id': views.sign_question_id(question.question_id), 'answer': "A"},
+            {'q_id': "!", 'answer': "A"},
+            {'q_id': question.question_id, 'answer': "A"}, # Not signed, so not issued by the server
+            {'q_id': views.sign_question_id(question.question_id)[:-1], 'answer': "A"},
+            {'q_num_var': 9, 'q_terms': [1], 'answer': "A"},
+            "A",
+        ])
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data, {'results': [
+            {'result': 1, 'answers': question.answers},
+            {'result': 0, 'answers': question.answers},
+            {'error': 'Invalid question ID'},
+            {'error': 'Invalid question ID'},
+            {'error': 'Invalid question ID'},
+            {'error': 'q_num_var must be an integer from 2 to 8'},
+            {'error': 'Invalid item'},
+        ], 'functions_solved': 1})
+
+    def test_too_many_functions_are_not_solved(self):
+        items = [{'q_num_var': 4, 'q_terms': [term], 'answer': "A"} for term in range(views.MAX_BATCH_FUNCTIONS + 1)]
+        with mock.patch.object(views.SOLVER_EXECUTOR, 'submit') as submit:
+            response = self.post(items)
+        self.assertEqual(response.status_code, 400)
+        submit.assert_not_called()
+
+    def test_too_many_question_ids_are_not_solved(self):
+        items = [{'q_id': views.sign_question_id(question_pool.encodeQuestionId(3, True, seed)), 'answer': "A"}
+                 for seed in range(views.MAX_BATCH_FUNCTIONS + 1)]
+        with mock.patch.object(views.SOLVER_EXECUTOR, 'submit') as submit:
+            response = self.post(items)
+        self.assertEqual(response.status_code, 400)
+        submit.assert_not_called()
+
+    def test_full_pool_and_timeout(self):
+        items = [{'q_num_var': 4, 'q_terms': [term], 'answer': "A"} for term in range(3)]
+        with mock.patch.object(views.SOLVER_EXECUTOR, 'submit', side_effect=[mock.Mock(), SolverBusy()]) as submit:
+            response = self.post(items)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(submit.call_count, 2)
+
+        future = mock.Mock()
+        with mock.patch.object(views.SOLVER_EXECUTOR, 'submit', return_value=future), \
+                mock.patch.object(views.SOLVER_EXECUTOR, 'result', side_effect=SolverTimeout()):
+            response = self.post(items)
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(future.cancel.call_count, 3)
+
+
+class SolveBulkTests(TestCase):
+    def solve(self, functions):
+        response = APIClient().post(reverse('solve-bulk'), {'functions': functions}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+    def test_lines_in_order(self):
+        rng = random.Random(0)
+        functions = [{'q_num_var': num_var, 'q_form': rng.choice(["min", "max"]), 'q_terms': terms, 'q_dont_cares': dont_cares}
+                     for num_var in (3, 4, 5) for terms, dont_cares in _grouped_functions(num_var, 10, rng)]
+        functions[7] = {'q_num_var': 1, 'q_terms': []}
+        lines = self.solve(functions)
+
+        self.assertEqual([line['index'] for line in lines], list(range(len(functions))))
+        self.assertEqual(lines[7], {'index': 7, 'error': 'q_num_var must be an integer from 2 to 8'})
+        for function, line in zip(functions, lines):
+            if 'error' in line:
+                continue
+            (num_var, form, terms, dont_cares), _ = views.parse_function(function)
+            solution = question_pool.solveQuestion(num_var, form, terms, dont_cares, views.MAX_ANSWERS, True)
+            self.assertEqual(line, {'index': line['index'], 'answers': solution['answers'], 'min_terms': solution['min_terms'],
+                                    'groupings': json.loads(json.dumps(solution['groupings'])), 'exact': True})
+
+    def test_full_pool_answers_the_oldest_first(self):
+        solution = {'answers': ["A"], 'min_terms': 1, 'groupings': [], 'exact': True}
+        functions = [{'q_num_var': 2, 'q_terms': [2, 3]}] * 3
+        submitted = []
+
+        def submit(*args):
+            if len(submitted) == 1 and not drained:
+                raise SolverBusy()
+            submitted.append(args)
+            return mock.Mock()
+
+        def result(future):
+            drained.append(future)
+            return solution
+
+        drained = []
+        with mock.patch.object(views.SOLVER_EXECUTOR, 'submit', side_effect=submit), \
+                mock.patch.object(views.SOLVER_EXECUTOR, 'result', side_effect=result):
+            lines = self.solve(functions)
+        self.assertEqual([line['index'] for line in lines], [0, 1, 2])
+        self.assertTrue(all(line['answers'] == ["A"] for line in lines))
+        self.assertEqual(len(submitted), 3)
+
+        with mock.patch.object(views.SOLVER_EXECUTOR, 'submit', side_effect=SolverBusy()):
+            self.assertEqual(self.solve(functions[:2]), [{'index': 0, 'error': 'Solver is busy, try again'},
+                                                         {'index': 1, 'error': 'Solver is busy, try again'}])
+
+    def test_timeouts_are_per_function(self):
+        solution = {'answers': ["A"], 'min_terms': 1, 'groupings': [], 'exact': True}
+        with mock.patch.object(views.SOLVER_EXECUTOR, 'submit', return_value=mock.Mock()), \
+                mock.patch.object(views.SOLVER_EXECUTOR, 'result', side_effect=[SolverTimeout(), solution]):
+            lines = self.solve([{'q_num_var': 2, 'q_terms': [2, 3]}] * 2)
+        self.assertEqual(lines[0], {'index': 0, 'error': 'Solver timed out'})
+        self.assertEqual(lines[1]['answers'], ["A"])
+
+
+class SolverExecutorTests(SimpleTestCase):
+    def setUp(self):
+        self.executor = SolverExecutor(max_workers=1, queue_depth=1, timeout=5)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_full_queue_is_rejected(self):
+        running = self.executor.submit(time.sleep, 0.5)
+        queued = self.executor.submit(time.sleep, 0)
+        with self.assertRaises(SolverBusy):
+            self.executor.submit(time.sleep, 0)
+        self.assertIsNone(self.executor.result(running))
+        self.assertIsNone(self.executor.result(queued))
+
+        stats = self.executor.stats()
+        self.assertEqual((stats['pending'], stats['completed'], stats['rejected']), (0, 2, 1))
+
+    def test_timeouts(self):
+        with self.assertRaises(SolverTimeout):
+            self.executor.result(self.executor.submit(time.sleep, 0.5), timeout=0.05)
+        with self.assertRaises(SolverTimeout):
+            async_to_sync(self.executor.run)(time.sleep, 0.5, timeout=0.05)
+        self.assertEqual(self.executor.stats()['timeouts'], 2)
+
+        # Timed out tasks that started hold their worker, and are counted until they finish
+        deadline = time.monotonic() + 5
+        while self.executor.stats()['pending'] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.executor.stats()['pending'], 0)
+        self.assertIsNone(self.executor.result(self.executor.submit(time.sleep, 0)))
+
+    def test_cancelled_tasks_are_not_completed(self):
+        executor = SolverExecutor(max_workers=1, queue_depth=3, timeout=5)
+        self.addCleanup(executor.shutdown)
+        # The pool hands a worker one task more than it runs, so the third waits and can be cancelled
+        started = [executor.submit(time.sleep, 0.5), executor.submit(time.sleep, 0)]
+        with self.assertRaises(SolverTimeout):
+            executor.result(executor.submit(time.sleep, 0), timeout=0.05)
+        for future in started:
+            self.assertIsNone(executor.result(future))
+
+        stats = executor.stats()
+        self.assertEqual((stats['pending'], stats['completed'], stats['cancelled'], stats['timeouts']), (0, 2, 1, 1))
+
+
+class AsyncViewTests(TestCase):
+    def test_tutorial_solve_matches_the_sync_view(self):
+        rng = random.Random(0)
+        for num_var in (2, 4, 6, 8):
+            for terms, dont_cares in _grouped_functions(num_var, 3, rng):
+                data = {'num_var': num_var, 'terms': terms, 'dont_cares': dont_cares, 'form_terms': rng.choice(["min", "max"])}
+                response = self.client.post(reverse('async-tutorial-solve'), data, content_type='application/json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), APIClient().post(reverse('tutorial-solve'), data, format='json').json())
+
+        response = self.client.post(reverse('async-tutorial-solve'), {'num_var': 9}, content_type='application/json')
+        self.assertEqual((response.status_code, response.json()), (400, {'error': 'Tutorial supports only 2 to 8 variables'}))
+
+    def test_check_answer_matches_the_sync_view(self):
+        question = question_pool.generateQuestion(2, answer_limit=views.MAX_ANSWERS, seed=3)
+        for answer in (question.answers[0], "A", "A + X"):
+            for user in ({'q_id': views.sign_question_id(question.question_id)}, {'q_session': question_sessions.start_session(
+                    question.num_var, question.form, question.terms, question.dont_cares, question.answers, question.min_terms)}):
+                data = {'type': 0, 'user': {**user, 'username': 'player', 'difficulty': 2, 'answer': answer}}
+                response = self.client.post(reverse('async-check-answer'), data, content_type='application/json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), APIClient().post(reverse('check-answer'), data, format='json').json())
+
+    def test_full_pool_and_timeout(self):
+        question = question_pool.generateQuestion(2, seed=3)
+        requests = [
+            ('async-tutorial-solve', {'num_var': 4, 'terms': [1, 2]}),
+            ('async-check-answer', {'type': 0, 'user': {'q_id': views.sign_question_id(question.question_id), 'difficulty': 2, 'answer': "A"}}),
+        ]
+        for error, status_code in ((SolverBusy(), 503), (SolverTimeout(), 504)):
+            with mock.patch.object(views.SOLVER_EXECUTOR, 'run', side_effect=error):
+                for name, data in requests:
+                    response = self.client.post(reverse(name), data, content_type='application/json')
+                    self.assertEqual(response.status_code, status_code, name)
@@ -2,12 +2,18 @@ from django.urls import path
 from .views import (
     CheckUser, CheckAnswer, FinishTimedChallenge, GetDailyChallenge, 
     GetDailyChallengeLeaderboard, StartTimeAttack, CheckTimeAttackAnswer, 
-    FinishTimeAttack, GetTimeAttackLeaderboard, TutorialSolve
+    FinishTimeAttack, GetTimeAttackLeaderboard, TutorialSolve, QuestionPoolStats,
+    DailyChallengeCacheStats, CheckBatch, SolveBulk, SolverStats
+)
+from .async_views import (
+    AsyncCheckUser, AsyncCheckAnswer, AsyncStartTimeAttack, AsyncCheckTimeAttackAnswer, AsyncTutorialSolve
 )
 
 urlpatterns = [
     path('user', CheckUser.as_view(), name='check-user'),
     path('game', CheckAnswer.as_view(), name='check-answer'),
+    path('check-batch', CheckBatch.as_view(), name='check-batch'),
+    path('solve-bulk', SolveBulk.as_view(), name='solve-bulk'),
     path('finish-timed', FinishTimedChallenge.as_view(), name='finish-timed'),
     path('daily-challenge', GetDailyChallenge.as_view(), name='get-daily-challenge'),
     path('daily-leaderboard', GetDailyChallengeLeaderboard.as_view(), name='get-daily-leaderboard'),
@@ -16,4 +22,13 @@ urlpatterns = [
     path('finish-time-attack', FinishTimeAttack.as_view(), name='finish-time-attack'),
     path('time-attack-leaderboard', GetTimeAttackLeaderboard.as_view(), name='get-time-attack-leaderboard'),
     path('tutorial-solve', TutorialSolve.as_view(), name='tutorial-solve'),
+    path('question-pool-stats', QuestionPoolStats.as_view(), name='question-pool-stats'),
+    path('daily-challenge-cache-stats', DailyChallengeCacheStats.as_view(), name='daily-challenge-cache-stats'),
+    path('solver-stats', SolverStats.as_view(), name='solver-stats'),
+    # Async variants, served without blocking by an ASGI server
+    path('async/user', AsyncCheckUser.as_view(), name='async-check-user'),
+    path('async/game', AsyncCheckAnswer.as_view(), name='async-check-answer'),
+    path('async/start-time-attack', AsyncStartTimeAttack.as_view(), name='async-start-time-attack'),
+    path('async/check-time-attack', AsyncCheckTimeAttackAnswer.as_view(), name='async-check-time-attack'),
+    path('async/tutorial-solve', AsyncTutorialSolve.as_view(), name='async-tutorial-solve'),
 ]
@@ -2,16 +2,37 @@ from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import User, DailyChallenge, DailyChallengeResult, TimeAttackResult
+from .models import User, DailyChallenge, DailyChallengeResult, TimeAttackResult, Question
 from .serializers import UserSerializer
-from . import kmap_solver
+from . import daily_cache, kmap_solver, question_pool, question_sessions, solver_executor
+from django.conf import settings
+from django.core import signing
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from datetime import datetime
+import collections
+import json
 import pytz
 import re
+import time
 
 
 TIME_LIMIT = 30
+MAX_ANSWERS = 5 # Number of minimal expressions shown after an answer is checked
+MAX_BATCH_ITEMS = 1000 # Answers checked by one /check-batch request
+MAX_BATCH_FUNCTIONS = 10 # Distinct functions solved by one /check-batch request, sent as terms or regenerated from a q_id without a session
+MAX_BULK_FUNCTIONS = 10000 # Functions solved by one /solve-bulk request
+QUESTION_POOL = question_pool.QuestionPool(
+    size=settings.QUESTION_POOL_SIZE,
+    low_water=settings.QUESTION_POOL_LOW_WATER,
+    answer_limit=MAX_ANSWERS)
+SOLVER_EXECUTOR = solver_executor.SolverExecutor( # Solver work of the async views, /check-batch and /solve-bulk
+    max_workers=settings.SOLVER_PROCESSES,
+    queue_depth=settings.SOLVER_QUEUE_DEPTH,
+    timeout=settings.SOLVER_TIMEOUT)
+SOLVER_BUDGET_STATS = kmap_solver.SolverBudgetStats() # Solves of client functions that ran out of budget, see solver_budget()
+DAILY_CHALLENGE_CACHE = daily_cache.DailyCache() # Today's DailyChallenge, see get_daily_challenge()
+QUESTION_ID_SIGNER = signing.Signer(salt='kmap.question_id') # q_id sent to clients, see sign_question_id()
 BLOCKED_USERNAME_TERMS = (
     "fuck",
     "shit",
@@ -642,33 +663,324 @@ def parse_allow_dont_cares(value):
 
 
 
+def pop_question(difficulty, allow_dont_cares=True):
+    """
+    Get a ready question from the question bank, or from the question pool if the bank has none, in the order returned by randomizeQuestion
+    followed by its question ID and the ID of the question session it is answered with
+    """
+    question = Question.objects.sample(difficulty, allow_dont_cares)
+    if question is None:
+        question = QUESTION_POOL.popQuestion(difficulty, allow_dont_cares)
+    return serve_question(question)
+
+
+def serve_question(question):
+    """Start the question session of a bank or pool question, and return it in the order returned by pop_question"""
+    session_id = question_sessions.start_session(question.num_var, question.form, question.terms, question.dont_cares, question.answers, question.min_terms)
+    return question.num_var, question.form, question.terms, question.dont_cares, question.groupings, question.question_id, session_id
+
+
+def daily_question(daily_challenge):
+    """Get a daily challenge in the order returned by pop_question. Challenges without a stored solution have no question session"""
+    session_id = None
+    if daily_challenge.min_terms is not None:
+        session_id = question_sessions.start_session(daily_challenge.num_var, daily_challenge.form, daily_challenge.terms,
+                                                     daily_challenge.dont_cares, daily_challenge.answers, daily_challenge.min_terms)
+    return daily_challenge.num_var, daily_challenge.form, daily_challenge.terms, daily_challenge.dont_cares, daily_challenge.groupings, None, session_id
+
+
+def answered_question(data):
+    """
+    Get the question session a client answers, from its `q_session`, its `q_id`, or today's challenge if it is answering it.
+    Returns the session, or None with an error message. Questions are never solved from the terms a client sends.
+    Raises SolverBusy or SolverTimeout if a question regenerated from its `q_id` cannot be solved (see solve_functions).
+    """
+    session, function, error = served_question(data)
+    if function is not None:
+        session = function_session(function, solve_functions([function])[0])
+    return session, error
+
+
+def served_question(data):
+    """
+    answered_question without solving: returns the session, or the function of a question to regenerate from its `q_id`
+    (see question_id_function) that the caller solves with solve_functions, with None for the other and an error message
+    if there is neither.
+    """
+    session = question_sessions.get_session(data.get('q_session'))
+    if session is not None:
+        return session, None, None
+
+    if data.get('q_id'):
+        # The question ID alone is enough, the question is regenerated from it
+        function, error = question_id_function(data.get('q_id'))
+        return None, function, error
+
+    if data.get('difficulty') == 4:
+        daily_challenge = solved_daily_challenge(data.get('q_num_var'), data.get('q_form'), data.get('q_terms'), data.get('q_dont_cares'))
+        if daily_challenge is not None:
+            return question_sessions.make_session(daily_challenge.num_var, daily_challenge.form, daily_challenge.terms, daily_challenge.dont_cares,
+                                                  daily_challenge.answers, daily_challenge.min_terms,
+                                                  int(daily_challenge.on_mask or '0', 16), int(daily_challenge.dc_mask or '0', 16)), None, None
+
+    return None, None, 'Question session expired'
+
+
+def sign_question_id(question_id):
+    """`q_id` of a question ID (see question_pool.encodeQuestionId) sent to clients, signed so that only IDs the server issued are regenerated"""
+    return None if question_id is None else QUESTION_ID_SIGNER.sign(question_id)
+
+
+def question_id_function(signed_id):
+    """
+    Function of a `q_id` from sign_question_id, like parse_function, regenerated without solving it.
+    Returns None with an error message for IDs the server did not issue.
+    """
+    try:
+        return question_pool.functionFromId(QUESTION_ID_SIGNER.unsign(signed_id)), None
+    except (signing.BadSignature, TypeError, ValueError):
+        return None, 'Invalid question ID'
+
+
+def function_session(function, solution):
+    """Question session (see question_sessions.make_session) of a function from parse_function and its solution from solve_functions"""
+    return question_sessions.make_session(*function, solution['answers'], solution['min_terms'], exact=solution['exact'])
+
+
+def solver_error_response(error):
+    """Response to SolverBusy (503) or SolverTimeout (504), so that clients can retry"""
+    if isinstance(error, solver_executor.SolverBusy):
+        return Response({'error': 'Solver is busy, try again'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response({'error': 'Solver timed out'}, status=status.HTTP_504_GATEWAY_TIMEOUT)
+
+
+def solver_budget():
+    """Budget of the search for a minimal expression of a function sent by a client, see kmap_solver.SolverBudget"""
+    return kmap_solver.SolverBudget(settings.SOLVER_BUDGET_STEPS, settings.SOLVER_BUDGET_SECONDS)
+
+
+def parse_function(data):
+    """
+    Get the num_var, form, sorted terms and sorted don't cares of a function given as `q_num_var`, `q_form`, `q_terms` and `q_dont_cares`,
+    followed by None, or None with an error message if it is invalid. Don't cares that are also terms are dropped.
+    """
+    num_var = data.get('q_num_var')
+    form = data.get('q_form', 'min')
+    terms = data.get('q_terms')
+    dont_cares = data.get('q_dont_cares') or []
+    if not isinstance(num_var, int) or isinstance(num_var, bool) or num_var not in range(2, 9):
+        return None, 'q_num_var must be an integer from 2 to 8'
+    if form not in ['min', 'max']:
+        return None, 'Invalid q_form'
+    for given in (terms, dont_cares):
+        if not isinstance(given, list) or not all(isinstance(term, int) and not isinstance(term, bool) and 0 <= term < 2**num_var for term in given):
+            return None, f'q_terms and q_dont_cares must be lists of terms from 0 to {2**num_var - 1}'
+    terms = sorted(set(terms))
+    return (num_var, form, terms, sorted(set(dont_cares) - set(terms))), None
+
+
+def solve_functions(functions):
+    """
+    Solve functions from parse_function in the solver pool with the budget of solver_budget(), all within SOLVER_TIMEOUT,
+    and return their solutions from question_pool.solveQuestion in order. Raises SolverBusy or SolverTimeout,
+    after cancelling the solves that have not started.
+    """
+    futures = []
+    try:
+        for num_var, form, terms, dont_cares in functions:
+            futures.append(SOLVER_EXECUTOR.submit(question_pool.solveQuestion, num_var, form, terms, dont_cares, MAX_ANSWERS, False, solver_budget()))
+        deadline = time.monotonic() + SOLVER_EXECUTOR.timeout
+        solutions = [SOLVER_EXECUTOR.result(future, max(0, deadline - time.monotonic())) for future in futures]
+    except (solver_executor.SolverBusy, solver_executor.SolverTimeout):
+        for future in futures:
+            future.cancel()
+        raise
+
+    for solution in solutions:
+        SOLVER_BUDGET_STATS.record(solution['exact'])
+    return solutions
+
+
+def iter_bulk_solutions(functions):
+    """
+    Solve functions from parse_function in the solver pool and yield one NDJSON line per function, in order.
+    Every function has its own solver_budget() and is waited for at most SOLVER_TIMEOUT. At most twice as many functions
+    as workers are in flight, so results are never all held in memory. When the pool is full, the oldest function in flight
+    is answered before submitting more, and a function that cannot be submitted with none in flight gets an error line.
+    """
+    in_flight = collections.deque()
+
+    def line(index, future, error):
+        if future is None:
+            row = {'index': index, 'error': error}
+        else:
+            try:
+                solution = SOLVER_EXECUTOR.result(future)
+            except solver_executor.SolverTimeout:
+                row = {'index': index, 'error': 'Solver timed out'}
+            else:
+                SOLVER_BUDGET_STATS.record(solution['exact'])
+                row = {'index': index, 'answers': solution['answers'], 'min_terms': solution['min_terms'], 'groupings': solution['groupings'],
+                       'exact': solution['exact']}
+        return json.dumps(row) + '\n'
+
+    try:
+        for index, (function, error) in enumerate(functions):
+            future = None
+            while function is not None and future is None:
+                try:
+                    future = SOLVER_EXECUTOR.submit(question_pool.solveQuestion, *function, MAX_ANSWERS, True, solver_budget())
+                except solver_executor.SolverBusy:
+                    if not in_flight:
+                        error = 'Solver is busy, try again'
+                        break
+                    yield line(*in_flight.popleft())
+            in_flight.append((index, future, error))
+            if len(in_flight) >= 2 * SOLVER_EXECUTOR.max_workers:
+                yield line(*in_flight.popleft())
+        while in_flight:
+            yield line(*in_flight.popleft())
+    finally:
+        # The client went away, drop what has not started
+        for _, future, _ in in_flight:
+            if future is not None:
+                future.cancel()
+
+
+def get_daily_challenge():
+    """Get today's challenge from the daily challenge cache, or None if it has not been created"""
+    today = timezone.now().date()
+    return DAILY_CHALLENGE_CACHE.get(today, lambda: DailyChallenge.objects.filter(date=today).first())
+
+
 def get_or_create_daily_challenge():
-    """Get today's challenge or create a new one if it doesn't exist"""
+    """Get today's challenge, which `manage.py pregenerate_daily` creates ahead of time, or create it if it is missing"""
     today = timezone.now().date()
-    daily_challenge, created = DailyChallenge.objects.get_or_create(
-        date=today,
-        defaults={
-            'num_var': 5,  # Default to harder difficulty
-            'form': 'min',
-            'terms': [],
-            'dont_cares': [],
-            'groupings': []
-        }
-    )
-    
-    if created:
-        # Generate a new challenge for today
-        num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=3)
-        daily_challenge.num_var = num_var
-        daily_challenge.form = form
-        daily_challenge.terms = terms
-        daily_challenge.dont_cares = dont_cares
-        daily_challenge.groupings = groupings
-        daily_challenge.save()
-    
+    return DAILY_CHALLENGE_CACHE.get(today, lambda: DailyChallenge.objects.filter(date=today).first() or create_daily_challenge(today))
+
+
+def create_daily_challenge(date):
+    """
+    Create the challenge of a date if no one else did. Every process generates the same question for a date,
+    so concurrent requests can all insert and the first insert wins.
+    """
+    return store_daily_challenge(date, question_pool.generateDailyQuestion(date, settings.SECRET_KEY, MAX_ANSWERS))
+
+
+def store_daily_challenge(date, question):
+    """Insert the challenge of a date generated by generateDailyQuestion, unless it exists, and return the stored challenge"""
+    DailyChallenge.objects.bulk_create([DailyChallenge.from_question(date, question)], ignore_conflicts=True)
+    return DailyChallenge.objects.get(date=date)
+
+
+def solved_daily_challenge(num_var, form, terms, dont_cares):
+    """Get today's challenge if it is the given question and its solution is stored, or None"""
+    daily_challenge = get_daily_challenge()
+    if (daily_challenge is None or daily_challenge.min_terms is None
+            or (daily_challenge.num_var, daily_challenge.form) != (num_var, form)
+            or sorted(daily_challenge.terms) != sorted(terms or []) or sorted(daily_challenge.dont_cares) != sorted(dont_cares or [])):
+        return None
     return daily_challenge
 
 
+def parse_difficulty(value):
+    """Difficulty of a game from its name: 1 to 3 for easy to hard, 4 for the timed daily challenge, and 5 for endless mode"""
+    return {'easy': 1, 'medium': 2, 'hard': 3, 'timed': 4}.get(value, 5)
+
+
+def question_data(question):
+    """Response fields of a question, as returned by pop_question"""
+    num_var, form, terms, dont_cares, groupings, question_id, session_id = question
+    return {
+        'q_num_var': num_var,
+        'q_form': form,
+        'q_terms': terms,
+        'q_dont_cares': dont_cares,
+        'q_groupings': groupings,
+        'q_id': sign_question_id(question_id),
+        'q_session': session_id,
+    }
+
+
+def user_data(username, score, difficulty, question, time_started):
+    """Serialized User playing a question, as returned by pop_question, with time_started as an ISO string"""
+    user = User(username=username, score=score, difficulty=difficulty, time_started=time_started, **question_data(question))
+    data = UserSerializer(user).data
+    if time_started and isinstance(time_started, str):
+        data['time_started'] = time_started
+    elif time_started:
+        data['time_started'] = time_started.isoformat()
+    return data
+
+
+def next_difficulty(difficulty, score):
+    """Difficulty of the next question in a game. Endless mode (5) gets harder at a score of 5 and 10"""
+    if difficulty == 5:
+        return 3 if score >= 10 else 2 if score >= 5 else 1
+    return difficulty
+
+
+def record_daily_result(username, time_started):
+    """Record the completion time of today's challenge for a user who started it at `time_started`"""
+    if not time_started:
+        return
+    try:
+        # Parse time_started properly
+        if isinstance(time_started, str):
+            # Remove 'Z' suffix if present and parse as ISO format
+            time_started_clean = time_started.replace('Z', '+00:00')
+            start_time = datetime.fromisoformat(time_started_clean)
+        else:
+            start_time = time_started
+
+        # Make sure both times are timezone-aware for proper calculation
+        time_completed = timezone.now()
+
+        # If start_time is naive, make it aware
+        if start_time.tzinfo is None:
+            start_time = pytz.UTC.localize(start_time)
+
+        elapsed_seconds = max(0, int((time_completed - start_time).total_seconds()))
+
+        # Get today's daily challenge
+        daily_challenge = get_daily_challenge()
+        if daily_challenge is None:
+            raise DailyChallenge.DoesNotExist
+
+        # Record the result
+        DailyChallengeResult.objects.update_or_create(
+            username=username,
+            daily_challenge=daily_challenge,
+            defaults={
+                'completion_time_seconds': elapsed_seconds,
+                'completed_at': time_completed
+            }
+        )
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        pass  # Silently fail if recording time doesn't work
+
+
+def tutorial_arguments(data):
+    """Get the num_var, terms, don't cares and form_terms of a /tutorial-solve request followed by None, or None with an error message"""
+    num_var = int(data.get('num_var', 4))
+    form_terms = data.get('form_terms', 'min')
+
+    if num_var not in [2, 3, 4, 5, 6, 7, 8]:
+        return None, 'Tutorial supports only 2 to 8 variables'
+
+    if form_terms not in ['min', 'max']:
+        return None, 'Invalid form_terms'
+
+    try:
+        terms = list(map(int, data.get('terms', [])))
+        dont_cares = list(map(int, data.get('dont_cares', [])))
+    except (TypeError, ValueError):
+        return None, 'Failed to solve tutorial map'
+    return (num_var, terms, dont_cares, form_terms), None
+
+
 class CheckUser(APIView):
     def get(self, request):
         users = User.objects.all()
@@ -683,45 +995,18 @@ class CheckUser(APIView):
         if username_error:
             return Response({'error': username_error}, status=status.HTTP_400_BAD_REQUEST)
 
-        difficulty = request.data.get('difficulty')
-        if difficulty == 'easy':
-            difficulty = 1
-        elif difficulty == 'medium':
-            difficulty = 2
-        elif difficulty == 'hard':
-            difficulty = 3
-        elif difficulty == 'timed':
-            difficulty = 4
-        else:
-            difficulty = 5
-
+        difficulty = parse_difficulty(request.data.get('difficulty'))
         score = 0
         time_started = None
         allow_dont_cares = parse_allow_dont_cares(request.data.get('allow_dont_cares', True))
-        num_dc_override = 0 if not allow_dont_cares else None
 
         if difficulty == 4:
-            daily_challenge = get_or_create_daily_challenge()
-            num_var = daily_challenge.num_var
-            form = daily_challenge.form
-            terms = daily_challenge.terms
-            dont_cares = daily_challenge.dont_cares
-            groupings = daily_challenge.groupings
+            question = daily_question(get_or_create_daily_challenge())
             time_started = timezone.now()
-        elif difficulty == 5:
-            num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=1, num_dc_override=num_dc_override)
         else:
-            num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=difficulty, num_dc_override=num_dc_override)
+            question = pop_question(next_difficulty(difficulty, score), allow_dont_cares)
         
-        user = User(username=username, score=score, difficulty=difficulty, q_num_var=num_var, q_form=form, q_terms=terms, q_dont_cares=dont_cares, q_groupings=groupings, time_started=time_started)
-        serializer = UserSerializer(user)
-        
-        # For timed mode, ensure time_started is properly formatted as ISO string
-        response_data = serializer.data
-        if time_started:
-            response_data['time_started'] = time_started.isoformat()
-        
-        return Response(response_data, status=status.HTTP_200_OK)
+        return Response(user_data(username, score, difficulty, question, time_started), status=status.HTTP_200_OK)
         
 class CheckAnswer(APIView):
     # def get(self, request):
@@ -731,58 +1016,19 @@ class CheckAnswer(APIView):
             username = request.data.get('user').get('username')
             score = request.data.get('user').get('score')
             difficulty = request.data.get('user').get('difficulty')
-            num_var = request.data.get('user').get('q_num_var')
-            form = request.data.get('user').get('q_form')
-            terms = request.data.get('user').get('q_terms')
-            dont_cares = request.data.get('user').get('q_dont_cares')
-            groupings = request.data.get('user').get('q_groupings')
             answer = request.data.get('user').get('answer')
-            result, answers = kmap_solver.minimizeAndCheck(
-                num_var = num_var, 
-                form_terms = form, 
-                terms = terms, 
-                dont_cares = dont_cares, 
-                input_answer=answer)
+            # The answer is checked against the solution stored when the question was served
+            try:
+                session, error = answered_question(request.data.get('user'))
+            except (solver_executor.SolverBusy, solver_executor.SolverTimeout) as solver_error:
+                return solver_error_response(solver_error)
+            if session is None:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+            result, answers = question_sessions.check_session_answer(session, answer)
             
             # For timed mode, record the completion time if answer is correct
             if difficulty == 4 and result == 1:
-                time_started = request.data.get('user').get('time_started')
-                if time_started:
-                    try:
-                        # Parse time_started properly
-                        if isinstance(time_started, str):
-                            # Remove 'Z' suffix if present and parse as ISO format
-                            time_started_clean = time_started.replace('Z', '+00:00')
-                            start_time = datetime.fromisoformat(time_started_clean)
-                        else:
-                            start_time = time_started
-                        
-                        # Make sure both times are timezone-aware for proper calculation
-                        time_completed = timezone.now()
-                        
-                        # If start_time is naive, make it aware
-                        if start_time.tzinfo is None:
-                            start_time = pytz.UTC.localize(start_time)
-                        
-                        elapsed_seconds = max(0, int((time_completed - start_time).total_seconds()))
-                        
-                        # Get today's daily challenge
-                        today = timezone.now().date()
-                        daily_challenge = DailyChallenge.objects.get(date=today)
-                        
-                        # Record the result
-                        DailyChallengeResult.objects.update_or_create(
-                            username=username,
-                            daily_challenge=daily_challenge,
-                            defaults={
-                                'completion_time_seconds': elapsed_seconds,
-                                'completed_at': time_completed
-                            }
-                        )
-                    except Exception as e:
-                        import traceback
-                        traceback.print_exc()
-                        pass  # Silently fail if recording time doesn't work
+                record_daily_result(username, request.data.get('user').get('time_started'))
             
             return Response({'result': result, 'answers': answers}, status=status.HTTP_200_OK)
     
@@ -793,52 +1039,88 @@ class CheckAnswer(APIView):
             result = request.data.get('user').get('result')
             time_started = request.data.get('user').get('time_started')
             allow_dont_cares = parse_allow_dont_cares(request.data.get('user').get('allow_dont_cares', True))
-            num_dc_override = 0 if not allow_dont_cares else None
             
-            if result == 1:
-                score += 1
-                if score >= 10 and difficulty == 5:
-                    num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=3, num_dc_override=num_dc_override)
-                elif score >= 5 and difficulty == 5:
-                    num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=2, num_dc_override=num_dc_override)
-                elif difficulty == 5:
-                    num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=1, num_dc_override=num_dc_override)
-                elif difficulty == 4:
-                    # Timed mode: stay on the daily challenge, don't change questions
-                    daily_challenge = get_or_create_daily_challenge()
-                    num_var = daily_challenge.num_var
-                    form = daily_challenge.form
-                    terms = daily_challenge.terms
-                    dont_cares = daily_challenge.dont_cares
-                    groupings = daily_challenge.groupings
-                else:
-                    num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=difficulty, num_dc_override=num_dc_override)
+            score = score + 1 if result == 1 else 0
+            if difficulty == 4:
+                # Timed mode: stay on the daily challenge, don't change questions
+                question = daily_question(get_or_create_daily_challenge())
             else:
-                score = 0
-                if difficulty == 5:
-                    num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=1, num_dc_override=num_dc_override)
-                elif difficulty == 4:
-                    # Timed mode: stay on the daily challenge, don't change questions
-                    daily_challenge = get_or_create_daily_challenge()
-                    num_var = daily_challenge.num_var
-                    form = daily_challenge.form
-                    terms = daily_challenge.terms
-                    dont_cares = daily_challenge.dont_cares
-                    groupings = daily_challenge.groupings
-                else:
-                    num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=difficulty, num_dc_override=num_dc_override)
-            
-            user = User(username=username, score=score, difficulty=difficulty, q_num_var=num_var, q_form=form, q_terms=terms, q_dont_cares=dont_cares, q_groupings=groupings, time_started=time_started)
-            serializer = UserSerializer(user)
-            
-            # Ensure time_started is properly formatted
-            response_data = serializer.data
-            if time_started and isinstance(time_started, str):
-                response_data['time_started'] = time_started
-            elif time_started:
-                response_data['time_started'] = time_started.isoformat()
+                question = pop_question(next_difficulty(difficulty, score), allow_dont_cares)
             
-            return Response({'result': result, 'user': response_data}, status=status.HTTP_200_OK)
+            return Response({'result': result, 'user': user_data(username, score, difficulty, question, time_started)}, status=status.HTTP_200_OK)
+
+
+class CheckBatch(APIView):
+    def post(self, request):
+        """
+        Check a list of answers, each to a question given by `q_session` or `q_id` like /game, or by its function
+        (see parse_function). Every distinct function, sent as terms or regenerated from a `q_id` without a session, is solved
+        once however many answers it has, in the solver pool with the budget of solver_budget(). A full pool answers 503 and solves over SOLVER_TIMEOUT answer 504, like the async views.
+        Results are in the order of the items, with an error instead for items that cannot be checked.
+        """
+        items = request.data.get('items')
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'items must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > MAX_BATCH_ITEMS:
+            return Response({'error': f'At most {MAX_BATCH_ITEMS} items can be checked at once'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Served questions are checked from their session. Other functions are solved, once each however many answers they have
+        checked = []
+        functions = {} # Every distinct function, keyed by num_var, form and the bitmasks of its terms and don't cares
+        for item in items:
+            if not isinstance(item, dict):
+                checked.append((None, None, 'Invalid item'))
+                continue
+            if item.get('q_session') or item.get('q_id'):
+                session, function, error = served_question(item)
+            else:
+                session = None
+                function, error = parse_function(item)
+            key = None
+            if function is not None:
+                num_var, form, terms, dont_cares = function
+                key = (num_var, form, kmap_solver._terms_to_bitmask(terms), kmap_solver._terms_to_bitmask(dont_cares))
+                functions.setdefault(key, function)
+            checked.append((session, key, error))
+
+        if len(functions) > MAX_BATCH_FUNCTIONS:
+            return Response({'error': f'At most {MAX_BATCH_FUNCTIONS} distinct functions can be solved at once, '
+                                      'check answers to served questions by q_session'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            solutions = solve_functions(functions.values())
+        except (solver_executor.SolverBusy, solver_executor.SolverTimeout) as solver_error:
+            return solver_error_response(solver_error)
+        solved = {key: question_sessions.make_session(*function, solution['answers'], solution['min_terms'], key[2], key[3], solution['exact'])
+                  for (key, function), solution in zip(functions.items(), solutions)}
+
+        results = []
+        for item, (session, key, error) in zip(items, checked):
+            if key is not None:
+                session = solved[key]
+            if session is None:
+                results.append({'error': error})
+                continue
+            result, answers = question_sessions.check_session_answer(session, item.get('answer'))
+            results.append({'result': result, 'answers': answers})
+
+        return Response({'results': results, 'functions_solved': len(solved)}, status=status.HTTP_200_OK)
+
+
+class SolveBulk(APIView):
+    def post(self, request):
+        """
+        Solve a list of functions given like /check-batch items (see parse_function), streamed back as NDJSON with one line per function
+        in order: its `index`, minimal expressions as `answers`, `min_terms`, the `groupings` of the first expression and whether it is
+        `exact` (see solver_budget), or an `error`.
+        """
+        functions = request.data.get('functions')
+        if not isinstance(functions, list) or not functions:
+            return Response({'error': 'functions must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(functions) > MAX_BULK_FUNCTIONS:
+            return Response({'error': f'At most {MAX_BULK_FUNCTIONS} functions can be solved at once'}, status=status.HTTP_400_BAD_REQUEST)
+
+        parsed = (parse_function(function) if isinstance(function, dict) else (None, 'Invalid function') for function in functions)
+        return StreamingHttpResponse(iter_bulk_solutions(parsed), content_type='application/x-ndjson')
 
 
 class FinishTimedChallenge(APIView):
@@ -861,10 +1143,8 @@ class FinishTimedChallenge(APIView):
             return Response({'error': 'Invalid elapsed_seconds format'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Get today's daily challenge
-        today = timezone.now().date()
-        try:
-            daily_challenge = DailyChallenge.objects.get(date=today)
-        except DailyChallenge.DoesNotExist:
+        daily_challenge = get_daily_challenge()
+        if daily_challenge is None:
             return Response({'error': 'Daily challenge not available'}, status=status.HTTP_404_NOT_FOUND)
         
         time_completed = timezone.now()
@@ -1019,7 +1299,6 @@ class StartTimeAttack(APIView):
         username = request.data.get('username')
         difficulty = request.data.get('difficulty')
         allow_dont_cares = True
-        num_dc_override = None
         
         username_error = validate_username(username)
         if username_error:
@@ -1029,18 +1308,14 @@ class StartTimeAttack(APIView):
             return Response({'error': 'Invalid username or difficulty'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Generate first question
-        num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=difficulty, num_dc_override=num_dc_override)
+        question = pop_question(difficulty, allow_dont_cares)
         
         return Response({
             'username': username,
             'difficulty': difficulty,
             'questions_solved': 0,
             'time_remaining': TIME_LIMIT,
-            'q_num_var': num_var,
-            'q_form': form,
-            'q_terms': terms,
-            'q_dont_cares': dont_cares,
-            'q_groupings': groupings,
+            **question_data(question),
             'allow_dont_cares': allow_dont_cares
         }, status=status.HTTP_200_OK)
 
@@ -1052,21 +1327,17 @@ class CheckTimeAttackAnswer(APIView):
         questions_solved = request.data.get('questions_solved', 0)
         time_remaining = request.data.get('time_remaining', 0)
         allow_dont_cares = True
-        num_dc_override = None
         
-        num_var = request.data.get('q_num_var')
-        form = request.data.get('q_form')
-        terms = request.data.get('q_terms')
-        dont_cares = request.data.get('q_dont_cares')
         answer = request.data.get('answer')
+        try:
+            session, error = answered_question(request.data)
+        except (solver_executor.SolverBusy, solver_executor.SolverTimeout) as solver_error:
+            return solver_error_response(solver_error)
+        if session is None:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
         
         # Check the answer
-        result, answers = kmap_solver.minimizeAndCheck(
-            num_var=num_var,
-            form_terms=form,
-            terms=terms,
-            dont_cares=dont_cares,
-            input_answer=answer)
+        result, answers = question_sessions.check_session_answer(session, answer)
         
         if result != 1:
             # Wrong answer - game over, don't save to leaderboard
@@ -1081,18 +1352,14 @@ class CheckTimeAttackAnswer(APIView):
         questions_solved += 1
         
         # Generate next question
-        num_var, form, terms, dont_cares, groupings = kmap_solver.randomizeQuestion(difficulty=difficulty, num_dc_override=num_dc_override)
+        question = pop_question(difficulty, allow_dont_cares)
         
         return Response({
             'result': 1,
             'answers': answers,
             'questions_solved': questions_solved,
             'time_remaining': time_remaining,
-            'q_num_var': num_var,
-            'q_form': form,
-            'q_terms': terms,
-            'q_dont_cares': dont_cares,
-            'q_groupings': groupings
+            **question_data(question)
         }, status=status.HTTP_200_OK)
 
 
@@ -1158,25 +1425,29 @@ class GetTimeAttackLeaderboard(APIView):
 
 class TutorialSolve(APIView):
     def post(self, request):
-        num_var = int(request.data.get('num_var', 4))
-        form_terms = request.data.get('form_terms', 'min')
-        terms = request.data.get('terms', [])
-        dont_cares = request.data.get('dont_cares', [])
-
-        if num_var not in [2, 3, 4, 5, 6]:
-            return Response({'error': 'Tutorial supports only 2 to 6 variables'}, status=status.HTTP_400_BAD_REQUEST)
-
-        if form_terms not in ['min', 'max']:
-            return Response({'error': 'Invalid form_terms'}, status=status.HTTP_400_BAD_REQUEST)
+        arguments, error = tutorial_arguments(request.data)
+        if arguments is None:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            result = kmap_solver.tutorial_solve(
-                num_var=num_var,
-                terms=list(map(int, terms)),
-                dont_cares=list(map(int, dont_cares)),
-                form_terms=form_terms
-            )
+            result = kmap_solver.tutorial_solve(*arguments, settings.SOLVER_BUDGET_STEPS, settings.SOLVER_BUDGET_SECONDS)
         except Exception:
             return Response({'error': 'Failed to solve tutorial map'}, status=status.HTTP_400_BAD_REQUEST)
+        SOLVER_BUDGET_STATS.record(result['exact'])
 
         return Response(result, status=status.HTTP_200_OK)
+
+
+class QuestionPoolStats(APIView):
+    def get(self, request):
+        return Response(QUESTION_POOL.stats(), status=status.HTTP_200_OK)
+
+
+class DailyChallengeCacheStats(APIView):
+    def get(self, request):
+        return Response(DAILY_CHALLENGE_CACHE.stats(), status=status.HTTP_200_OK)
+
+
+class SolverStats(APIView):
+    def get(self, request):
+        return Response({**SOLVER_EXECUTOR.stats(), 'budget': SOLVER_BUDGET_STATS.stats()}, status=status.HTTP_200_OK)
@@ -90,7 +90,7 @@ const AnswerCard = ({ onSubmit, gameState, setGlobalState, globalState, setGameS
                 } else {
                     setGlobalState("hide");
                     setErrorS(true);
-                    setErrorMessage("Incorrect format (check variables or operators)");
+                    setErrorMessage(result["error"] || "Incorrect format (check variables or operators)");
                 }
             } else {
                 setErrorS(true);
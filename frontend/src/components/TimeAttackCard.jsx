@@ -66,10 +66,8 @@ const TimeAttackCard = ({ gameState, setGlobalState, globalState, setGameState,
                     difficulty: gameState.difficulty,
                     questions_solved: questionsAnswered,
                     time_remaining: timeRemaining,
-                    q_num_var: gameState.q_num_var,
-                    q_form: gameState.q_form,
-                    q_terms: gameState.q_terms,
-                    q_dont_cares: gameState.q_dont_cares,
+                    q_session: gameState.q_session,
+                    q_id: gameState.q_id,
                     answer: answer
                 }),
             });
@@ -97,7 +95,9 @@ const TimeAttackCard = ({ gameState, setGlobalState, globalState, setGameState,
                 q_num_var: data.q_num_var,
                 q_form: data.q_form,
                 q_terms: data.q_terms,
-                q_dont_cares: data.q_dont_cares
+                q_dont_cares: data.q_dont_cares,
+                q_id: data.q_id,
+                q_session: data.q_session
             });
             
             setResponse(data);